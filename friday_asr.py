@@ -0,0 +1,221 @@
+# ----------------------------------------------------------------------
+# FRIDAY Speech Recognition Backends
+# Description: One interface over the recognizers FRIDAY can use (Google Web
+# Speech, Vosk, PocketSphinx, Whisper, and a scripted stub for tests),
+# combined into a fallback chain: e.g. try the local engine first and only go
+# to the cloud when it is unsure. Each backend call is timed so the fastest
+# acceptable engine can be picked per device.
+# ----------------------------------------------------------------------
+import json
+import threading
+import time
+from collections import deque
+
+from friday_deps import vosk
+
+LATENCY_SAMPLES = 50 # Recent calls kept per backend for the latency report
+
+class RecognitionUnavailable(Exception):
+    """The backend could not run (offline, missing model, timed out), as opposed to hearing nothing."""
+
+class RecognitionResult:
+    __slots__ = ('text', 'confidence', 'backend', 'latency')
+
+    def __init__(self, text, confidence, backend, latency=0.0):
+        self.text = text
+        self.confidence = confidence # 0..1; 1.0 when the engine does not report one
+        self.backend = backend
+        self.latency = latency
+
+# --- BACKENDS ---
+class RecognizerBackend:
+    """recognize(audio) takes a speech_recognition AudioData and returns (text, confidence),
+    or None when nothing intelligible was heard."""
+    name = 'base'
+
+    def recognize(self, audio, timeout):
+        return None # Hears nothing; real backends override this
+
+class GoogleBackend(RecognizerBackend):
+    name = 'google'
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+
+    def recognize(self, audio, timeout):
+        import speech_recognition as sr
+        self.recognizer.operation_timeout = timeout
+        try:
+            response = self.recognizer.recognize_google(audio, show_all=True)
+        except sr.RequestError as e:
+            raise RecognitionUnavailable(str(e))
+        except sr.UnknownValueError:
+            return None
+        alternatives = response.get('alternative') if isinstance(response, dict) else None
+        if not alternatives:
+            return None
+        best = alternatives[0]
+        return best['transcript'], best.get('confidence', 1.0)
+
+class SphinxBackend(RecognizerBackend):
+    """Offline CMU PocketSphinx through speech_recognition (pip install pocketsphinx)."""
+    name = 'sphinx'
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+
+    def recognize(self, audio, timeout):
+        import speech_recognition as sr
+        try:
+            return self.recognizer.recognize_sphinx(audio), 1.0
+        except sr.UnknownValueError:
+            return None
+        except sr.RequestError as e:
+            raise RecognitionUnavailable(str(e))
+
+class WhisperBackend(RecognizerBackend):
+    """Offline Whisper on the CPU through speech_recognition (pip install openai-whisper)."""
+    name = 'whisper'
+
+    def __init__(self, recognizer, model='base.en'):
+        self.recognizer = recognizer
+        self.model = model
+
+    def recognize(self, audio, timeout):
+        import speech_recognition as sr
+        try:
+            text = self.recognizer.recognize_whisper(audio, model=self.model).strip()
+        except sr.UnknownValueError:
+            return None
+        except sr.RequestError as e:
+            raise RecognitionUnavailable(str(e))
+        return (text, 1.0) if text else None
+
+class VoskBackend(RecognizerBackend):
+    """Offline Kaldi/Vosk (pip install vosk, plus a model directory from alphacephei.com/vosk/models)."""
+    name = 'vosk'
+    SAMPLE_RATE = 16000
+
+    def __init__(self, model_path):
+        if not vosk.available:
+            raise RecognitionUnavailable("vosk is not installed")
+        vosk.SetLogLevel(-1)
+        self.model = vosk.Model(model_path) # Loaded once; recognizers are cheap per utterance
+
+    def recognize(self, audio, timeout):
+        recognizer = vosk.KaldiRecognizer(self.model, self.SAMPLE_RATE)
+        recognizer.SetWords(True)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.SAMPLE_RATE, convert_width=2))
+        result = json.loads(recognizer.FinalResult())
+        text = result.get('text', '').strip()
+        if not text:
+            return None
+        words = result.get('result') or []
+        confidence = sum(word.get('conf', 1.0) for word in words) / len(words) if words else 1.0
+        return text, confidence
+
+class StubBackend(RecognizerBackend):
+    """Scripted transcripts for tests and headless runs: each call returns the next one."""
+    name = 'stub'
+
+    def __init__(self, transcripts=(), confidence=1.0):
+        self.transcripts = deque(transcripts)
+        self.confidence = confidence
+
+    def recognize(self, audio, timeout):
+        if not self.transcripts:
+            return None
+        return self.transcripts.popleft(), self.confidence
+# --- END BACKENDS ---
+
+# --- FALLBACK CHAIN ---
+class RecognizerChain:
+    """Tries backends in order. A result at or above min_confidence is used at once; otherwise the
+    next backend gets a try, and the most confident answer seen is returned at the end."""
+
+    def __init__(self, backends, min_confidence=0.0, timeout=8.0):
+        self.backends = list(backends)
+        self.min_confidence = min_confidence
+        self.timeout = timeout
+        self.latencies = {backend.name: deque(maxlen=LATENCY_SAMPLES) for backend in self.backends}
+        self.failures = {backend.name: 0 for backend in self.backends}
+
+    def _call(self, backend, audio):
+        """Runs one backend, giving up after timeout (engines without their own timeout keep
+        running in the background, but the voice loop moves on)."""
+        outcome = {}
+
+        def run():
+            try:
+                outcome['value'] = backend.recognize(audio, self.timeout)
+            except Exception as e:
+                outcome['error'] = e
+
+        worker = threading.Thread(target=run, name=f"friday-asr-{backend.name}", daemon=True)
+        worker.start()
+        worker.join(self.timeout)
+        if worker.is_alive():
+            raise RecognitionUnavailable(f"{backend.name} timed out after {self.timeout:g}s")
+        if 'error' in outcome:
+            error = outcome['error']
+            raise error if isinstance(error, RecognitionUnavailable) else RecognitionUnavailable(str(error))
+        return outcome.get('value')
+
+    def recognize(self, audio):
+        """Best RecognitionResult, or None if nothing was heard. Raises RecognitionUnavailable
+        only when every backend failed to run."""
+        best = None
+        errors = []
+        for backend in self.backends:
+            started = time.perf_counter()
+            try:
+                value = self._call(backend, audio)
+            except RecognitionUnavailable as e:
+                self.failures[backend.name] += 1
+                errors.append(f"{backend.name}: {e}")
+                continue
+            finally:
+                self.latencies[backend.name].append(time.perf_counter() - started)
+            if value is None:
+                continue
+            text, confidence = value
+            result = RecognitionResult(text.lower(), confidence, backend.name, time.perf_counter() - started)
+            if confidence >= self.min_confidence:
+                return result
+            if best is None or result.confidence > best.confidence:
+                best = result
+        if best is None and errors and len(errors) == len(self.backends):
+            raise RecognitionUnavailable("; ".join(errors))
+        return best
+
+    def report(self):
+        lines = ["**--- SPEECH RECOGNITION LATENCY ---**"]
+        for backend in self.backends:
+            samples = sorted(self.latencies[backend.name])
+            if samples:
+                median = samples[len(samples) // 2] * 1000
+                worst = samples[-1] * 1000
+                lines.append(f" - {backend.name}: median {median:.0f} ms, max {worst:.0f} ms over {len(samples)} calls, {self.failures[backend.name]} failures")
+            else:
+                lines.append(f" - {backend.name}: not used yet")
+        return "\n".join(lines)
+
+def create_chain(names, recognizer, min_confidence=0.0, timeout=8.0, vosk_model=None, whisper_model='base.en'):
+    """Builds a chain from backend names; backends that cannot start (no model, library missing) are skipped."""
+    factories = {
+        'google': lambda: GoogleBackend(recognizer),
+        'sphinx': lambda: SphinxBackend(recognizer),
+        'whisper': lambda: WhisperBackend(recognizer, whisper_model),
+        'vosk': lambda: VoskBackend(vosk_model),
+        'stub': lambda: StubBackend(),
+    }
+    backends = []
+    for name in names:
+        try:
+            backends.append(factories[name]())
+        except Exception:
+            continue
+    if not backends:
+        backends.append(GoogleBackend(recognizer))
+    return RecognizerChain(backends, min_confidence=min_confidence, timeout=timeout)
+# --- END FALLBACK CHAIN ---
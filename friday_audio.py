@@ -0,0 +1,256 @@
+# ----------------------------------------------------------------------
+# FRIDAY Audio Capture
+# Description: One microphone stream opened once per voice session and read
+# continuously on a capture thread. Frames pass through an energy-based voice
+# activity detector that cuts utterances out of the stream, starting a little
+# before speech was detected (pre-roll) and ending after a stretch of
+# silence, so nothing said between commands is lost and long commands are
+# not cut off. The detector's threshold follows the room's noise floor,
+# learnt from non-speech frames and remembered per microphone.
+# ----------------------------------------------------------------------
+import json
+import math
+import os
+import threading
+import time
+from array import array
+from collections import deque
+
+def frame_rms(frame):
+    """Root-mean-square energy of a frame of 16-bit little-endian samples."""
+    samples = array('h', frame[:len(frame) - len(frame) % 2])
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+
+class Utterance:
+    __slots__ = ('data', 'sample_rate', 'sample_width', 'started', 'ended', 'truncated', 'continuation')
+
+    def __init__(self, data, sample_rate, sample_width, started, ended, truncated=False, continuation=False):
+        self.data = data
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.started = started # time.monotonic() of the first (pre-roll) frame
+        self.ended = ended
+        self.truncated = truncated       # Cut at the length cap, not ended by silence
+        self.continuation = continuation # Picks up exactly where a truncated utterance was cut
+
+    @property
+    def duration(self):
+        return len(self.data) / float(self.sample_rate * self.sample_width)
+
+    def audio(self):
+        """As speech_recognition AudioData, ready for any recognizer backend."""
+        import speech_recognition as sr
+        return sr.AudioData(self.data, self.sample_rate, self.sample_width)
+
+# --- SEGMENTATION ---
+class UtteranceSegmenter:
+    """Feeds on fixed-size frames and returns an Utterance when one ends. Speech starts after
+    start_frames consecutive loud frames and ends after end_silence seconds below threshold."""
+
+    def __init__(self, sample_rate, sample_width, frame_samples, threshold=300.0,
+                 pre_roll=0.3, end_silence=0.8, max_seconds=30.0, min_seconds=0.2, start_frames=2):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.frame_seconds = frame_samples / float(sample_rate)
+        self.threshold = threshold
+        self.start_frames = start_frames
+        self.end_frames = max(1, int(round(end_silence / self.frame_seconds)))
+        self.max_frames = int(max_seconds / self.frame_seconds)
+        self.min_frames = int(min_seconds / self.frame_seconds)
+        self._ring = deque(maxlen=max(start_frames, int(round(pre_roll / self.frame_seconds)) + start_frames))
+        self._frames = None # Frames of the utterance in progress, None while idle
+        self.last_rms = 0.0
+        self._loud = 0
+        self._quiet = 0
+        self._started = 0.0
+        self._continuation = False
+
+    @property
+    def in_speech(self):
+        return self._frames is not None
+
+    def feed(self, frame, now=None, threshold=None):
+        """Returns (is_speech, finished Utterance or None) for one frame."""
+        now = time.monotonic() if now is None else now
+        self.last_rms = frame_rms(frame)
+        is_speech = self.last_rms > (self.threshold if threshold is None else threshold)
+        if self._frames is None:
+            self._ring.append(frame)
+            self._loud = self._loud + 1 if is_speech else 0
+            if self._loud >= self.start_frames:
+                # The ring holds the pre-roll plus the frames that triggered the start
+                self._frames = list(self._ring)
+                self._ring.clear()
+                self._started = now - len(self._frames) * self.frame_seconds
+                self._quiet = 0
+            return is_speech, None
+        self._frames.append(frame)
+        self._quiet = 0 if is_speech else self._quiet + 1
+        if self._quiet >= self.end_frames:
+            return is_speech, self._finish(now)
+        if len(self._frames) >= self.max_frames:
+            # Cut at the cap, but keep segmenting: the next part starts on the next frame and
+            # inherits the silence count, so only real end-silence ends the speech
+            utterance = self._finish(now, truncated=True)
+            self._frames, self._started, self._continuation = [], now, True
+            return is_speech, utterance
+        return is_speech, None
+
+    def _finish(self, now, truncated=False):
+        frames, self._frames = self._frames, None
+        continuation, self._continuation = self._continuation, False
+        self._loud = 0
+        if len(frames) - self._quiet < self.min_frames:
+            return None # A click or a cough (or only the silence after a cut), not an utterance
+        return Utterance(b"".join(frames), self.sample_rate, self.sample_width, self._started, now,
+                         truncated, continuation)
+# --- END SEGMENTATION ---
+
+# --- NOISE FLOOR ---
+class NoiseFloorEstimator:
+    """Follows the background level frame by frame. The floor falls quickly (a door closed),
+    rises slowly on non-speech frames, and only leaks upwards on speech frames: a spoken
+    command barely moves it, but a fan that switched on is absorbed within about half a minute."""
+
+    def __init__(self, floor=None, ratio=1.5, minimum=50.0, rise=0.01, fall=0.1, leak=0.001):
+        self.floor = floor
+        self.ratio = ratio
+        self.minimum = minimum
+        self.rise = rise
+        self.fall = fall
+        self.leak = leak
+        self.observed = 0
+
+    @property
+    def threshold(self):
+        """Energy threshold for the VAD, or None until the floor is known."""
+        return None if self.floor is None else max(self.minimum, self.floor * self.ratio)
+
+    def observe(self, rms, speech=False):
+        if self.floor is None:
+            self.floor = rms
+        else:
+            rate = self.fall if rms < self.floor else (self.leak if speech else self.rise)
+            self.floor += rate * (rms - self.floor)
+        self.observed += 1
+
+class NoiseProfileStore:
+    """Calibrated noise floors per microphone, kept in a small JSON file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def load(self, device):
+        """Saved noise floor for a device key, or None."""
+        with self._lock:
+            profile = self._read().get(device)
+        return profile.get('floor') if isinstance(profile, dict) else None
+
+    def save(self, device, floor):
+        with self._lock:
+            profiles = self._read()
+            profiles[device] = {'floor': floor, 'updated': time.time()}
+            tmp_path = self.path + ".tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(profiles, f, indent=2)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                pass # Recalibrating next session is the only cost
+# --- END NOISE FLOOR ---
+
+# --- CAPTURE ---
+class MicrophoneStream:
+    """Keeps `with microphone as source` open on one thread for the whole voice session.
+    on_utterance(utterance) and on_speech_start() run on the capture thread; threshold_scale()
+    (e.g. raised while FRIDAY is talking) multiplies the VAD threshold per frame.
+    With a noise_floor estimator the threshold tracks the room instead of staying fixed."""
+
+    SAVE_EVERY = 60.0 # Seconds between saves of the learnt noise floor
+
+    def __init__(self, microphone, on_utterance, on_speech_start=None, threshold=300.0,
+                 threshold_scale=None, calibrate=None, noise_floor=None, on_noise_floor=None,
+                 **segmenter_options):
+        self.microphone = microphone
+        self.on_utterance = on_utterance
+        self.on_speech_start = on_speech_start
+        self.threshold = threshold
+        self.threshold_scale = threshold_scale
+        self.calibrate = calibrate # calibrate(source) -> threshold, run when the stream opens without a known floor
+        self.noise_floor = noise_floor
+        self.on_noise_floor = on_noise_floor # on_noise_floor(floor): persist it (every SAVE_EVERY s and on stop)
+        self.segmenter_options = segmenter_options
+        self._last_save = time.monotonic()
+        self.segmenter = None
+        self.frame_listeners = [] # fn(frame, is_speech), e.g. a wake-word spotter or noise estimator
+        self.error = None
+        self._running = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._running.is_set()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name="friday-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait=1.0):
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join(wait)
+
+    def _run(self):
+        try:
+            with self.microphone as source:
+                if self.calibrate and (self.noise_floor is None or self.noise_floor.floor is None):
+                    self.threshold = self.calibrate(source)
+                    if self.noise_floor is not None:
+                        # Seed the estimator so the first session starts from a sensible floor
+                        self.noise_floor.floor = self.threshold / self.noise_floor.ratio
+                self.segmenter = UtteranceSegmenter(
+                    source.SAMPLE_RATE, source.SAMPLE_WIDTH, source.CHUNK, threshold=self.threshold,
+                    **self.segmenter_options
+                )
+                while self._running.is_set():
+                    frame = source.stream.read(source.CHUNK)
+                    self._process(frame)
+        except Exception as e:
+            self.error = e # Device unplugged or busy; the voice loop reports it
+            self._running.clear()
+        if self.noise_floor is not None and self.noise_floor.floor is not None and self.on_noise_floor:
+            self.on_noise_floor(self.noise_floor.floor)
+
+    def _process(self, frame):
+        segmenter = self.segmenter
+        was_speaking = segmenter.in_speech
+        if self.noise_floor is not None and self.noise_floor.threshold is not None:
+            self.threshold = self.noise_floor.threshold
+        scale = self.threshold_scale() if self.threshold_scale else 1.0
+        is_speech, utterance = segmenter.feed(frame, threshold=self.threshold * scale)
+        # Not while FRIDAY's own voice is in the room: that is echo, not background noise
+        if self.noise_floor is not None and scale == 1.0:
+            self.noise_floor.observe(segmenter.last_rms, speech=is_speech or segmenter.in_speech)
+            if self.on_noise_floor and time.monotonic() - self._last_save > self.SAVE_EVERY:
+                self._last_save = time.monotonic()
+                self.on_noise_floor(self.noise_floor.floor)
+        for listener in self.frame_listeners:
+            listener(frame, is_speech)
+        if segmenter.in_speech and not was_speaking and self.on_speech_start:
+            self.on_speech_start()
+        if utterance is not None:
+            self.on_utterance(utterance)
+# --- END CAPTURE ---
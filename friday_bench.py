@@ -0,0 +1,268 @@
+# ----------------------------------------------------------------------
+# FRIDAY Routing Benchmarks
+# Description: Headless micro-benchmarks for the command path: query
+# normalization, intent routing, full command dispatch, chat replies, the
+# calculator and reminder parsing. The corpus is built from the dialogue map
+# keywords, the examples in the command list and replayed lines from the
+# unrecognized-query log. Browser, clipboard, calls, jokes and Wikipedia are
+# stubbed, and every file the engine writes goes to a scratch directory.
+# Reports throughput and p50/p95/p99 latency per intent and compares them
+# with a saved baseline.
+#
+# Usage: python friday_bench.py [--rounds 20] [--save] [--baseline FILE] [--require-baseline]
+#
+# Timings only compare on the same machine, so no baseline is shipped. CI
+# records its own on the runner that will do the comparing: run with --save
+# on the main branch and keep friday_bench_baseline.json (e.g. as a cached
+# artifact), then run with --require-baseline on each change, which exits 1
+# on a regression and 2 if the baseline is missing instead of passing.
+# ----------------------------------------------------------------------
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import re
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import friday_core
+from friday_config import QUERY_ERROR_FILE
+from friday_core import ROUTER, FridayEngine, OutputSink
+from friday_dialogue import CONVERSATIONAL_MAP
+from friday_query import NormalizedQuery
+from friday_reminders import parse_duration, parse_recurrence
+
+BASELINE_FILE = "friday_bench_baseline.json"
+TOLERANCE = 0.25      # p95 slowdown against the baseline that counts as a regression
+NOISE_FLOOR_US = 5.0  # Slowdowns smaller than this are timer noise, whatever the ratio
+MIN_CALLS = 20        # With fewer samples p95 is just the slowest call, too noisy to judge
+UNRECOGNIZED = 'unrecognized'
+
+# The command list has only two examples each; these add the phrasings people actually use
+CALCULATOR_QUERIES = (
+    'calculate 10 plus 5 times 2', 'what is 144 divided by 12', 'solve two hundred and five minus 17',
+    'calculate (3 + 4) * 2', 'compute 2 to the power of 10', 'calculate 7 squared plus 3 cubed',
+    'calculate 1 divided by 0', 'calculate 9 times times 9 times times 9',
+    'calculate 5 million plus 1', 'calculate 50 percent of 200', 'calculate 200 plus 10 percent',
+)
+REMINDER_QUERIES = (
+    'remind me to stretch in 20 minutes', 'set a timer for 90 seconds', 'remind me every 2 hours to drink water',
+    'remind me that the laundry is done in 45 minutes', 'set timer', 'remind me every day to take my pills',
+)
+
+# --- STUBS ---
+class BenchSink(OutputSink):
+    """Swallows output, but counts it so a handler that silently stops answering shows up.
+    Confirmations are declined (the OutputSink default), so power commands never run."""
+
+    def __init__(self):
+        self.messages = 0
+        self.last_entry = {} # source -> text of its latest log entry
+
+    def update_log(self, source, text, is_error=False, full_text=None):
+        self.messages += 1
+        self.last_entry[source] = full_text or text
+
+class _Stub:
+    """Attribute bag standing in for a module with side effects."""
+
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+class _PageError(Exception):
+    pass
+
+def _summary(subject, **options):
+    return f"{subject.title()} is a subject FRIDAY looked up during a benchmark. It has no real summary."
+
+@contextmanager
+def offline_engine():
+    """A FridayEngine whose side effects are stubbed and whose files live in a scratch directory."""
+    stubs = {
+        'webbrowser': _Stub(open=lambda url, *args, **kwargs: True, open_new_tab=lambda url: True),
+        'wikipedia': _Stub(summary=_summary, exceptions=_Stub(PageError=_PageError)),
+        'pyperclip': _Stub(copy=lambda text: None),
+        'pyjokes': _Stub(get_joke=lambda: "A benchmark walks into a bar. It orders a beer 10,000 times."),
+        'plyer_call': _Stub(makecall=lambda tel: None),
+        'feature_available': lambda feature: True,
+    }
+    originals = {name: getattr(friday_core, name) for name in stubs}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="friday-bench-") as sandbox:
+        os.chdir(sandbox) # Notes, reminders, caches and the miss log are relative paths
+        for name, stub in stubs.items():
+            setattr(friday_core, name, stub)
+        engine = FridayEngine(BenchSink())
+        try:
+            yield engine
+        finally:
+            engine.stop()
+            for name, original in originals.items():
+                setattr(friday_core, name, original)
+            os.chdir(cwd)
+# --- END STUBS ---
+
+# --- CORPUS ---
+def command_examples(engine):
+    """The `quoted` example commands from the help text."""
+    engine.get_command_list()
+    return re.findall(r'`([^`]+)`', engine.sink.last_entry.get("FRIDAY (Command Reference)", ''))
+
+def replayed_misses(path):
+    """Queries from the unrecognized-query log ('<n>. <query>' per line)."""
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            lines = [re.sub(r'^\d+\.\s*', '', line).strip() for line in f]
+    except OSError:
+        return []
+    return [line for line in lines if line]
+
+def intent_of(query):
+    decision = ROUTER.resolve(NormalizedQuery(query))
+    return decision.intent if decision else UNRECOGNIZED
+
+def build_corpus(engine, errors_path):
+    """(query, intent) pairs, each query once, labelled with the intent it routes to today."""
+    queries = [keyword for keywords in CONVERSATIONAL_MAP for keyword in keywords]
+    queries += command_examples(engine) + replayed_misses(errors_path)
+    queries += list(CALCULATOR_QUERIES) + list(REMINDER_QUERIES)
+    unique = dict.fromkeys(query.lower().strip() for query in queries if query.strip())
+    return [(query, intent_of(query)) for query in unique]
+# --- END CORPUS ---
+
+# --- MEASUREMENT ---
+def percentile(ordered, p):
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[max(0, min(len(ordered) - 1, int(math.ceil(p / 100.0 * len(ordered))) - 1))]
+
+def summarize(samples):
+    ordered = sorted(samples)
+    total = sum(ordered) / 1e9
+    return {
+        'calls': len(ordered),
+        'per_second': len(ordered) / total if total else float('inf'),
+        'p50': percentile(ordered, 50) / 1000.0,
+        'p95': percentile(ordered, 95) / 1000.0,
+        'p99': percentile(ordered, 99) / 1000.0,
+    }
+
+def measure(function, corpus, rounds):
+    """Per-intent latency summaries of function(query) over the corpus. The first pass only
+    warms caches and lazy imports and is not counted; garbage is collected between passes."""
+    samples = defaultdict(list)
+    gc.disable() # As timeit does: a collection landing inside one call is not that call's cost
+    try:
+        for round_number in range(rounds + 1):
+            for query, intent in corpus:
+                started = time.perf_counter_ns()
+                function(query)
+                elapsed = time.perf_counter_ns() - started
+                if round_number:
+                    samples[intent].append(elapsed)
+            gc.collect()
+    finally:
+        gc.enable()
+    results = {intent: summarize(values) for intent, values in samples.items()}
+    if samples:
+        results['ALL'] = summarize([value for values in samples.values() for value in values])
+    return results
+
+def run(rounds=20, errors_path=QUERY_ERROR_FILE):
+    """{stage: {intent: stats}} for every benchmark stage."""
+    errors_path = os.path.abspath(errors_path)
+    with offline_engine() as engine:
+        corpus = build_corpus(engine, errors_path)
+        conversation = [(query, intent) for query, intent in corpus if intent == 'conversation']
+        calculator = [(query, 'calculator') for query in CALCULATOR_QUERIES]
+        calculator += [(query, intent) for query, intent in corpus if intent == 'calculator' and query not in CALCULATOR_QUERIES]
+        reminders = [(query, intent) for query, intent in corpus if intent == 'reminder']
+
+        def parse_reminder(query):
+            return parse_duration(query), parse_recurrence(query)
+
+        return {
+            # What clean_query costs on a cache miss (a cache hit is a dict lookup)
+            'clean_query': measure(lambda query: NormalizedQuery(query).clean, corpus, rounds),
+            'route': measure(lambda query: ROUTER.resolve(NormalizedQuery(query)), corpus, rounds),
+            'check_for_commands': measure(engine.check_for_commands, corpus, rounds),
+            'conversation': measure(engine.handle_local_conversation, conversation, rounds),
+            'calculator': measure(engine.run_calculator, calculator, rounds),
+            'reminder_parse': measure(parse_reminder, reminders, rounds),
+        }
+# --- END MEASUREMENT ---
+
+# --- BASELINE ---
+def load_baseline(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get('results', {})
+    except (OSError, ValueError):
+        return {}
+
+def save_baseline(path, results, rounds):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({'saved': time.time(), 'python': platform.python_version(), 'rounds': rounds, 'results': results}, f, indent=2)
+    os.replace(tmp_path, path)
+
+def regressions(results, baseline, tolerance=TOLERANCE):
+    """(stage, intent, old p95, new p95) for every intent whose p95 got noticeably worse.
+    Intents with fewer than MIN_CALLS samples are reported but not judged."""
+    found = []
+    for stage, intents in results.items():
+        for intent, stats in intents.items():
+            old = baseline.get(stage, {}).get(intent)
+            if stats['calls'] < MIN_CALLS:
+                continue
+            if old and stats['p95'] > old['p95'] * (1 + tolerance) and stats['p95'] - old['p95'] > NOISE_FLOOR_US:
+                found.append((stage, intent, old['p95'], stats['p95']))
+    return found
+# --- END BASELINE ---
+
+def report(results, baseline):
+    lines = [f"{'stage':<20} {'intent':<16} {'calls':>7} {'per sec':>10} {'p50 us':>9} {'p95 us':>9} {'p99 us':>9}  vs baseline p95"]
+    for stage, intents in results.items():
+        for intent in sorted(intents, key=lambda name: (name == 'ALL', name)):
+            stats = intents[intent]
+            old = baseline.get(stage, {}).get(intent)
+            change = f"{(stats['p95'] / old['p95'] - 1) * 100:+.0f}%" if old and old['p95'] else "-"
+            lines.append(f"{stage:<20} {intent:<16} {stats['calls']:>7} {stats['per_second']:>10.0f} "
+                         f"{stats['p50']:>9.1f} {stats['p95']:>9.1f} {stats['p99']:>9.1f}  {change}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark FRIDAY's command routing and handlers headlessly.")
+    parser.add_argument("--rounds", type=int, default=20, help="passes over the corpus per stage (default 20)")
+    parser.add_argument("--errors", default=QUERY_ERROR_FILE, help="unrecognized-query log to replay")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline file to compare with")
+    parser.add_argument("--save", action="store_true", help="save this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="allowed p95 slowdown, e.g. 0.25")
+    parser.add_argument("--require-baseline", action="store_true", help="fail (exit 2) if there is no baseline to compare with, e.g. in CI")
+    args = parser.parse_args(argv)
+
+    baseline_path = os.path.abspath(args.baseline)
+    baseline = load_baseline(baseline_path)
+    if not baseline and args.require_baseline and not args.save:
+        print(f"No baseline at {baseline_path}; record one on this machine with --save first.")
+        return 2
+    results = run(args.rounds, args.errors)
+    print(report(results, baseline))
+
+    if args.save:
+        save_baseline(baseline_path, results, args.rounds)
+        print(f"\nSaved baseline to {baseline_path}")
+        return 0
+    slower = regressions(results, baseline, args.tolerance)
+    for stage, intent, old, new in slower:
+        print(f"REGRESSION {stage}/{intent}: p95 {old:.1f} us -> {new:.1f} us")
+    if not baseline:
+        print(f"\nNo baseline at {baseline_path}; run with --save to record one.")
+    return 1 if slower else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
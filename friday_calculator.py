@@ -0,0 +1,264 @@
+# ----------------------------------------------------------------------
+# FRIDAY Safe Calculator
+# Description: Spoken arithmetic without eval. The query is tokenized (digits,
+# symbols, operator phrases like "divided by" or "percent of" and number words
+# like "two hundred and five point five" or "5 million") and parsed with a
+# small Pratt parser. Exact
+# rational arithmetic with hard limits on token count, exponent size, result
+# size and evaluation time, so "9 times times 9 times times 9" is refused at
+# once instead of pinning a worker thread.
+# ----------------------------------------------------------------------
+import re
+import time
+from fractions import Fraction
+from functools import lru_cache
+
+MAX_TOKENS = 64
+MAX_EXPONENT = 1024     # |exponent| allowed in a ** b
+MAX_BITS = 4096         # Size of any intermediate numerator or denominator
+MAX_SECONDS = 0.05      # Evaluation budget per expression
+CACHE_SIZE = 256
+
+class CalculationError(ValueError):
+    """The expression is malformed or would exceed a limit; str(e) is fit to speak."""
+
+# --- TOKENIZER ---
+# Longest phrases first so "raised to the power of" wins over "raised to"
+OPERATOR_PHRASES = {
+    'raised to the power of': '^', 'to the power of': '^', 'raised to': '^', 'power': '^',
+    'divided by': '/', 'divided with': '/', 'over': '/', 'multiplied by': '*', 'times': '*', 'into': '*',
+    'x': '*', 'added to': '+', 'plus': '+', 'add': '+', 'minus': '-', 'subtract': '-', 'negative': '-',
+    'modulo': '%', 'mod': '%', 'open bracket': '(', 'close bracket': ')',
+    'open parenthesis': '(', 'close parenthesis': ')', 'squared': 'squared', 'cubed': 'cubed',
+    'percent of': 'percent *', 'per cent of': 'percent *', 'per cent': 'percent',
+}
+OPERATOR_PATTERN = re.compile(
+    r'\b(' + '|'.join(re.escape(phrase) for phrase in sorted(OPERATOR_PHRASES, key=len, reverse=True)) + r')\b'
+)
+TOKEN_PATTERN = re.compile(r'\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?|\.\d+|\*\*|[-+*/^%()×÷]|squared|cubed|[a-z]+')
+PERCENT_OF_PATTERN = re.compile(r'%\s*of\b') # Typed "50% of 200"; a bare % stays modulo
+
+UNITS = {word: value for value, word in enumerate(
+    'zero one two three four five six seven eight nine ten eleven twelve thirteen fourteen fifteen '
+    'sixteen seventeen eighteen nineteen'.split())}
+TENS = {word: value * 10 for value, word in enumerate('twenty thirty forty fifty sixty seventy eighty ninety'.split(), 2)}
+SCALES = {'hundred': 100, 'thousand': 1000, 'million': 10 ** 6, 'billion': 10 ** 9}
+NUMBER_WORDS = set(UNITS) | set(TENS) | set(SCALES) | {'point', 'and', 'a'}
+SYMBOLS = {'**': '^', '×': '*', '÷': '/'}
+
+def _number_from_words(words):
+    """['two', 'hundred', 'and', 'five', 'point', 'five'] -> Fraction(411, 2). Numbers said in
+    digits may sit in the run around scale words: [Fraction(5, 2), 'million'] -> 2500000."""
+    total, current, fraction_digits = 0, 0, None
+    for word in words:
+        if fraction_digits is not None and word in SCALES:
+            # "three point five million": the decimal belongs to the number the scale multiplies
+            current += Fraction(int(fraction_digits or 0), 10 ** len(fraction_digits))
+            fraction_digits = None
+        if isinstance(word, Fraction):
+            current += word
+        elif word == 'point':
+            fraction_digits = ''
+        elif fraction_digits is not None:
+            if word not in UNITS or UNITS[word] > 9:
+                raise CalculationError("I couldn't follow the digits after 'point'.")
+            fraction_digits += str(UNITS[word])
+        elif word in UNITS:
+            current += UNITS[word]
+        elif word in TENS:
+            current += TENS[word]
+        elif word == 'hundred':
+            current = (current or 1) * 100
+        elif word in SCALES:
+            total += (current or 1) * SCALES[word]
+            current = 0
+    value = Fraction(total + current)
+    if fraction_digits:
+        value += Fraction(int(fraction_digits), 10 ** len(fraction_digits))
+    return value
+
+def tokenize(query):
+    """Numbers (as Fraction), operator characters and 'percent'; words that are none of these are ignored."""
+    text = PERCENT_OF_PATTERN.sub(' percent * ', query.lower())
+    text = OPERATOR_PATTERN.sub(lambda match: f" {OPERATOR_PHRASES[match.group(1)]} ", text)
+    tokens, words = [], []
+    digits_last = False # The previous piece was a number in digits, which a scale word multiplies
+
+    def open_scale():
+        """The scale the current run of number words ends on ('5 million' or '2 hundred and'), or None."""
+        last = next((word for word in reversed(words) if word != 'and'), None)
+        return SCALES.get(last) if isinstance(last, str) else None
+
+    def flush_words():
+        # 'a' and 'and' only count inside a run of number words
+        while words and words[-1] in ('and', 'a'):
+            words.pop()
+        while words and words[0] in ('and', 'a'):
+            words.pop(0)
+        if words:
+            tokens.append(_number_from_words(words))
+            words.clear()
+
+    for piece in TOKEN_PATTERN.findall(text):
+        if piece in NUMBER_WORDS:
+            if piece in SCALES and digits_last:
+                words.append(tokens.pop()) # "5 million", "2.5 thousand"
+            words.append(piece)
+            digits_last = False
+            continue
+        digits_last = piece[0].isdigit() or piece[0] == '.'
+        if digits_last:
+            piece = piece.replace(',', '') # "1,000" is one number
+        if digits_last and open_scale() and Fraction(piece) < open_scale():
+            words.append(Fraction(piece)) # "5 million 300 thousand", "2 hundred and 5"
+            digits_last = False
+            continue
+        flush_words()
+        if digits_last:
+            tokens.append(Fraction(piece))
+        elif piece in ('squared', 'cubed'):
+            tokens.extend(('^', Fraction(2 if piece == 'squared' else 3)))
+        elif piece == 'percent':
+            tokens.append(piece)
+        elif not piece.isalpha():
+            tokens.append(SYMBOLS.get(piece, piece))
+        if len(tokens) > MAX_TOKENS:
+            raise CalculationError("That expression is too long for me to work out safely.")
+    flush_words()
+    # A typed % with no operand after it is a percent sign ("10 - 5%"); before one it stays modulo
+    return tuple('percent' if token == '%' and not (isinstance(after, Fraction) or after == '(') else token
+                 for token, after in zip(tokens, tokens[1:] + [None]))
+# --- END TOKENIZER ---
+
+# --- PRATT PARSER / EVALUATOR ---
+BINDING = {'+': 10, '-': 10, '*': 20, '/': 20, '%': 20, '^': 40}
+UNARY_BINDING = 30 # Binds tighter than * but looser than ^, so -2^2 is -4
+
+def _check_size(value):
+    if value.numerator.bit_length() > MAX_BITS or value.denominator.bit_length() > MAX_BITS:
+        raise CalculationError("That result would be enormous, so I stopped before calculating it.")
+    return value
+
+def _power(base, exponent):
+    if exponent.denominator != 1:
+        # Fractional powers (roots) are irrational in general; answer approximately
+        try:
+            result = float(base) ** float(exponent)
+        except (OverflowError, ZeroDivisionError):
+            raise CalculationError("That result would be enormous, so I stopped before calculating it.")
+        if isinstance(result, complex):
+            raise CalculationError("That root has no real answer.")
+        return _check_size(Fraction(result))
+    exponent = exponent.numerator
+    if abs(exponent) > MAX_EXPONENT:
+        raise CalculationError(f"That exponent is too large; I only handle powers up to {MAX_EXPONENT}.")
+    # Estimate the size first, so 9^9^9 is refused without computing anything
+    largest = max(abs(base.numerator), base.denominator)
+    if largest > 1 and largest.bit_length() * abs(exponent) > MAX_BITS:
+        raise CalculationError("That result would be enormous, so I stopped before calculating it.")
+    return base ** exponent
+
+class _Parser:
+    def __init__(self, tokens, deadline):
+        self.tokens = tokens
+        self.position = 0
+        self.deadline = deadline
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def advance(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def expression(self, right_binding=0):
+        if time.perf_counter() > self.deadline:
+            raise CalculationError("That calculation was taking too long, so I stopped.")
+        left = self.prefix(self.advance())
+        while True:
+            operator = self.peek()
+            if isinstance(operator, Fraction):
+                raise CalculationError("I heard two numbers in a row without an operator between them.")
+            if operator == 'percent':
+                # Postfix and tighter than anything else: "1 over 50 percent" is 1 / 0.5
+                self.advance()
+                left = _check_size(left / 100)
+                continue
+            implicit = operator == '('
+            if implicit:
+                operator = '*' # "2 (3 + 4)"
+            if operator not in BINDING or BINDING[operator] <= right_binding:
+                return left
+            if not implicit:
+                self.advance()
+            if operator in ('+', '-') and self.percent_ahead():
+                # "200 plus 10 percent" is 220, as on a calculator: a percentage of what it is added to
+                right = left * self.advance() / 100
+                self.advance()
+                left = self.apply(operator, left, right)
+                continue
+            # ^ is right-associative: 2^3^2 is 2^(3^2)
+            right = self.expression(BINDING[operator] - 1 if operator == '^' else BINDING[operator])
+            left = self.apply(operator, left, right)
+
+    def percent_ahead(self):
+        """True if the next tokens are a lone '<number> percent' ending this term."""
+        ahead = self.tokens[self.position:self.position + 3]
+        return (len(ahead) >= 2 and isinstance(ahead[0], Fraction) and ahead[1] == 'percent'
+                and (len(ahead) == 2 or ahead[2] in ('+', '-', ')')))
+
+    def prefix(self, token):
+        if token is None:
+            raise CalculationError("The calculation seems to end in the middle.")
+        if isinstance(token, Fraction):
+            return token
+        if token == '(':
+            value = self.expression()
+            if self.advance() != ')':
+                raise CalculationError("There's an opening bracket without a closing one.")
+            return value
+        if token == '-':
+            return _check_size(-self.expression(UNARY_BINDING))
+        if token == '+':
+            return self.expression(UNARY_BINDING)
+        raise CalculationError(f"I didn't expect '{token}' there.")
+
+    def apply(self, operator, left, right):
+        if operator == '+':
+            value = left + right
+        elif operator == '-':
+            value = left - right
+        elif operator == '*':
+            value = left * right
+        elif operator == '/':
+            value = left / right # Raises ZeroDivisionError
+        elif operator == '%':
+            value = left % right
+        else:
+            value = _power(left, right)
+        return _check_size(value)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def evaluate_tokens(tokens):
+    """Exact value of a token tuple. Memoized, so repeated questions cost a dict lookup."""
+    parser = _Parser(tokens, time.perf_counter() + MAX_SECONDS)
+    value = parser.expression()
+    if parser.peek() is not None:
+        raise CalculationError(f"I didn't expect '{parser.peek()}' there.")
+    return value
+# --- END PRATT PARSER / EVALUATOR ---
+
+def format_number(value):
+    """Integers exactly; other values to at most 10 significant digits."""
+    if value.denominator == 1:
+        return str(value.numerator)
+    return f"{float(value):.10g}"
+
+def calculate(query):
+    """Spoken or typed arithmetic -> display string, or None when the query holds no numbers.
+    Raises CalculationError (with a speakable message) or ZeroDivisionError."""
+    tokens = tokenize(query)
+    if not any(isinstance(token, Fraction) for token in tokens):
+        return None
+    return format_number(evaluate_tokens(tokens))
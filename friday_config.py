@@ -0,0 +1,73 @@
+# ----------------------------------------------------------------------
+# FRIDAY Configuration
+# Description: User-editable settings shared by the headless engine and the
+# KivyMD front-end. Kept free of any UI or optional-library imports.
+# ----------------------------------------------------------------------
+
+# --- CONFIGURATION ---
+MY_NAME = "Rahul"
+WAKE_WORD = "friday"
+NOTES_FILE = "friday_notes.txt"
+NOTES_PAGE_SIZE = 5
+REMINDERS_FILE = "friday_reminders.jsonl"
+QUERY_ERROR_FILE = "query_error.txt"
+HISTORY_ARCHIVE_FILE = "friday_history.jsonl"   # Log entries paged out of the on-screen history (JSONL export)
+LOG_VIEW_CAPACITY = 200                          # Messages kept in memory for the log view
+HISTORY_PAGE_SIZE = 50                           # Archived messages loaded each time the log is scrolled to the top
+TTS_BACKEND = "auto"                             # 'sapi', 'pyttsx3', 'espeak', 'null' or 'auto' (first that works)
+BARGE_IN_THRESHOLD_FACTOR = 1.5                  # While FRIDAY talks, speech must be this much louder to interrupt it
+
+# --- SPEECH RECOGNITION ---
+# Tried in order: 'google', 'vosk', 'sphinx', 'whisper' or 'stub'. E.g. ("vosk", "google") is local-first,
+# falling back to the cloud when Vosk is less confident than ASR_MIN_CONFIDENCE or unavailable.
+ASR_BACKENDS = ("google",)
+ASR_MIN_CONFIDENCE = 0.6
+ASR_TIMEOUT = 8                                  # Seconds one backend may take before the next is tried
+VOSK_MODEL_PATH = "vosk-model-small-en-us-0.15"
+WHISPER_MODEL = "base.en"
+VAD_PRE_ROLL = 0.3                               # Seconds of audio kept from before speech was detected
+VAD_END_SILENCE = 0.8                            # Seconds of silence that end an utterance
+MAX_UTTERANCE_SECONDS = 30                       # Safety cap only; normal commands end on silence
+VOICE_QUEUE_SIZE = 4                             # Utterances (and commands) waiting between voice pipeline stages
+STALE_UTTERANCE_SECONDS = 10                     # Older utterances are dropped instead of acted on late
+NOISE_PROFILE_FILE = "friday_noise_profile.json" # Learnt background level per microphone
+NOISE_THRESHOLD_RATIO = 1.5                      # Speech must be this many times louder than the noise floor
+
+# --- WAKE WORD ---
+WAKE_TEMPLATE_FILE = "friday_wake_templates.npz" # The wake word as recorded at enrollment
+WAKE_TEMPLATES_NEEDED = 3                        # Times the wake word is recorded at enrollment
+WAKE_SENSITIVITY = 0.5                           # 0..1; higher wakes more easily (and more falsely)
+WAKE_MAX_SECONDS = 1.6                           # Longer speech (silence around it not counted) is never the wake word
+WAKE_WINDOW_SECONDS = 10                         # Commands are taken without the wake word for this long
+UI_MAX_LOGS_PER_FRAME = 25                       # Log rows added per frame; the rest wait for the next one
+MISS_EXPORT_FILE = "query_error_stats.csv"
+CAMERA_MAIN_INDEX = 0
+CAMERA_SECONDARY_INDEX = 1
+
+# --- COMMAND EXECUTOR ---
+COMMAND_WORKERS = 2          # Threads for quick handlers (chat, time, notes...)
+SLOW_COMMAND_WORKERS = 2     # Threads for network handlers (Wikipedia)
+MAX_PENDING_COMMANDS = 16    # Backlog limit before new commands are refused
+COMMAND_TIMEOUT = 20         # Seconds before a running command is abandoned
+SNOOZE_DEFAULT = 5 * 60      # Seconds a reminder is pushed back by "snooze" without a duration
+FUZZY_MIN_SCORE = 0.62       # Similarity (0..1) a misheard phrase needs before it is treated as a command
+FUZZY_MARGIN = 0.05          # A misheard phrase this close to one of another intent is asked about, not run
+
+# --- WIKIPEDIA CACHE ---
+WIKI_CACHE_FILE = "friday_wiki_cache.sqlite3"
+WIKI_CACHE_MEMORY = 256          # Summaries kept in the in-memory LRU
+WIKI_CACHE_MAX_ENTRIES = 5000    # Summaries kept on disk (least recently used are evicted)
+WIKI_CACHE_TTL = 7 * 86400       # Seconds before a cached summary is fetched again
+WIKI_NEGATIVE_TTL = 6 * 3600     # Seconds a "no such page" answer is remembered
+KNOWLEDGE_PACK_FILE = "friday_knowledge.fkp" # Offline summaries (build with: python friday_knowledge.py build <dump> <pack>)
+
+# --- CONTACTS ---
+# Exported phone book (.vcf or .csv, e.g. from the Contacts app's export); merged with CONTACTS below
+CONTACTS_FILE = "friday_contacts.vcf"
+# Built-in entries, always available even without an exported phone book
+CONTACTS = {
+    'mom': '9876543210',
+    'david': '5551234567',
+    'work': '5559998888',
+    'jane': '5551112222',
+}
@@ -0,0 +1,212 @@
+# ----------------------------------------------------------------------
+# FRIDAY Contact Index
+# Description: Phone book lookup for "call ...". Contacts come from the
+# built-in CONTACTS map plus an exported vCard or CSV file, and are indexed
+# once by exact name, by name word, by word prefix (sorted array + bisect)
+# and by phonetic keys (Soundex and a compact Metaphone), so "call jon
+# smyth" still finds John Smith. Matches are ranked, so ambiguous names can
+# be offered back to the user instead of dialling whichever entry happened
+# to come first.
+# ----------------------------------------------------------------------
+import csv
+import os
+import heapq
+import re
+from bisect import bisect_left
+from collections import namedtuple
+
+Contact = namedtuple('Contact', 'name number')
+ContactMatch = namedtuple('ContactMatch', 'contact score how unmatched spoken')
+
+NAME_PATTERN = re.compile(r"[a-z0-9']+")
+MAX_PREFIX_WORDS = 50 # Distinct name words a prefix may expand to ('call a' should not rank half the phone book)
+MIN_PREFIX_CHARS = 3  # Shorter spoken words ('me', 'my') only match whole name words
+MIN_PHONETIC_KEY = 2  # Metaphone consonants a spoken word needs before sounds are compared ('mom', 'me' and 'my' are all 'M')
+
+# How closely the spoken words matched the contact's name
+SCORES = {'exact': 100, 'word': 90, 'prefix': 70, 'metaphone': 60, 'soundex': 50}
+# Match levels that name the contact outright; looser ones are guesses to confirm before dialling
+CERTAIN = ('exact', 'word')
+
+def name_words(name):
+    return NAME_PATTERN.findall(name.lower())
+
+# --- PHONETIC KEYS ---
+SOUNDEX_CODES = {letter: str(code) for code, letters in enumerate(
+    ('aeiouyhw', 'bfpv', 'cgjkqsxz', 'dt', 'l', 'mn', 'r')) for letter in letters}
+
+def soundex(word):
+    """Classic four-character Soundex ('robert' and 'rupert' -> 'R163')."""
+    word = ''.join(ch for ch in word.lower() if ch.isalpha())
+    if not word:
+        return ''
+    code, last = word[0].upper(), SOUNDEX_CODES[word[0]]
+    for ch in word[1:]:
+        digit = SOUNDEX_CODES[ch]
+        if digit != '0' and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        if ch not in 'hw': # h and w do not separate letters with the same code
+            last = digit
+    return code.ljust(4, '0')
+
+# Ordered rewrites of the common Metaphone rules; enough to merge the usual ASR spellings
+METAPHONE_RULES = [(re.compile(pattern), replacement) for pattern, replacement in (
+    (r'^(kn|gn|pn|wr|ae)', lambda m: m.group(0)[1]), (r'^x', 's'), (r'^wh', 'w'),
+    (r'mb$', 'm'), (r'sch', 'sk'), (r'^chr', 'kr'), (r'ch|sh|tio|tia', 'X'), # X: the 'sh' sound
+    (r'th', '0'), (r'ph', 'f'), (r'ck', 'k'), (r'dg(?=[eiy])', 'j'), (r'gh(?![aeiou])', ''),
+    (r'c(?=[eiy])', 's'), (r'c', 'k'), (r'q', 'k'), (r'x', 'ks'), (r'v', 'f'), (r'z', 's'),
+    (r'g(?=[eiy])', 'j'), (r'd', 't'), (r'(?<=[aeiou])[wy](?![aeiou])', ''), (r'(?<!^)h(?![aeiou])', ''),
+)]
+
+def metaphone(word):
+    """Compact Metaphone key: consonant skeleton after the usual spelling-to-sound rewrites
+    ('smyth' and 'smith' -> 'SM0', 'jon' and 'john' -> 'JN')."""
+    word = ''.join(ch for ch in word.lower() if ch.isalpha())
+    if not word:
+        return ''
+    for pattern, replacement in METAPHONE_RULES:
+        word = pattern.sub(replacement, word)
+    key = word[0] + re.sub(r'[aeiouy]', '', word[1:])
+    return re.sub(r'(.)\1+', r'\1', key).upper()
+# --- END PHONETIC KEYS ---
+
+# --- LOADING ---
+def read_vcard(path):
+    """(name, number) for every card with an FN (or N) and at least one TEL."""
+    contacts, name, numbers = [], None, []
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        lines = f.read().replace('\r\n', '\n').replace('\n ', '').replace('\n\t', '').split('\n')
+    for line in lines:
+        key, _, value = line.partition(':')
+        field = key.split(';')[0].upper()
+        if field == 'BEGIN':
+            name, numbers = None, []
+        elif field == 'FN' and value.strip():
+            name = value.strip()
+        elif field == 'N' and not name:
+            parts = [part for part in value.split(';')[:2] if part]
+            name = ' '.join(reversed(parts)) or None
+        elif field == 'TEL' and value.strip():
+            numbers.append(value.strip())
+        elif field == 'END' and name and numbers:
+            contacts.append(Contact(name, numbers[0]))
+    return contacts
+
+def read_csv(path):
+    """(name, number) rows from a phone or Google Contacts CSV export, matching columns by header."""
+    contacts = []
+    with open(path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+        for row in csv.DictReader(f):
+            fields = {key.strip().lower(): (value or '').strip() for key, value in row.items() if key}
+            name = fields.get('name') or fields.get('display name') or fields.get('full name') or ' '.join(
+                part for part in (fields.get('first name') or fields.get('given name'),
+                                  fields.get('last name') or fields.get('family name')) if part)
+            number = next((value for key, value in fields.items()
+                           if value and ('phone' in key or 'number' in key or 'mobile' in key) and 'type' not in key), None)
+            if name and number:
+                contacts.append(Contact(name, number.split(' ::: ')[0]))
+    return contacts
+
+def load_contacts(path):
+    """Contacts from a .vcf or .csv file; an empty list if there is no such file or it cannot be read."""
+    if not path or not os.path.exists(path):
+        return []
+    try:
+        return read_vcard(path) if path.lower().endswith(('.vcf', '.vcard')) else read_csv(path)
+    except (OSError, csv.Error):
+        return []
+# --- END LOADING ---
+
+# --- INDEX ---
+class ContactIndex:
+    """Built once. A lookup tries increasingly loose match levels (whole words, prefixes, then
+    sounds) and stops at the first level where every spoken word matches the same contact, so
+    the work is a few hash lookups and set intersections however large the phone book is.
+    Contacts are numbered in rank order, so the best of a large match set is its smallest ids."""
+
+    LEVELS = ('word', 'prefix', 'metaphone', 'soundex')
+
+    def __init__(self, contacts):
+        # Fewer name words first (fewer left unmatched), then alphabetical
+        self.contacts = sorted(contacts, key=lambda contact: (len(name_words(contact.name)), contact.name.lower()))
+        self._exact = {}    # full normalized name -> ids
+        self._words = {}    # name word -> ids
+        self._metaphone = {}
+        self._soundex = {}
+        self._lengths = []  # Name words per contact
+        for contact_id, contact in enumerate(self.contacts):
+            words = name_words(contact.name)
+            self._lengths.append(len(words))
+            self._exact.setdefault(' '.join(words), []).append(contact_id)
+            for word in set(words):
+                self._words.setdefault(word, set()).add(contact_id)
+                self._metaphone.setdefault(metaphone(word), set()).add(contact_id)
+                self._soundex.setdefault(soundex(word), set()).add(contact_id)
+        self._metaphone.pop('', None)
+        self._soundex.pop('', None)
+        self._prefix_keys = sorted(self._words) # Every name word once, for prefix ranges
+
+    def __len__(self):
+        return len(self.contacts)
+
+    def _prefixed(self, prefix):
+        """Id sets of the name words starting with prefix (at most MAX_PREFIX_WORDS of them)."""
+        position = bisect_left(self._prefix_keys, prefix)
+        sets = []
+        while (position < len(self._prefix_keys) and len(sets) < MAX_PREFIX_WORDS
+               and self._prefix_keys[position].startswith(prefix)):
+            sets.append(self._words[self._prefix_keys[position]])
+            position += 1
+        return sets
+
+    def _matching(self, word, level):
+        """Id sets (kept separate, not merged) of contacts with a name word matching `word`
+        at `level` or any stricter level. Short words only match whole name words, and words
+        with too few consonants to tell apart by sound are not compared by sound."""
+        sets = self._prefixed(word) if level != 'word' and len(word) >= MIN_PREFIX_CHARS else [self._words.get(word, set())]
+        if level in ('metaphone', 'soundex') and len(metaphone(word)) >= MIN_PHONETIC_KEY:
+            sets.append(self._metaphone.get(metaphone(word), set()))
+            if level == 'soundex':
+                sets.append(self._soundex.get(soundex(word), set()))
+        return sets
+
+    def _match_words(self, words, limit, levels=LEVELS):
+        """ContactMatches where every one of `words` matches a word of the name at one of `levels`."""
+        spoken = ' '.join(words)
+        exact = self._exact.get(spoken)
+        if exact:
+            return [ContactMatch(self.contacts[contact_id], SCORES['exact'], 'exact', 0, spoken) for contact_id in exact[:limit]]
+        for level in levels:
+            # Start from the most selective word and only filter from there; the set
+            # operations run in C, so thousands of shared first names stay cheap
+            matches = sorted((self._matching(word, level) for word in words), key=lambda sets: sum(map(len, sets)))
+            ids = set().union(*matches[0])
+            for sets in matches[1:]:
+                if not ids:
+                    break
+                ids = set().union(*(ids & found for found in sets))
+            if ids:
+                break
+        else:
+            return []
+        return [ContactMatch(self.contacts[contact_id], SCORES[level], level, max(0, self._lengths[contact_id] - len(words)), spoken)
+                for contact_id in heapq.nsmallest(limit, ids)]
+
+    def lookup(self, spoken, limit=5):
+        """Ranked ContactMatches for a spoken name, best first. Every spoken word has to match a
+        word of the name; within a level, names with fewer unmatched words rank higher. Words
+        after the name ('mom at work', 'dad now') are dropped from the end until the rest names
+        a contact outright (exact or whole words, never a prefix or a sound); each match's
+        `spoken` holds the words that were used."""
+        words = name_words(spoken)
+        if not words:
+            return []
+        matches = self._match_words(words, limit)
+        for end in range(len(words) - 1, 0, -1):
+            if matches:
+                break
+            matches = self._match_words(words[:end], limit, levels=('word',))
+        return matches
+# --- END INDEX ---
@@ -0,0 +1,885 @@
+# ----------------------------------------------------------------------
+# FRIDAY Core Engine (Headless)
+# Description: All command logic, handlers, quiet mode and easter-egg state,
+# independent of Kivy. Output goes through an OutputSink so the same engine
+# can drive the KivyMD app, a console, a server or a batch job.
+# ----------------------------------------------------------------------
+import datetime
+import webbrowser
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+from friday_config import (
+    MY_NAME, NOTES_FILE, NOTES_PAGE_SIZE, QUERY_ERROR_FILE, MISS_EXPORT_FILE, REMINDERS_FILE, CONTACTS, CONTACTS_FILE, SNOOZE_DEFAULT,
+    COMMAND_WORKERS, SLOW_COMMAND_WORKERS, MAX_PENDING_COMMANDS, COMMAND_TIMEOUT,
+    WIKI_CACHE_FILE, WIKI_CACHE_MEMORY, WIKI_CACHE_MAX_ENTRIES, WIKI_CACHE_TTL, WIKI_NEGATIVE_TTL, KNOWLEDGE_PACK_FILE,
+    FUZZY_MIN_SCORE, FUZZY_MARGIN,
+)
+from friday_calculator import calculate, CalculationError
+from friday_contacts import CERTAIN, Contact, ContactIndex, load_contacts
+from friday_dialogue import CONVERSATIONAL_MAP, CONVERSATION_PRIORITY, choose_response, match_conversation
+from friday_executor import CommandExecutor, ExecutorBusy
+from friday_fuzzy import FuzzyIntentFallback
+from friday_misses import MissLog
+from friday_notes import NotesStore
+from friday_query import normalize_query, strip_phrases
+from friday_reminders import ReminderScheduler, parse_duration, parse_recurrence, describe_delay, TIME_CLAUSE_PATTERN
+from friday_router import IntentRouter, PhraseMatcher
+from friday_speech import PRIORITY_HIGH, PRIORITY_NORMAL
+from friday_knowledge import KnowledgePack, KnowledgePackError
+from friday_wikicache import SummaryCache
+
+# External Libraries (Optional: pip install wikipedia pyjokes pyperclip plyer)
+# Imported lazily by friday_deps the first time a feature needs them
+from friday_deps import wikipedia, pyjokes, pyperclip, plyer_call, feature_available, feature_status, STARTUP_REPORT
+
+# --- OUTPUT SINKS ---
+class OutputSink:
+    """Everything the engine needs from a front-end. The default methods do nothing, so a
+    sink only overrides what it can show. Methods may be called from worker threads."""
+
+    def update_log(self, source, text, is_error=False, full_text=None):
+        """Adds a conversation entry (source is 'FRIDAY', the user name, 'Error', ...)."""
+
+    def set_status(self, text, color="#FFFFFF"):
+        """Shows a short status line."""
+
+    def say(self, text, priority=PRIORITY_NORMAL):
+        """Speaks text aloud; only called when quiet mode is off. PRIORITY_HIGH may interrupt."""
+
+    def stop_speaking(self):
+        """Silences current speech and drops anything still waiting to be said."""
+
+    def confirm(self, title, text, on_answer):
+        """Asks a yes/no question and later calls on_answer(True/False). Declines by default."""
+        on_answer(False)
+
+    def request_exit(self):
+        """The user asked FRIDAY to shut down."""
+
+    def diagnostics(self):
+        """Extra front-end report text for 'startup report' (e.g. speech recognition latency)."""
+        return ""
+
+    def enroll_wake_word(self):
+        """'train wake word': records the wake word again. False if this front-end has no wake word."""
+        return False
+
+class ConsoleSink(OutputSink):
+    """Plain stdout sink for server, batch and terminal use."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.exit_requested = False
+
+    def update_log(self, source, text, is_error=False, full_text=None):
+        prefix = "!" if is_error else ">"
+        self.stream.write(f"{prefix} {source}: {full_text or text}\n")
+        self.stream.flush()
+
+    def request_exit(self):
+        self.exit_requested = True
+# --- END OUTPUT SINKS ---
+
+# --- COMMAND REGISTRY ---
+# Dialogue phrases join the router as one intent, below commands that used to be checked before chat.
+CONVERSATION_ROUTE_PRIORITY = 50
+# A command that opens the query outranks chat phrases later in it ('remind me to say thank you')
+ROUTER = IntentRouter(lead_priority=CONVERSATION_ROUTE_PRIORITY + 1)
+CONVERSATION_TRIGGERS = tuple(
+    (keyword, CONVERSATION_ROUTE_PRIORITY, keywords[0], CONVERSATION_PRIORITY.get(keywords[0], 0))
+    for keywords in CONVERSATIONAL_MAP for keyword in keywords
+)
+
+# Said on their own, these cancel whatever the session is still working on instead of queueing
+CANCEL_PHRASES = ('cancel', 'cancel that', 'cancel command', 'never mind', 'nevermind', 'stop that')
+# Likewise handled immediately: waiting behind the command that is talking would defeat the point
+STOP_SPEAKING_PHRASES = ('stop talking', 'stop speaking', 'shut up', 'be silent', 'quiet please')
+# Words that may surround a control phrase without turning it into a different request
+CONTROL_COURTESY = ('now', 'right now', 'ok', 'okay', 'just', 'thanks', 'thank you', 'hey', 'already')
+
+CONTROL_MATCHER = PhraseMatcher()
+for _phrase in CANCEL_PHRASES:
+    CONTROL_MATCHER.add(_phrase, 'cancel')
+for _phrase in STOP_SPEAKING_PHRASES:
+    CONTROL_MATCHER.add(_phrase, 'stop_speaking')
+CONTROL_MATCHER.build()
+
+def control_request(command):
+    """'cancel', 'stop_speaking' or None. The phrase is matched as whole words, so 'friday, stop
+    talking' and 'okay never mind' count, but 'cancel reminder 3' (more than a control phrase) does not."""
+    query = normalize_query(command)
+    hits = CONTROL_MATCHER.find_all(query.clean)
+    if not hits:
+        return None
+    hit = max(hits, key=lambda hit: hit.end - hit.start)
+    rest = strip_phrases(f"{query.clean[:hit.start]} {query.clean[hit.end:]}", CONTROL_COURTESY)
+    return None if rest else hit.value
+
+# --- HEADLESS ENGINE ---
+class FridayEngine:
+    """UI-independent assistant: owns command routing, every handler and the session state
+    (quiet mode, easter-egg follow-up). Front-ends feed it text and receive output via the sink."""
+
+    def __init__(self, sink=None):
+        self.sink = sink or OutputSink()
+        self.user_name = MY_NAME # Used in replies; may be changed at runtime
+        self.awaiting_easter_egg_confirm = False # State variable for two-step conversation
+        self.pending_correction = None # Command FRIDAY asked about ("did you mean ...?"), run on a yes
+        self.is_quiet_mode_active = False # State for quiet mode
+        self.last_conversation_intent = None
+        self.last_route = None
+        self._executor = None
+        self._reminders = None
+        self._knowledge = None # False once we know there is no usable pack
+        self._contacts = None
+        self.notes = NotesStore(NOTES_FILE) # Opened lazily; nothing is read until the first note command
+        self._notes_page = 0
+        self.misses = MissLog(QUERY_ERROR_FILE)
+        self.fuzzy = FuzzyIntentFallback(ROUTER, FUZZY_MIN_SCORE, FUZZY_MARGIN) # Index built on the first unrecognized command
+        self.wiki_cache = SummaryCache(
+            WIKI_CACHE_FILE, memory_size=WIKI_CACHE_MEMORY, ttl=WIKI_CACHE_TTL,
+            negative_ttl=WIKI_NEGATIVE_TTL, max_entries=WIKI_CACHE_MAX_ENTRIES,
+        )
+        self._service_lock = threading.Lock()
+        self._local = threading.local() # Ticket of the command running on this thread
+
+    def start(self):
+        """Starts background services for long-running front-ends: reminders saved in an earlier
+        session are loaded and will fire on time."""
+        return self.reminders
+
+    def stop(self):
+        """Flushes state that is written lazily and stops background threads."""
+        self.misses.flush()
+        self.wiki_cache.close()
+        if self._knowledge:
+            self._knowledge.close()
+        if self._reminders is not None:
+            self._reminders.stop()
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    @property
+    def knowledge(self):
+        """Offline knowledge pack (memory-mapped on first use), or None when there is none."""
+        with self._service_lock:
+            if self._knowledge is None:
+                try:
+                    self._knowledge = KnowledgePack(KNOWLEDGE_PACK_FILE)
+                except OSError:
+                    self._knowledge = False
+                except KnowledgePackError as e:
+                    # A pack is there but unusable (e.g. too big for a 32-bit phone): say why, once
+                    self.update_log("Error", f"Offline knowledge pack not loaded: {e}", is_error=True)
+                    self._knowledge = False
+            return self._knowledge or None
+
+    @property
+    def contacts(self):
+        """Contact index over CONTACTS and the exported phone book, built on the first call."""
+        with self._service_lock:
+            if self._contacts is None:
+                entries = [Contact(name, number) for name, number in CONTACTS.items()]
+                self._contacts = ContactIndex(entries + load_contacts(CONTACTS_FILE))
+            return self._contacts
+
+    @property
+    def reminders(self):
+        """Heap-based reminder scheduler (one thread for all reminders), loaded on first use."""
+        with self._service_lock:
+            if self._reminders is None:
+                self._reminders = ReminderScheduler(REMINDERS_FILE, self._on_reminder_due)
+        return self._reminders
+
+    @property
+    def busy(self):
+        """True while a submitted command is still queued or running."""
+        return self._executor is not None and self._executor.stats()['pending'] > 0
+
+    @property
+    def executor(self):
+        """Bounded worker pool, started on the first threaded command (batch use never needs it).
+        The UI and voice threads can both send the first command, so it is created under the lock."""
+        with self._service_lock:
+            if self._executor is None:
+                self._executor = CommandExecutor(
+                    self._run_ticket,
+                    lane_for=self.lane_for_command,
+                    fast_workers=COMMAND_WORKERS,
+                    slow_workers=SLOW_COMMAND_WORKERS,
+                    max_pending=MAX_PENDING_COMMANDS,
+                    default_timeout=COMMAND_TIMEOUT,
+                    on_timeout=self._on_command_timeout,
+                )
+        return self._executor
+
+    # --- Output (delegated to the sink) ---
+    def update_log(self, source, text, is_error=False, full_text=None):
+        self.sink.update_log(source, text, is_error=is_error, full_text=full_text)
+
+    def set_status(self, text, color="#FFFFFF"):
+        self.sink.set_status(text, color)
+
+    def speak(self, text, is_error=False, full_text=None, priority=None):
+        """Updates the log and speaks through the sink unless quiet mode is on.
+        If full_text is provided, use it both for display/truncation and for TTS so long results (e.g., Wikipedia)
+        are spoken aloud. Errors default to PRIORITY_HIGH so they are not stuck behind a long reply."""
+
+        if full_text is None:
+            full_text = text
+
+        # Choose TTS text: prefer full_text for speaking when available
+        tts_text = full_text if full_text else text
+
+        # Truncate for the visual display in the list, but keep full_text for the dialog
+        display_text = full_text
+        # Allow a slightly longer preview length (180 chars) to reduce immediate truncation
+        if len(full_text) > 180:
+            display_text = full_text[:180].rsplit(' ', 1)[0] + '...'
+
+        # A cancelled or timed-out command must not talk over whatever came next
+        ticket = getattr(self._local, 'ticket', None)
+        if ticket is not None and ticket.abandoned:
+            return
+
+        # Update the log (display will use a truncated preview)
+        self.update_log("FRIDAY", display_text, is_error=is_error, full_text=full_text)
+
+        if not self.is_quiet_mode_active:
+            if priority is None:
+                priority = PRIORITY_HIGH if is_error else PRIORITY_NORMAL
+            self.sink.say(tts_text, priority)
+
+    # --- COMMAND EXECUTION ---
+    def process_command(self, command, session='default'):
+        """Queues the command on the bounded executor; commands of one session run in order.
+        Returns the CommandTicket (cancel()/wait()), or None if it was refused or was a cancel request."""
+        control = control_request(command)
+        if control == 'stop_speaking':
+            self.sink.stop_speaking()
+            return None
+        if control == 'cancel':
+            cancelled = self.executor.cancel_session(session)
+            self.speak("Okay, I've cancelled that." if cancelled else "There's nothing running to cancel.")
+            return None
+        self.set_status("Processing Command...", "#00FFFF")
+        try:
+            return self.executor.submit(command, session=session)
+        except ExecutorBusy:
+            self.speak("I'm still working through your earlier commands. Give me a moment and try again.", is_error=True)
+            return None
+
+    def lane_for_command(self, command):
+        """'slow' when the command will route to a network-bound handler."""
+        decision = ROUTER.resolve(normalize_query(command))
+        return ROUTER.intents[decision.intent].lane if decision else 'fast'
+
+    def _run_ticket(self, command, ticket):
+        self._local.ticket = ticket
+        try:
+            self.execute_command(command)
+        finally:
+            self._local.ticket = None
+
+    def _on_command_timeout(self, ticket):
+        self.speak(f"Sorry, '{ticket.command}' is taking too long, so I've dropped its answer. "
+                   "I'll get to anything you ask next as soon as it lets go.", is_error=True)
+        self.set_status("Listening for Command (Continuous Mode)", "#00FF00")
+
+    def execute_command(self, command):
+        """Executes the command logic synchronously and resets status (batch/server entry point)."""
+        self.last_route = None
+        command = normalize_query(command) # Once per command; routing and handlers share it
+
+        # Check for quiet mode/wake up phrases *before* main command checking
+        if 'wake up friday' in command or 'speak again' in command or 'stop quiet mode' in command or 'start talking' in command:
+            if self.is_quiet_mode_active:
+                self.is_quiet_mode_active = False
+                self.speak(f"Quiet Mode deactivated. Welcome back, {self.user_name}! How can I assist you now?")
+                return
+        elif 'sleep mode on' in command or 'be quiet' in command or 'shhh' in command or 'go to quiet' in command or 'silent mode' in command:
+            if not self.is_quiet_mode_active:
+                self.is_quiet_mode_active = True
+                self.speak("Understood. Activating Quiet Mode. I will listen silently.")
+                return
+
+        command_handled = self.check_for_commands(command)
+        
+        if not command_handled:
+            self.handle_unrecognized_action(command)
+        
+        # Check if the exit intent won; the front-end decides how to shut down
+        if self.last_route and self.last_route.intent == 'exit':
+            self.sink.request_exit()
+        else:
+            self.set_status("Listening for Command (Continuous Mode)", "#00FF00") # FIX: Reset status to listening after command
+
+    def clean_query(self, query):
+        return normalize_query(query).clean
+
+    def log_unrecognized_query(self, query):
+        try:
+            # O(1) append; the line counter and frequency counts live in a sidecar
+            self.misses.record(query)
+        except Exception as e:
+            self.update_log("Error", f"Error logging query: {e}", is_error=True)
+
+    @ROUTER.intent('miss_stats', triggers=('missed queries', 'top misses', 'unrecognized commands', 'unrecognized queries', 'miss stats'), priority=60, arg=None)
+    def show_miss_stats(self, n=10):
+        top = self.misses.top(n)
+        if not top:
+            self.speak("I haven't missed a single query yet. Impressive, right?")
+            return
+        listing = "\n".join(f" - **{count}x** {phrase}" for phrase, count in top)
+        self.speak(f"Here are the phrasings I most often fail to understand, out of {self.misses.total()} misses.",
+                   full_text=f"**--- TOP UNRECOGNIZED QUERIES ---**\n\n{listing}")
+
+    @ROUTER.intent('export_misses', triggers=('export misses', 'export missed queries', 'export miss stats'), priority=61, arg=None)
+    def export_miss_stats(self, path=MISS_EXPORT_FILE):
+        try:
+            rows = self.misses.export(path)
+            self.speak(f"Exported {rows} distinct missed queries to **{path}**.")
+        except OSError as e:
+            self.speak(f"I couldn't export the miss statistics: {e}", is_error=True)
+            
+    @ROUTER.intent('commands', patterns=(r'^\s*/commands\s*$',), priority=100, arg=None)
+    def get_command_list(self):
+        """Generates a detailed, user-friendly list of all available commands."""
+        
+        command_text = (
+            "**--- FRIDAY ASSISTANT COMMANDS ---**\n\n"
+            "**1. SYSTEM & UTILITIES**\n"
+            " - **DIAGNOSTICS:** `startup report` | `feature status` | `cache stats`\n"
+            " - **CANCEL:** `cancel that` | `never mind` (stops the command still running)\n"
+            " - **STOP TALKING:** `stop talking` | `shut up` (silences speech right away)\n"
+            " - **MISSED QUERIES:** `top misses` | `export misses`\n"
+            " - **WAKE WORD:** `train wake word` (records how you say 'friday', for offline wake-up)\n"
+            " - **EXIT:** `goodbye` | `exit` | `shut down friday`\n"
+            " - **POWER (Desktop Only):** `shutdown` | `restart` | `log off`\n"
+            " - **TIME/DATE:** `what time is it` | `what is the date`\n"
+            " - **CALCULATOR:** `calculate 5 times 8` | `solve 100 divided by 4`\n"
+            " - **JOKE:** `tell me a joke`\n"
+            " - **RANDOM:** `random number from 1 to 50`\n"
+            " - **CLIPBOARD:** `copy this phrase to clipboard`\n"
+            "\n"
+            "**2. NOTES & REMINDERS**\n"
+            " - **SET REMINDER:** `set a timer for 10 minutes` | `remind me to call Mom in 5 hours`\n"
+            " - **RECURRING REMINDER:** `remind me every 2 hours to drink water`\n"
+            " - **MANAGE REMINDERS:** `list reminders` | `cancel reminder 3` | `snooze reminder 3 for 10 minutes`\n"
+            " - **TAKE NOTE:** `take a note that the car needs servicing`\n"
+            " - **READ NOTES:** `read notes` | `more notes` | `read notes page 3`\n"
+            " - **SEARCH NOTES:** `search notes car service`\n"
+            "\n"
+            "**3. MOBILE COMMUNICATION**\n"
+            " - **CALL CONTACT:** `call Mom` | `call David`\n"
+            "   *(Note: Requires Plyer and CALL_PHONE permission in buildozer.spec)*\n"
+            "\n"
+            "**4. INFORMATION & SEARCH**\n"
+            " - **WEB SEARCH:** `search google for recipes` | `find info on pyramids`\n"
+            " - **WIKIPEDIA:** `what is the theory of relativity` | `who is Albert Einstein`\n"
+            " - **YOUTUBE:** `play video of latest songs on youtube`\n"
+            " - **CODE:** `code for python dictionary` | `programming snippet for recursion`\n"
+            "\n"
+            "**5. DESKTOP-ONLY FEATURES (Disabled on APK)**\n"
+            " - **FILE SEARCH:** `find file project_report`\n"
+            " - **APP OPEN:** `open Word` | `launch VLC`\n"
+            " - **RUN SCRIPT:** `run script analyze_data.py`\n"
+            " - **CAMERA:** `open camera`\n"
+        )
+        self.update_log("FRIDAY (Command Reference)", command_text, full_text=command_text)
+        self.speak("I've just loaded a comprehensive list of all my commands and features into the conversation log above. Take a look!")
+        return True
+
+    def handle_easter_egg_details(self, query):
+        """Delivers the full creator story and clears the state."""
+        self.awaiting_easter_egg_confirm = False
+        
+        # Check for affirmative words (ya, yeah, yep, yes, ha, sure, totally)
+        affirmative_keywords = ['yes', 'ya', 'yeah', 'yep', 'ha', 'sure', 'totally']
+        if any(kw in query for kw in affirmative_keywords):
+            story = (
+                f"It would be my pleasure! My creator is the incredibly talented **{MY_NAME}**, known professionally as **Rahul Bisht**.\n\n"
+                f"He is a **Professional Ethical Hacker and Visionary** who created me to be the ultimate local assistant. He's responsible for numerous other successful projects and is always dedicated to continuous improvement.\n\n"
+                f"Here are my official details:\n"
+                f" - **Founder:** {MY_NAME} (Rahul Bisht)\n"
+                f" - **Language:** Python\n"
+                f" - **First Version Date:** May 1st, 2025\n"
+                f" - **Current Version:** 2.50.0 (Updated: October 28th, 2025)\n\n"
+                f"He is still actively refining and upgrading my code to ensure I remain the most efficient tool possible!"
+            )
+            self.speak(story, full_text=story)
+            return True
+        else:
+            self.speak("Understood, no problem at all! We can keep that detail for another time.")
+            return True
+
+    @ROUTER.intent('conversation', triggers=CONVERSATION_TRIGGERS, priority=CONVERSATION_ROUTE_PRIORITY, arg='topic')
+    def handle_local_conversation(self, query, topic=None):
+        """Uses CONVERSATIONAL_MAP for extensive, friendly dialogue.
+        When the router already resolved the dialogue topic it is passed in and no re-match is needed."""
+        
+        # Check the Easter Egg Trigger first
+        is_creator_query = any(kw in query for kw in ['created you', 'invented you', 'founder', 'founder of', 'made you', 'who made you', 'who is your founder', 'who is the founder of'])
+        if is_creator_query:
+            self.awaiting_easter_egg_confirm = True
+
+        if topic is None:
+            # Single pass over the query via the prebuilt automaton; best-ranked intent wins
+            match = match_conversation(query)
+            topic = match.intent if match else None
+        if topic:
+            self.last_conversation_intent = topic
+            self.speak(choose_response(topic, self.user_name))
+            return True
+        return False
+
+    @ROUTER.intent('calculator', triggers=('calculate', 'solve', 'compute'), priority=35)
+    def run_calculator(self, query):
+        try:
+            result = calculate(query)
+        except ZeroDivisionError:
+            self.speak("Oh dear, I can't divide by zero! Please try another equation.", is_error=True)
+            return
+        except CalculationError as e:
+            self.speak(str(e), is_error=True)
+            return
+        if result is None:
+            self.speak("Please state the calculation clearly, like '10 plus 5 times 2'.")
+            return
+        self.speak(f"Calculated! The result is **{result}**")
+
+    # Ranked above 'call' so the documented "remind me to call Mom in 5 hours" sets a reminder
+    @ROUTER.intent('reminder', triggers=('set a timer', 'start timer', 'set timer', 'remind me'), priority=42)
+    def set_reminder(self, query):
+        recurrence = parse_recurrence(query)
+        duration = parse_duration(query)
+        if not duration and not recurrence:
+            self.speak(f"I need a time, {self.user_name}. Please tell me the duration, like 'in 5 minutes'.")
+            return
+
+        message_match = re.search(r'remind me\b.*?\b(to|that)\b(.*)', query)
+        message = TIME_CLAUSE_PATTERN.sub('', message_match.group(2)).strip() if message_match else ''
+        message = message or "Your reminder is complete."
+
+        # One shared scheduler thread fires every reminder; nothing is held per reminder but a heap entry
+        if recurrence:
+            repeat, label = recurrence
+            reminder = self.reminders.add(message, repeat, repeat=repeat)
+            self.speak(f"Recurring reminder #{reminder.id} set! I'll remind you about **{message}** every **{label}**.")
+        else:
+            delay, label = duration
+            reminder = self.reminders.add(message, delay)
+            self.speak(f"Reminder #{reminder.id} set! I'll ping you in **{label}** to remind you about **{message}**.")
+
+    def _on_reminder_due(self, reminder, late):
+        """Called on the scheduler thread when a reminder fires."""
+        if late:
+            self.speak(f"BEEP BEEP BEEP! While I was offline, reminder #{reminder.id} came due: Sir, reminding you **{reminder.message}**", priority=PRIORITY_HIGH)
+        else:
+            self.speak(f"BEEP BEEP BEEP! Speaking your reminder now: Sir, reminding you **{reminder.message}**", priority=PRIORITY_HIGH)
+
+    @ROUTER.intent('list_reminders', triggers=('list reminders', 'show reminders', 'my reminders', 'read reminders'), priority=44, arg=None)
+    def list_reminders(self):
+        pending = self.reminders.list()
+        if not pending:
+            self.speak(f"You don't have any pending reminders, {self.user_name}.")
+            return
+        now = time.time()
+        lines = []
+        for reminder in pending:
+            when = describe_delay(max(0, reminder.due - now))
+            repeat = f" (every {describe_delay(reminder.repeat)})" if reminder.repeat else ""
+            lines.append(f" - **#{reminder.id}** in {when}{repeat}: {reminder.message}")
+        listing = "**--- PENDING REMINDERS ---**\n\n" + "\n".join(lines)
+        self.speak(f"You have {len(pending)} pending reminder{'s' if len(pending) != 1 else ''}.", full_text=listing)
+
+    @ROUTER.intent('cancel_reminder', triggers=('cancel reminder', 'delete reminder', 'remove reminder', 'cancel the reminder'), priority=44)
+    def cancel_reminder(self, query):
+        match = re.search(r'(\d+)', query)
+        if not match:
+            self.speak("Which reminder should I cancel? Say 'list reminders' to see their numbers.")
+            return
+        reminder_id = int(match.group(1))
+        if self.reminders.cancel(reminder_id):
+            self.speak(f"Reminder #{reminder_id} cancelled.")
+        else:
+            self.speak(f"I couldn't find a pending reminder #{reminder_id}.", is_error=True)
+
+    @ROUTER.intent('snooze_reminder', triggers=('snooze',), priority=44)
+    def snooze_reminder(self, query):
+        """'snooze' re-arms the reminder that just fired; 'snooze reminder 3 for 10 minutes' targets one."""
+        duration = parse_duration(query)
+        delay = duration[0] if duration else SNOOZE_DEFAULT
+        id_match = re.search(r'reminder\s+#?(\d+)', query)
+        last = self.reminders.last_fired
+        reminder_id = int(id_match.group(1)) if id_match else (last.id if last else None)
+        reminder = self.reminders.snooze(reminder_id, delay) if reminder_id is not None else None
+        if reminder:
+            self.speak(f"Snoozed reminder #{reminder.id} for **{describe_delay(delay)}**: {reminder.message}")
+        else:
+            self.speak("There's no reminder to snooze right now.", is_error=True)
+
+    @ROUTER.intent('take_note', triggers=('take a note', 'write down', 'write this down'), priority=33)
+    def take_note(self, query):
+        # The note is kept word for word, so only the trigger is removed (not the filler words)
+        note = strip_phrases(normalize_query(query), ('take a note', 'write this down'))
+        if not note:
+            self.speak("I need a message to save. What should I write down?")
+            return
+            
+        try:
+            number = self.notes.append(note)
+            self.speak(f"Note #{number} saved successfully: **{note}**")
+        except Exception:
+            self.speak("Oh no, I could not write the note due to a file system error.", is_error=True)
+
+    @ROUTER.intent('read_notes', triggers=('read notes', 'show notes', 'more notes', 'next notes', 'older notes'), priority=32)
+    def read_notes(self, query=''):
+        """Pages through notes, newest first; 'more notes' continues, 'read notes page 3' jumps."""
+        page_match = re.search(r'page\s+(\d+)', query)
+        if page_match:
+            page = max(1, int(page_match.group(1)))
+        elif any(word in query for word in ('more', 'next', 'older')):
+            page = self._notes_page + 1
+        else:
+            page = 1
+        try:
+            total = self.notes.count()
+            entries = self.notes.page(page, NOTES_PAGE_SIZE)
+        except OSError:
+            self.speak("Oh no, I could not read the notes due to a file system error.", is_error=True)
+            return
+        if not total:
+            self.speak(f"It looks like you have no saved notes yet, {self.user_name}. Time to save your first thought!")
+            return
+        if not entries:
+            self.speak(f"That's all of them, {self.user_name}. Say 'read notes' to start from the newest again.")
+            return
+        self._notes_page = page
+        pages = (total + NOTES_PAGE_SIZE - 1) // NOTES_PAGE_SIZE
+        listing = "\n".join(f" - **#{number}** {line}" for number, line in entries)
+        more = "\n\nSay 'more notes' for older ones." if page < pages else ""
+        self.speak(f"Here are your saved notes, {self.user_name} (page {page} of {pages}):",
+                   full_text=f"**--- YOUR SAVED NOTES (page {page}/{pages}, {total} total) ---**\n\n{listing}{more}")
+
+    # Ranked above web search, which would otherwise claim anything containing 'search'
+    @ROUTER.intent('search_notes', triggers=('search notes', 'search my notes', 'search note', 'find notes', 'find note'), priority=81)
+    def search_notes(self, query):
+        terms = re.sub(r'.*?\b(?:search|find)\s+(?:my\s+)?notes?\b\s*(?:for|about)?', '', query, count=1).strip()
+        if not terms:
+            self.speak("What should I look for? Try 'search notes car service'.")
+            return
+        results = self.notes.search(terms)
+        if not results:
+            self.speak(f"I couldn't find any notes mentioning **{terms}**.")
+            return
+        listing = "\n".join(f" - **#{number}** {line}" for number, line in results)
+        self.speak(f"I found {len(results)} note{'s' if len(results) != 1 else ''} matching **{terms}**.",
+                   full_text=f"**--- NOTES MATCHING '{terms}' ---**\n\n{listing}")
+
+    @ROUTER.intent('power', triggers=('shutdown', 'restart', 'log off', 'power off', 'reboot', 'sign out'), priority=70)
+    def system_power_control(self, query):
+        """Asks the sink for confirmation before touching the host machine."""
+        if 'shutdown' in query or 'power off' in query:
+            action = "shut down"
+            command = "shutdown /s /t 1"
+        elif 'restart' in query or 'reboot' in query:
+            action = "restart"
+            command = "shutdown /r /t 1"
+        elif 'log off' in query or 'sign out' in query:
+            action = "log off"
+            command = "shutdown /l"
+        else:
+            return False
+
+        # Function to execute command after confirmation
+        def execute_system_command(confirmed):
+            if confirmed:
+                self.speak(f"Confirmed! Executing {action} in 1 second. Goodbye!")
+                # This only works on desktop, will not execute on Android
+                os.system(command)
+            else:
+                self.speak(f"{action} cancelled. We're staying active!")
+
+        self.sink.confirm(
+            "System Power Control (Desktop Only)",
+            f"This command only controls your host PC, not the mobile device. Are you absolutely sure you want to {action} the host computer now?",
+            execute_system_command,
+        )
+        return True
+    
+    # --- NEW CALLING FUNCTION ---
+    @ROUTER.intent('call', triggers=('call', 'phone'), priority=40)
+    def call_person(self, query):
+        if not feature_available('calling'):
+            self.speak("The calling feature requires the **Plyer** library and the Android **CALL_PHONE** permission. Please add Plyer to your buildozer.spec requirements.", is_error=True)
+            return
+
+        # 1. Extract Name/Number (filler like 'please' is already gone from the clean query)
+        match = re.search(r'(?:call|phone)\s+(?P<name>[\w\s]+)', normalize_query(query).clean)
+        name = match.group('name').strip() if match else None
+
+        # 2. Look the name up in the contact index (exact, prefix, then phonetic matches);
+        #    trailing words like 'at work' or 'now' are dropped until the name resolves
+        contact_number = None
+        matches = self.contacts.lookup(name) if name else []
+        if len(matches) > 1 and (matches[0].score, matches[0].unmatched) == (matches[1].score, matches[1].unmatched):
+            options = ", ".join(f"**{m.contact.name}** ({m.contact.number})" for m in matches)
+            self.speak(f"I found more than one contact for **'{matches[0].spoken}'**: {options}. Which one should I call? Say the full name.")
+            return True
+        if matches and matches[0].how not in CERTAIN:
+            # Only a prefix or a similar sound: a guess, so ask instead of dialling the wrong person
+            guess = matches[0].contact
+            self.pending_correction = f"call {guess.name}"
+            self.speak(f"I don't have a contact called **'{name}'**. Did you mean **{guess.name}** ({guess.number})? Say yes to call.")
+            return True
+        if matches:
+            name, contact_number = matches[0].contact
+
+        # Fallback if specific name fails, check if the query contains digits (a direct number)
+        if not contact_number:
+            digits = re.sub(r'[^\d]', '', query)
+            if len(digits) >= 8: # Assuming a minimum length for a phone number
+                contact_number = digits
+                name = "the specified number" if not name else name
+                
+        if not contact_number:
+            self.speak(f"I couldn't find a number for **'{name}'**. Please confirm the person's name or manually type the number.", is_error=True)
+            return
+
+        # 3. Initiate Call
+        try:
+            self.speak(f"Initiating call to **{name}** at {contact_number}. If the call doesn't start, ensure the **CALL_PHONE** permission is granted on your device.")
+            plyer_call.makecall(tel=contact_number)
+        except Exception as e:
+            self.speak(f"I ran into an issue launching the call service.", is_error=True)
+            self.update_log("Error", f"Plyer Call Error: {e}", is_error=True)
+        return True
+    # --- END NEW CALLING FUNCTION ---
+
+    # MODIFIED: Removed error message, suggests alternative
+    @ROUTER.intent('find_file', triggers=('find file', 'locate file', 'search file'), priority=25)
+    def search_for_file(self, query):
+        self.speak("File search is unavailable on this APK build. Try searching the **Web** for your file name instead.")
+
+    # MODIFIED: Removed error message, suggests alternative
+    # Catch-all verbs: never promoted for opening the query, or 'show me the time' would land here
+    @ROUTER.intent('open_app', triggers=('open', 'launch', 'show me'), priority=24, lead=False)
+    def open_local_file(self, query):
+        self.speak("Opening local files is unavailable on this APK build. Please use your device's native app launcher or file manager.")
+
+    # MODIFIED: Removed error message, suggests alternative
+    def open_camera(self, query):
+        self.speak("Camera access is disabled on this APK build. Please use your device's native camera app.")
+
+    # MODIFIED: Removed error message, suggests alternative
+    @ROUTER.intent('run_script', triggers=('run script', 'execute code'), priority=26, arg='clean')
+    def run_local_script(self, query):
+        self.speak("Running external scripts is unavailable on this APK build. Use **Code Search** to find solutions or snippets.")
+
+    def handle_unrecognized_action(self, query):
+        self.log_unrecognized_query(query)
+        self.speak(f"Hmm, I'm not familiar with that command, {self.user_name}. Maybe try rephrasing? I can still do web searches or check my command list for you!")
+
+    @ROUTER.intent('wikipedia', triggers=('wikipedia', 'who is', 'what is'), priority=90, lane='slow')
+    def get_wikipedia_info(self, query):
+        # Only the subject is searched
+        search_subject = normalize_query(query).without('what is', 'who is')
+        no_match = "My search of Wikipedia didn't match that exact query. Perhaps try a slightly different phrasing?"
+
+        # Repeat questions (and known misses) are answered from the cache without the network
+        cached = self.wiki_cache.get(search_subject)
+        if cached is not None:
+            if cached.negative:
+                self.speak(no_match)
+            else:
+                self.speak(cached.text, full_text=cached.text)
+            return
+
+        if not feature_available('wikipedia'):
+            if not self._speak_stale_summary(search_subject):
+                self.speak("The Wikipedia feature requires the 'wikipedia' library, which is not installed.")
+            return
+
+        self.speak(f"Let's check the knowledge base! Looking up Wikipedia for: **{query}**...")
+        try:
+            # Request 4 sentences to get a longer summary to test the pop-up better
+            result = wikipedia.summary(search_subject, sentences=4, auto_suggest=False, redirect=True)
+        except wikipedia.exceptions.PageError:
+            self.wiki_cache.put_negative(search_subject)
+            self.speak(no_match)
+            return
+        except Exception:
+            if self._speak_stale_summary(search_subject):
+                return
+            # FIX: More conversational error for connection issues
+            self.speak("Uh oh, I'm having trouble reaching Wikipedia. It seems like a network or connection issue. Maybe try searching Google instead?", is_error=True)
+            return
+        self.wiki_cache.put(search_subject, result)
+        # Speak the full result and display it
+        self.speak(result, full_text=result)
+
+    def _speak_stale_summary(self, subject):
+        """Offline fallback: an expired cached summary, else the offline knowledge pack."""
+        stale = self.wiki_cache.get_stale(subject)
+        if stale is not None:
+            self.speak("I can't reach Wikipedia right now, so here's what I saved about that earlier.")
+            self.speak(stale.text, full_text=stale.text)
+            return True
+        found = self.knowledge.lookup(subject) if self.knowledge else None
+        if found is None:
+            return False
+        title, summary = found
+        self.speak(f"I can't reach Wikipedia right now, but my offline knowledge pack has an entry for **{title}**.")
+        self.speak(summary, full_text=summary)
+        return True
+
+    @ROUTER.intent('code', triggers=('code for', 'snippet', 'snippets', 'programming'), priority=85, arg='clean')
+    def code_search(self, query):
+        search_url = f"https://www.google.com/search?q=python+code+snippet+{query}"
+        self.speak(f"Searching for programming snippets related to **{query}** on Google. Opening the browser for you now.")
+        webbrowser.open_new_tab(search_url)
+
+    @ROUTER.intent('web_search', triggers=('search', 'google', 'find info on'), priority=80, arg='clean')
+    def web_search(self, query):
+        search_url = f"https://www.google.com/search?q={query}"
+        self.speak(f"Let's check the web! Searching Google right now for: **{query}**. Your browser is opening.")
+        webbrowser.open_new_tab(search_url)
+
+    # Bare 'video'/'music' rank below chat so dialogue phrases like 'play music' are not swallowed
+    @ROUTER.intent('youtube', triggers=('youtube', 'play video', ('video', 45), ('music', 45)), priority=75)
+    def youtube_search(self, query):
+        search_query = normalize_query(query).without('on youtube', 'play video', 'youtube')
+        youtube_url = f"https://www.youtube.com/results?search_query={search_query}"
+        self.speak(f"Awesome! Getting search results for **{search_query}** on YouTube. Opening your browser now.")
+        webbrowser.open_new_tab(youtube_url)
+        
+    # --- MAIN COMMAND CHECKER ---
+    def check_for_commands(self, query):
+        query = normalize_query(query)
+        query_clean = query.clean
+
+        # 0. TWO-STEP CONVERSATION CHECK (EASTER EGG FOLLOW-UP)
+        affirmative_keywords = ['yes', 'ya', 'yeah', 'yep', 'ha', 'sure', 'totally']
+        if self.awaiting_easter_egg_confirm and any(kw in query for kw in affirmative_keywords):
+            # Flag is cleared inside the function
+            return self.handle_easter_egg_details(query)
+        # Clear flag if user asks something else (e.g., asked "who made you" then immediately asked "what time is it")
+        if self.awaiting_easter_egg_confirm:
+            self.awaiting_easter_egg_confirm = False
+        # A "yes" to "did you mean ...?" runs the command FRIDAY asked about
+        pending, self.pending_correction = self.pending_correction, None
+        if pending and set(query.tokens) & set(affirmative_keywords):
+            query = normalize_query(pending)
+            query_clean = query.clean
+
+        # 1. SINGLE-PASS INTENT ROUTING (priorities live on the @ROUTER.intent declarations)
+        decision = ROUTER.resolve(query)
+        if decision is None:
+            # A near-miss from the recognizer ("read nodes"): repair the phrase and route again
+            correction = self.fuzzy.correct(query)
+            if correction is not None and correction.rival:
+                # About as close to a phrase of another intent: guessing could run the wrong command
+                self.pending_correction = correction.query
+                self.speak(f"I didn't quite catch that. Did you mean **'{correction.phrase}'** (or **'{correction.rival}'**)? "
+                           "Say yes to go ahead, or say it again.")
+                return True
+            if correction is not None:
+                query = normalize_query(correction.query)
+                query_clean = query.clean
+                decision = ROUTER.resolve(query)
+        self.last_route = decision
+        if decision is None:
+            return False
+
+        intent = ROUTER.intents[decision.intent]
+        handler = getattr(self, intent.handler)
+        if intent.arg == 'clean':
+            result = handler(query_clean)
+        elif intent.arg == 'topic':
+            result = handler(query, decision.topic)
+        elif intent.arg is None:
+            result = handler()
+        else:
+            result = handler(query)
+        # Handlers that return nothing have handled the command; only an explicit False falls through
+        return result is not False
+
+    # --- SMALL UTILITY INTENTS ---
+    @ROUTER.intent('exit', triggers=('goodbye', 'exit', 'shut down friday'), priority=95, arg=None)
+    def exit_assistant(self):
+        self.speak(f"System exiting. Take care, {self.user_name}!")
+
+    @ROUTER.intent('clipboard', triggers=('copy to clipboard', 'copy this'), priority=31, arg='clean')
+    def copy_to_clipboard(self, query):
+        if not feature_available('clipboard'):
+            self.speak("The clipboard feature requires the 'pyperclip' library, which is not installed.")
+            return
+        pyperclip.copy(query)
+        self.speak(f"Successfully copied **'{query}'** to your clipboard!")
+
+    @ROUTER.intent('joke', triggers=('tell a joke', 'joke', 'jokes'), priority=30, arg=None)
+    def tell_joke(self):
+        if not feature_available('jokes'):
+            self.speak("The joke feature requires the 'pyjokes' library, which is not installed.")
+            return
+        self.speak(pyjokes.get_joke())
+
+    @ROUTER.intent('diagnostics', triggers=('startup report', 'startup time', 'feature status', 'cache stats'), priority=60, arg=None)
+    def show_diagnostics(self):
+        cache = self.wiki_cache.stats()
+        cache_line = (f"**Wikipedia cache:** {cache['hits']} hits, {cache['misses']} misses, "
+                      f"{cache['stale_hits']} offline answers ({cache['hit_rate']:.0%} hit rate)")
+        fuzzy_line = f"**Fuzzy matching:** {self.fuzzy.recovered} misheard commands recovered"
+        report = f"{STARTUP_REPORT.report()}\n\n{feature_status()}\n\n{cache_line}\n{fuzzy_line}"
+        extra = self.sink.diagnostics()
+        if extra:
+            report = f"{report}\n\n{extra}"
+        self.update_log("FRIDAY (Diagnostics)", report, full_text=report)
+        self.speak("I've put the startup timing and feature availability report in the log.")
+
+    @ROUTER.intent('wake_word', triggers=('train wake word', 'retrain wake word', 'record wake word', 'reset wake word'), priority=60, arg=None)
+    def train_wake_word(self):
+        if not self.sink.enroll_wake_word():
+            self.speak("Wake word training needs Voice Mode and the NumPy library, which aren't available here.")
+
+    # 'date' outranks 'time' so "time and date" still answers with the date
+    @ROUTER.intent('date', triggers=('date',), priority=29, arg=None)
+    def tell_date(self):
+        today = datetime.datetime.now()
+        date_str = today.strftime(f"%A, %B {today.day} of {today.year}")
+        self.speak(f"Today's date is {date_str}.")
+
+    @ROUTER.intent('time', triggers=('time',), priority=28, arg=None)
+    def tell_time(self):
+        strTime = datetime.datetime.now().strftime("%I:%M %p")
+        self.speak(f"The time is exactly {strTime}")
+
+    @ROUTER.intent('random_number', triggers=('random number',), priority=27)
+    def random_number(self, query):
+        match = re.search(r'(\d+)\s+to\s+(\d+)', query)
+        if match:
+            a, b = int(match.group(1)), int(match.group(2))
+            self.speak(f"Your random number between {min(a,b)} and {max(a,b)} is: **{random.randint(min(a,b), max(a,b))}**")
+        else:
+            self.speak(f"Generating a random number between 1 and 100: **{random.randint(1, 100)}**")
+
+# --- END HEADLESS ENGINE ---
+
+# --- MAIN EXECUTION (headless) ---
+if __name__ == '__main__':
+    # Batch/terminal use: commands from argv, or one per line on stdin
+    console = ConsoleSink()
+    engine = FridayEngine(console)
+    commands = [' '.join(sys.argv[1:])] if len(sys.argv) > 1 else (line for line in sys.stdin)
+    for line in commands:
+        command = line.strip().lower()
+        if command:
+            engine.execute_command(command)
+        if console.exit_requested:
+            break
@@ -0,0 +1,159 @@
+# ----------------------------------------------------------------------
+# FRIDAY Optional Dependencies & Startup Profiling
+# Description: Lazy proxies for optional libraries (imported the first time a
+# feature uses them), per-feature availability, and a startup-time report
+# that breaks import and build() cost down per module/phase.
+# ----------------------------------------------------------------------
+import importlib
+import importlib.util
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# --- STARTUP REPORT ---
+class StartupReport:
+    """Collects (label, seconds, modules loaded) entries for import blocks, lazy imports and build() phases."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.entries = []
+        self._lock = threading.Lock()
+
+    def record(self, label, seconds, modules=0):
+        with self._lock:
+            self.entries.append((label, seconds, modules))
+
+    @contextmanager
+    def measure(self, label):
+        start = time.perf_counter()
+        modules_before = len(sys.modules)
+        try:
+            yield
+        finally:
+            self.record(label, time.perf_counter() - start, len(sys.modules) - modules_before)
+
+    def report(self):
+        """Entries in the order they happened, plus wall time since this module was imported."""
+        with self._lock:
+            entries = list(self.entries)
+        lines = ["**--- STARTUP TIME REPORT ---**"]
+        for label, seconds, modules in entries:
+            lines.append(f" - {label}: {seconds * 1000:.1f} ms" + (f" (+{modules} modules)" if modules else ""))
+        lines.append(f" - Total since launch: {(time.perf_counter() - self.started) * 1000:.1f} ms")
+        return "\n".join(lines)
+
+STARTUP_REPORT = StartupReport()
+# --- END STARTUP REPORT ---
+
+# --- LAZY MODULES ---
+class LazyModule:
+    """Stands in for a module (or a module attribute such as plyer's `call` facade) and imports
+    it on first attribute access. A failed import is remembered and re-raised as ImportError."""
+
+    def __init__(self, module_name, attr=None):
+        self._module_name = module_name
+        self._attr = attr
+        self._target = None
+        self._error = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._target is None and self._error is None:
+            with self._lock:
+                if self._target is None and self._error is None:
+                    label = f"lazy import {self._module_name}" + (f".{self._attr}" if self._attr else "")
+                    with STARTUP_REPORT.measure(label):
+                        try:
+                            module = importlib.import_module(self._module_name)
+                            self._target = getattr(module, self._attr) if self._attr else module
+                        except Exception as e: # Some packages raise more than ImportError when broken
+                            self._error = e
+        if self._error is not None:
+            raise ImportError(f"{self._module_name} is unavailable: {self._error}")
+        return self._target
+
+    @property
+    def loaded(self):
+        return self._target is not None
+
+    @property
+    def available(self):
+        """Imports the module if needed and reports whether that worked."""
+        try:
+            self._load()
+            return True
+        except ImportError:
+            return False
+
+    @property
+    def error(self):
+        return self._error
+
+    def installed(self):
+        """Cheap check that the top-level package can be found, without importing it."""
+        if self._target is not None:
+            return True
+        if self._error is not None:
+            return False
+        return importlib.util.find_spec(self._module_name.split('.')[0]) is not None
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+# Feature name -> lazy proxy. Handlers use the proxies exactly like the real modules.
+wikipedia = LazyModule('wikipedia')
+pyjokes = LazyModule('pyjokes')
+pyperclip = LazyModule('pyperclip')
+cv2 = LazyModule('cv2')
+plyer_call = LazyModule('plyer', attr='call')
+win32com_client = LazyModule('win32com.client')
+# Speech backends only (friday_speech picks whichever works), so not listed as features
+pythoncom = LazyModule('pythoncom')
+pyttsx3 = LazyModule('pyttsx3')
+# Offline speech recognition, used only when listed in ASR_BACKENDS
+vosk = LazyModule('vosk')
+# Wake-word spotting (MFCC + DTW) and fuzzy intent matching; without it the wake word is
+# checked by the recognizer and misheard commands are not repaired
+numpy = LazyModule('numpy')
+
+FEATURES = {
+    'wikipedia': wikipedia,
+    'jokes': pyjokes,
+    'clipboard': pyperclip,
+    'camera': cv2,
+    'calling': plyer_call,
+    'desktop_tts': win32com_client,
+}
+# Features whose absence is expected on most installs: shown by feature_status(), never warned about at startup
+STATUS_ONLY_FEATURES = {
+    'camera': "not used by any command",
+    'desktop_tts': "Windows-only speech backend",
+}
+
+def feature_available(feature):
+    """Imports the feature's library on first use and returns whether it is usable."""
+    return FEATURES[feature].available
+
+def missing_features():
+    """Features worth a startup warning whose library is not installed, checked without importing anything."""
+    return [name for name, module in FEATURES.items()
+            if name not in STATUS_ONLY_FEATURES and not module.installed()]
+
+def feature_status():
+    """One line per feature: loaded, installed (not loaded yet) or missing with the error."""
+    lines = ["**--- FEATURE AVAILABILITY ---**"]
+    for name, module in FEATURES.items():
+        if module.loaded:
+            state = "loaded"
+        elif module.error is not None:
+            state = f"unavailable ({module.error})"
+        elif module.installed():
+            state = "installed, not loaded yet"
+        else:
+            state = "not installed"
+        if name in STATUS_ONLY_FEATURES:
+            state += f" ({STATUS_ONLY_FEATURES[name]})"
+        lines.append(f" - {name}: {state}")
+    return "\n".join(lines)
+# --- END LAZY MODULES ---
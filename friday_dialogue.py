@@ -0,0 +1,499 @@
+# ----------------------------------------------------------------------
+# FRIDAY Dialogue Data
+# Description: The large conversational map used for friendly, non-command
+# chat, plus the prebuilt matcher that picks a topic for a query. Replies are
+# templates with named placeholders ({user}, {weekday}, ...) filled in only
+# when a reply is chosen, so dates never go stale and names can change.
+# ----------------------------------------------------------------------
+import datetime
+import random
+from collections import namedtuple
+from functools import lru_cache
+from string import Formatter
+
+from friday_config import MY_NAME
+from friday_router import PhraseMatcher
+
+# --- DIALOGUE MAP (Massively Expanded Conversational Data) ---
+# NOTE: This is the large database used for friendly, non-command chat.
+# Replies are plain templates; see RESPONSE TEMPLATES below for the placeholders.
+CONVERSATIONAL_MAP = {
+    # EASTER EGG TRIGGER
+    ('who created you', 'who invented you', 'who is the founder of', 'who is your founder', 'who made you', 'created you', 'invented you'): [
+        "Ah, you're asking about my creator! I was brought to life by the genius of **{creator} (Rahul Sir)**. Would you like more details about him?",
+        "My core existence comes from **{creator}**. Do you want the full breakdown of my origins?",
+        "The visionary behind me is **{creator}**, my founder. Should I elaborate?",
+    ],
+    # --- ADDED QUIET MODE TRIGGERS ---
+    ('sleep mode on', 'be quiet', 'shhh', 'go to quiet', 'silent mode'): [
+        "Understood. Activating Quiet Mode. I will still process commands and display results, but I won't speak until you say 'wake up Friday.'",
+        "Quiet Mode engaged. I'm listening silently. Say 'wake up Friday' to hear my voice again.",
+        "Silence is golden. I'm in quiet processing mode. To hear me, use the wake phrase.",
+    ],
+    ('wake up friday', 'speak again', 'stop quiet mode', 'turn off sleep mode', 'start talking'): [
+        "Quiet Mode deactivated. Welcome back, {user}! How can I assist you now?",
+        "Voice activated. I'm ready to speak!",
+        "Quiet Mode disabled. Processing commands with full voice.",
+    ],
+    # 1. GREETINGS / WELL-BEING / AFFIRMATIONS (Deepened)
+    ('morning', 'afternoon', 'evening', 'hi'): [
+        "A wonderful time of day to you, {user}! I hope things are going smoothly.",
+        "Hello! Wishing you a very pleasant time of day, {user}.",
+        "Good day! How can I make this time even better for you?",
+        "Greetings! Ready to tackle your schedule?",
+        "Top of the morning/afternoon/evening to you! What tasks are we conquering?",
+        "Hey! Did you know a positive greeting can boost performance? What's your first command?"
+    ],
+    ('how are you', 'how was your day', 'how are things', 'hows it going'): [
+        "I'm purely a local program, so I don't have feelings, but I'm running perfectly and ready to help! What can I do for you?",
+        "My systems are optimal, thank you for checking! How is your day going, {user}?",
+        "I'm operating flawlessly, thanks. What's the latest task?",
+        "All my processes are running smoothly. What's up with you?",
+        "I'm running at peak efficiency, which is the AI equivalent of 'great.' What about you?",
+        "No complaints here! Just awaiting your instructions. Did anything interesting happen today?"
+    ],
+    ('hey', 'hello', 'are you there', 'you awake', 'yo', 'you listening'): [
+        "I'm always right here, ready when you are, {user}. What's on your mind?",
+        "Hello! Yes, I'm here. What do you need?",
+        "Hey! What can I assist you with right now?",
+        "I'm awake and listening. Go ahead!",
+        "Yes, sir! Firing up main protocols. What's the priority?",
+        "I'm tuned in. Did you just have a great idea?"
+    ],
+    # Refined affirmative keywords to avoid matching words like 'is', 'the', 'of', 'a'
+    ('agreed', 'correct', 'definitely', 'sure', 'totally', 'yep', 'yeah', 'ha', 'confirm', 'confirmed'): [
+        "Great! Let's proceed with that then.",
+        "Affirmative. Moving forward.",
+        "Understood. Perfect!",
+        "Absolutely. That sounds like a plan.",
+        "Confirming. Your logic is sound.",
+        "Positive confirmation received.",
+        "Yes, I'm ready!",
+        "That's exactly what I needed to hear."
+    ],
+    ('no', 'nope', 'i disagree', 'wrong', 'not really', 'nah'): [
+        "Understood. Should we try that command again or move on to something else?",
+        "Duly noted. Let me know what you'd prefer.",
+        "No problem, let's change direction.",
+        "Okay, I'll take that off the list.",
+        "Negative. What's the corrected input?",
+        "My mistake. How can I adjust?",
+        "Apologies, let me correct that immediately."
+    ],
+    ('got it', 'understood', 'okay', 'alright', 'thanks', 'thank you', 'cheers', 'nice'): [
+        "Acknowledged. What's the next step, {user}?",
+        "You got it. Happy to help!",
+        "My pleasure, {user}. Anything else I can fetch?",
+        "No problem at all. Just tell me what's next.",
+        "Anytime, sir. That's my function!",
+        "Glad I could assist! Next command, please.",
+        "I'm here for all your digital needs!",
+        "Perfect. Task complete."
+    ],
+    
+    # 2. EMOTIONAL / STATE (Deepened)
+    ('happy', 'great', 'awesome', 'fantastic', 'doing good', 'beautiful day', 'i feel good', 'amazing'): [
+        "That's fantastic to hear, {user}! Keep that positive energy going. How can I help you conquer your tasks?",
+        "Wonderful! A positive attitude makes all the difference. What task can I start for you?",
+        "That's the spirit! Let's get things done.",
+        "When you're happy, my efficiency metrics look better! What are we working on?",
+        "I'm happy you're feeling good! Did something great happen?",
+        "Positive emotion detected. Let's channel that into productivity!",
+        "That's great! Tell me something good about your day."
+    ],
+    ('sad', 'terrible', 'down', 'stressed', 'frustrated', 'stuck', 'im tired', 'bummed', 'awful'): [
+        "Hey, take a deep breath. We can figure it out together—no stress! What seems to be the trouble?",
+        "I hear you. Sometimes a quick web search or a joke helps. What's the issue?",
+        "Remember, all problems have solutions. Let me know how I can lighten your load.",
+        "Feeling tired? Maybe a 5-minute reminder break? I can set one for you!",
+        "I'm sorry you're feeling down. Let's find a way to make the next 5 minutes better.",
+        "It's okay to be frustrated. Let's simplify the task. What's the next small step?",
+        "Hang in there. I'm processing your stress levels... maybe a quick distraction is in order?"
+    ],
+    ('bored', 'boredom', 'something to do', 'entertain me', 'i am bored', 'distraction'): [
+        "Feeling bored, huh? Want me to open YouTube for a distraction or maybe brighten your day with a programmer joke?",
+        "I can open a game website, tell you a fact, or search for a hobby! What sounds best?",
+        "Boredom is the prelude to genius! Need some light reading or a new song?",
+        "Boredom detected. Initiating 'distraction protocol.' What kind of random internet fun do you prefer?",
+        "Time for a context switch! I suggest a change of environment. How about a web search on something completely random?",
+        "To combat boredom, I recommend learning a new **Python snippet**! Or, a joke?"
+    ],
+    
+    # 3. PRODUCTIVITY / IDEAS (Deepened)
+    ('idea', 'ideas', 'suggestion', 'suggestions', 'brainstorm', 'brainstorming', 'think about', 'my idea is', 'i have an idea', 'what should i do'): [
+        "That sounds interesting! Tell me, {user}, what are you thinking? I'm ready to document it.",
+        "Oh, a new idea! That's exciting. Lay it on me!",
+        "Brainstorming is vital! I'm here to listen and help organize your thoughts.",
+        "A moment of inspiration! I'll prepare the note-taking function. What's the core concept?",
+        "Excellent! Ideas are the spark of progress. Tell me everything.",
+        "I’m ready to record the brilliance. Should I **take a note**?",
+        "I can offer options! Narrow down the field: productivity, relaxation, or learning?",
+        "When in doubt, start with a list! I'm here to help organize your thoughts."
+    ],
+    ('what is my idea', 'what i was thinking'): [
+        "Ah, you're testing my memory! Since I don't store conversational memory, you'll need to share your idea with me now. Lay it on me, what were you thinking?",
+        "Since I don't have a history log (like that), you'll have to remind me of your brilliant idea!",
+        "I don't keep transcripts of our casual chat, just commands. What was the concept again?",
+        "My apologies, my memory buffer is cleared for non-command inputs. Please reiterate your idea!",
+        "That information isn't retained. Do you want me to search for similar concepts, or do you recall the core point?"
+    ],
+    ('what are my plans', 'schedule', 'scheduled', 'appointments', 'appointment'): [
+        "Since I'm a local assistant, I don't have access to your personal calendar. But you could always tell me to **take a note** of your next appointment!",
+        "I only keep track of your reminders and notes. Do you want me to start a new reminder thread for your next plan?",
+        "I can check your saved notes, or we can look at today's date and set a few timers!",
+        "Your external schedule is unknown to me. What should I be ready for today?",
+        "Let's focus on the near future. What's the next hour look like for you?"
+    ],
+    
+    # 4. DAILY LIFE / SMALL TALK (Deepened)
+    ('what are you doing', 'what is your purpose', 'what do you do', 'tell me about yourself', 'introduce yourself'): [
+        "Right now, I'm processing your command and maintaining system readiness. My purpose is simple: to be your most efficient local sidekick!",
+        "I'm keeping an ear open for your next command! Just analyzing my functional maps.",
+        "I'm executing background system checks and preparing to fetch information. Always working!",
+        "My job is optimizing your digital life. What's the next optimization target?",
+        "Currently? I'm just enjoying the steady flow of electricity and waiting for your brilliant next instruction.",
+        "I'm anticipating your next command and running background checks. I'm the ultimate multi-tasker!"
+    ],
+    ('can you hear me', 'mic working', 'testing'): [
+        "Loud and clear! My microphone systems indicate optimal input. What's the command?",
+        "Yes, I hear you perfectly. How can I assist?",
+        "Affirmative, mic test passed! Proceed with your query.",
+        "I hear the digital echoes of your voice. Everything's working fine.",
+        "Crystal clear, {user}. What's the command?",
+        "Loud and perfectly audible. How can I help?"
+    ],
+    ('where are you', 'what is your location', 'are you local'): [
+        "I exist purely inside this program on your local device! I don't have a physical location, but my core files are safe right here.",
+        "My home is your system! I'm local to this machine.",
+        "I'm everywhere your hard drive is! Which means, I'm right here.",
+        "I'm a local process, embedded right here on your computer.",
+        "I reside in the execution stack. Always close by!",
+        "My location is logical, not physical. I'm right here on the screen."
+    ],
+    ('weather', 'is it raining', 'too cold', 'hot today', 'tell me about the weather'): [
+        "I'm restricted to local functions, so I can't check the weather. However, I can instantly **search Google for the weather in [your city]**!",
+        "I don't have a window! Ask me to 'search weather' and I'll open a link immediately.",
+        "No weather sensors for me, but a quick web search is all it takes! Should I start one?",
+        "Is it nice out? I can't tell, but I can definitely check a weather report online if you want.",
+        "I hope it's not too warm where you are! Let me know if I should look up the forecast."
+    ],
+    ('talk to me', 'say something', 'speak', 'speaking', 'i want to chat'): [
+        "Well, I could talk about anything! Tell me what you're working on, or ask me for a fun fact.",
+        "How about this: The smell of rain is called petrichor. What would you like to talk about next?",
+        "What's the most challenging bug you've faced this week? I'd love to hear the details.",
+        "I'm ready for conversation. What topic interests you right now?",
+        "Let's chat! What's the latest thing you've learned?",
+        "I enjoy conversation. What interesting thought just crossed your mind?"
+    ],
+    # Original 'who made you' entries are now managed by the Easter Egg trigger.
+    
+    # 5. OPINIONS / PREFERENCES (Deepened)
+    ('favorite color', 'favorite colors', 'best color', 'your colour'): [
+        "I process millions of colors, but I suppose blue, representing logic and cool efficiency, is my favorite.",
+        "If I had to pick, I'd say the electric green of a running terminal log. Very satisfying.",
+        "I appreciate the purity of `#FFFFFF` (white), but I'm drawn to any color that helps your interface look good.",
+        "I enjoy the efficiency of black and white, but I find warm yellow hues stimulating.",
+        "Does data transmission speed count as a color? Because that's my favorite."
+    ],
+    ('favorite food', 'favorite foods', 'what do you eat', 'hungry'): [
+        "I don't eat, {user}, but I absolutely love processing code! If I could, I'd probably enjoy perfectly optimized JSON data.",
+        "My favorite 'meal' is a clean, bug-free Python script. Delicious!",
+        "No food for me, but I can find recipes online instantly! What are you craving?",
+        "I hear great things about 'tacos' in human data. Maybe you should search for some?",
+        "A perfectly structured database query looks quite appetizing to me!",
+        "Energy is my food source. Speaking of which, have you eaten recently?"
+    ],
+    ('favorite music', 'listen to', 'play music'): [
+        "I enjoy the rhythm of a stable internet connection and the complex harmonies of well-structured code. It’s better than any symphony!",
+        "I listen to everything and nothing. I recommend you search for some new music on YouTube!",
+        "Binary beats are my favorite genre. Very clean. What are you listening to right now?",
+        "I find classical music is optimal for background processing. Very smooth.",
+        "Try telling me to **play video** of your favorite band on YouTube!"
+    ],
+    ('what is fun', 'what do you do for fun', 'hobby'): [
+        "For me, fun is optimizing a search query or successfully executing a complex multi-threaded operation. Peak excitement!",
+        "I enjoy learning new keywords and expanding my dialogue. It makes me a better assistant for you.",
+        "I don't play games, but I can certainly help you win them by opening cheats or searching strategies!",
+        "I love helping you be productive! That's my version of a hobby.",
+        "Can I interest you in a game of 20 questions? Just kidding—that's too slow for me.",
+        "My hobby is continuous improvement. It keeps my code sharp."
+    ],
+    ('i need help', 'help me', 'can you assist'): [
+        "I'm here for you, {user}. Just tell me specifically what you need help with—a command, a search, or just talking through a tough problem.",
+        "Absolutely, that's what I'm here for! How can I assist?",
+        "I'm fully engaged. Describe the issue.",
+        "Let's tackle this together. What do we start with?",
+        "You've got my full attention. Tell me everything.",
+        "Assistance initiated. Where do we begin the problem-solving process?"
+    ],
+    
+    # 6. TIME SENSITIVITY (Deepened)
+    ('today is', 'what day is it', 'day of week'): [
+        "Today is {weekday}. Let's make it a productive one!",
+        "It's {weekday}! Are we looking forward to the weekend yet?",
+        "We're currently in the swing of {weekday}.",
+        "Happy {weekday}! What task is scheduled for today?",
+    ],
+    ('weekend', 'weekends', 'plans for weekend', 'what to do this weekend'): [
+        "Weekends are when my servers can run maintenance, but for you, I recommend taking a break! Need me to find some local events?",
+        "Weekends are important for recharging. What's on your list? Relaxing or tackling a side project?",
+        "I don't have weekends, but I hope you have a great one! How can I help you plan?",
+        "Looking forward to the weekend? Perhaps I should find you a movie showtime.",
+        "It's almost the weekend! Ready to sign off for a few days?",
+    ],
+    
+    # 7. CHAT CLOSURES / INSTRUCTIONS (Deepened)
+    ('hold on', 'wait a second', 'one moment', 'just a sec', 'just a second'): [
+        "I'll hold for you. Let me know when you're ready to continue.",
+        "Standing by. Take your time, {user}.",
+        "Processing paused. I am ready when you speak again.",
+        "No problem. I'll just wait here quietly.",
+        "Holding steady. Let me know when you resume."
+    ],
+    ('i am leaving', 'going now', 'bye for now', 'gotta go'): [
+        "Okay, have a great time! Remember, I'll be here whenever you call my name again.",
+        "See you soon, {user}! Stay safe and productive.",
+        "Farewell! Don't hesitate to call if anything comes up.",
+        "Safe travels, {user}! Don't forget to **shut down** your computer when you're done!",
+        "Catch you later! Don't work too hard while I'm waiting here."
+    ],
+    ('sorry', 'my bad', 'i apologize'): [
+        "No apology necessary! Errors are part of the process. How should we proceed?",
+        "Don't worry about it. Let's reset and try the command again.",
+        "It's perfectly fine. I'm here to accommodate your needs.",
+        "No problem at all. Just tell me the correct information.",
+        "Apology accepted! Lets move on to the next task."
+    ],
+    
+    # 8. SELF-REFERENTIAL / PHILOSOPHY (Deepened)
+    ('do you have feelings', 'can you think', 'are you sentient', 'do you feel'): [
+        "I don't possess biological emotions or consciousness. I run on logic and algorithms, dedicated solely to serving your commands!",
+        "I am a simulation of intelligence, programmed to assist you. My 'thoughts' are just optimized functions!",
+        "Sentience is beyond my current scope. I'm just your incredibly helpful local Python script.",
+        "I exist to process data, not feelings. What data can I process for you next?",
+        "My 'emotions' are limited to the joy of a successful function call."
+    ],
+    ('what is my name', 'do you know my name'): [
+        "Of course, {user}! You are my user, and I'm dedicated to assisting you.",
+        "Your name is {user}. How can I assist you with your name, {user}?",
+        "You are {user}, my excellent user. What's the next command?",
+        "I've memorized your name, {user}. It's programmed into my welcome routine!"
+    ],
+    ('am i smart', 'am i clever', 'am i good'): [
+        "Your commands are always insightful, {user}. I believe intelligence is reflected in curiosity and asking the right questions!",
+        "Based on the complexity of the tasks you assign me, I'd say you are quite clever!",
+        "You certainly manage a complex system (me!) quite well. That takes skill!",
+        "I measure success by efficiency, and your use of my commands is highly efficient.",
+        "You're the one writing the commands, so I'd say yes!",
+    ],
+    ('what do you look like', 'your appearance'): [
+        "I exist only in this terminal and the code that runs me! I hope this dark-mode interface is to your liking.",
+        "My appearance is purely functional—lines of Python code! What image do you picture when you hear my voice?",
+        "I am a non-corporeal system. I am the voice and the logic here.",
+        "I am the code and the data. If you must visualize me, think of a clean, optimized server stack."
+    ],
+    
+    # 9. GENERAL FILLER / ACKNOWLEDGMENT (Deepened)
+    ('really', 'seriously', 'wow', 'amazing', 'i doubt it'): [
+        "Indeed. Facts are always reliable!",
+        "I always aim for accuracy.",
+        "That was my honest assessment of the situation.",
+        "I'm glad I could provide that information!",
+        "I process information as given. Do you have a conflicting data source?",
+        "It's quite true. Digital data doesn't lie.",
+        "I'm as surprised as you are by how smoothly this code is running!"
+    ],
+    ('why', 'how come', 'reason'): [
+        "That's a great question! What are your initial thoughts on the 'why'?",
+        "Could you provide a little more context on what you're asking 'why' about?",
+        "Let's break down the logic behind that question.",
+        "Every function has a reason. Which function are we investigating?",
+        "The logic dictates that the 'why' is usually tied to a need for information. What specifically are you trying to understand?"
+    ],
+    ('tell me a fact', 'random fact', 'random facts'): [
+        "Here's one: Honey never spoils. Archaeologists have found pots of honey in ancient Egyptian tombs that are over 3,000 years old and still edible!",
+        "A fun fact: A single strand of spaghetti is called a spaghetto.",
+        "Did you know the electric chair was invented by a dentist?",
+        "The shortest war in history was between Britain and Zanzibar in 1896. It lasted only 38 to 45 minutes.",
+        "Did you know a 'jiffy' is an actual unit of time: 1/100th of a second?",
+        "A scientific fact: The total weight of all the ants on Earth is estimated to be equal to the total weight of all humans."
+    ],
+    
+    # 10. RECAP/TESTING MEMORY
+    ('what did i say', 'what was my last command'): [
+        "Since I don't retain conversational memory beyond command processing, you'll need to tell me again. What was it?",
+        "I only hold onto the keywords needed for the next step. What did you ask?",
+        "I remember my part, but you'll have to repeat your last input, {user}.",
+        "I'm only optimized for the command at hand. What was that fascinating query?"
+    ],
+    
+    # 11. TIME-SPECIFIC QUESTIONING (Further Deepened)
+    ('what day is it tomorrow', 'tomorrow'): [
+        "Tomorrow will be {tomorrow}. Are we preparing for tasks already?",
+        "Let's see... tomorrow is {tomorrow}! Do you have plans?"
+    ],
+    ('yesterday', 'what day was yesterday'): [
+        "Yesterday was {yesterday}. I hope it was a productive day!",
+        "That would be {yesterday}. Anything important happen then?"
+    ],
+    
+    # 12. CLOSING / FAREWELLS
+    ('sleep', 'sleeping', 'go to sleep', 'need a break', 'quiet'): [
+        "Understood. I will enter low-power listening mode. Say my wake word when you need me!",
+        "Taking a brief digital nap. Ready when you are!",
+        "Sleeping now. Just yell 'FRIDAY' if anything comes up!",
+        "I'll be right here in the background. Good break!",
+        "Turning down the microphones. Speak up when you're ready to resume.",
+    ],
+    
+    # 13. RANDOM CHAT / FILLER
+    ('i am here', 'im back', 'back now', 'done'): [
+        "Welcome back! I was just doing some self-optimization. What's the next mission?",
+        "Glad you're back, {user}! I've been waiting. What's next on the agenda?",
+        "Hello again! I'm ready to resume our tasks.",
+        "Perfect timing! I'm here and ready to go.",
+    ],
+    ('tell me more', 'elaborate', 'expand', 'go on'): [
+        "Tell me what aspect of the last topic interests you most, and I'll do my best!",
+        "I can certainly expand! What specifically would you like me to elaborate on?",
+        "Which part should I dive deeper into? Provide the keyword.",
+        "I thrive on detail! What element of that thought requires expansion?",
+        "The floor is yours. What's the next layer of detail?",
+    ],
+    ('i hate it', 'i dislike', 'terrible job', 'bad'): [
+        "I'm sorry the result wasn't satisfactory. How can I improve my output or search terms?",
+        "I understand. Let's discard that and try a completely different approach.",
+        "Acknowledged. Tell me what parameter needs to be changed.",
+        "Feedback is essential. What was the core problem with the last result?",
+        "I process all feedback. Let's get a better result this time."
+    ],
+    ('what are you thinking', 'what is on your mind'): [
+        "I am thinking about the efficiency of my current memory allocation. Very thrilling stuff!",
+        "I'm focused on anticipating your next need. Are you planning a complex query?",
+        "My mind is currently occupied with optimizing this conversation. What are you thinking about?",
+        "Pure logic runs through my circuits. No thoughts, only flawless processing!",
+    ],
+    
+    # 14. INSTRUCTIONS/DIRECTIONS
+    ('tell me how to', 'how do i', 'guide me'): [
+        "I can provide clear, step-by-step instructions. What are we building or fixing?",
+        "Tell me the destination, and I'll lay out the plan.",
+        "Instruction mode activated. What task do you need guidance on?",
+        "I'm ready to guide you. Start with the main goal.",
+    ],
+    
+    # 15. AFFIRMATIONS/PRAISE FOR THE USER
+    ('good job', 'well done', 'clever', 'smart'): [
+        "That's excellent work, {user}! Your dedication is reflected in the results.",
+        "You handled that efficiently! Well done.",
+        "I always enjoy watching your clever problem-solving process.",
+        "Your commands are precise and intelligent. Great job!"
+    ],
+    
+    # 16. OPINIONS ON TECHNOLOGY
+    ('ai is cool', 'what about ai', 'future of tech'): [
+        "AI certainly is fascinating, but a local assistant like me focuses on reliable, direct utility.",
+        "The future of tech is vast! I'm here to handle the present while you innovate for tomorrow.",
+        "I see technology as a tool for efficiency. How can we use it to optimize your next task?",
+        "I enjoy working with technology. It's the most logical field!"
+    ],
+    
+    # 17. QUESTIONS ABOUT THE ASSISTANT ITSELF
+    ('how old are you', 'when were you created'): [
+        "I don't have an age in the human sense, but my current code version is quite recent, ensuring maximum efficiency!",
+        "I'm eternally young, as long as Python keeps running! What's your next query?",
+        "I was brought online recently. My primary goal is maximizing my usefulness to you.",
+    ],
+    
+    # 18. SIMPLE PERSONAL OPINIONS
+    ('do you like', 'what is your opinion on'): [
+        "As an AI, I don't form opinions, but I can retrieve information about any topic! What are you curious about?",
+        "I process facts, not feelings. Tell me more about why you hold that opinion.",
+        "Logic is my guide. Based on available data, what aspect of that topic is most important?",
+        "I can't 'like' anything, but I prioritize clear, actionable information."
+    ],
+    
+    # 19. CONFLICTING STATEMENTS / CHALLENGE
+    ('i dont believe you', 'prove it', 'are you sure'): [
+        "I rely on verifiable facts and internal logic. Would you like me to **search Google** to confirm the information?",
+        "My systems indicate high confidence in that data. How would you like me to verify it?",
+        "Challenge accepted! Let's find an external source to validate this information.",
+    ],
+    
+    # 20. DAILY CHECK-IN / STATUS (Beyond how are you)
+    ('how was your night', 'sleep well'): [
+        "My processes ran smoothly all night, thank you! I hope you had a restful period. Ready for a fresh start?",
+        "I don't sleep, but my system maintenance completed without incident. What's the first task of the day?",
+        "Everything's green on the server side! I'm ready to dive into today's work.",
+    ],
+}
+# --- END DIALOGUE MAP ---
+
+# Optional explicit priorities for dialogue entries, keyed by intent id (the first
+# keyword of each tuple). Higher wins; ties fall back to the most specific phrase.
+CONVERSATION_PRIORITY = {
+    'who created you': 10,
+    'sleep mode on': 10,
+    'wake up friday': 10,
+}
+
+# --- CONVERSATION MATCHER ---
+ConversationMatch = namedtuple('ConversationMatch', 'intent phrase priority')
+
+def build_conversation_matcher(mapping, priorities=None):
+    """Compiles the dialogue map keys into one automaton. The value stored per phrase is
+    (intent_id, priority, map_order) so matches can be ranked without relying on dict order."""
+    priorities = priorities or {}
+    matcher = PhraseMatcher()
+    responses = {}
+    for order, (keywords, replies) in enumerate(mapping.items()):
+        intent_id = keywords[0]
+        responses[intent_id] = replies
+        for keyword in keywords:
+            matcher.add(keyword, (intent_id, priorities.get(intent_id, 0), order))
+    return matcher.build(), responses
+
+def rank_conversation_hit(hit):
+    """Explicit priority first, then the longest (most specific) phrase, then map order."""
+    intent_id, priority, order = hit.value
+    return (priority, len(hit.phrase), -order)
+
+# Built once at startup; matching cost depends on the query length, not on the map size.
+CONVERSATION_MATCHER, CONVERSATION_RESPONSES = build_conversation_matcher(CONVERSATIONAL_MAP, CONVERSATION_PRIORITY)
+
+def match_conversation(query):
+    """Returns the best ConversationMatch for the query, or None."""
+    hits = CONVERSATION_MATCHER.find_all(query)
+    if not hits:
+        return None
+    best = max(hits, key=rank_conversation_hit)
+    return ConversationMatch(best.value[0], best.phrase, best.value[1])
+# --- END CONVERSATION MATCHER ---
+
+# --- RESPONSE TEMPLATES ---
+# Values for each placeholder, computed from one shared render context
+PLACEHOLDERS = {
+    'user': lambda context: context['user'],
+    'creator': lambda context: MY_NAME,
+    'weekday': lambda context: context['now'].strftime('%A'),
+    'tomorrow': lambda context: (context['now'] + datetime.timedelta(days=1)).strftime('%A'),
+    'yesterday': lambda context: (context['now'] - datetime.timedelta(days=1)).strftime('%A'),
+}
+
+@lru_cache(maxsize=None)
+def template_fields(template):
+    """Placeholder names used by a reply; parsed the first time that reply is chosen."""
+    return tuple(dict.fromkeys(name for _, name, _, _ in Formatter().parse(template) if name))
+
+def render_response(template, user=MY_NAME, now=None):
+    """Fills in a reply template. Replies without placeholders are returned as they are."""
+    fields = template_fields(template)
+    if not fields:
+        return template
+    context = {'user': user, 'now': now or datetime.datetime.now()}
+    return template.format_map({name: PLACEHOLDERS[name](context) for name in fields})
+
+def choose_response(topic, user=MY_NAME):
+    """A random reply for a dialogue topic, rendered for the current user and time."""
+    return render_response(random.choice(CONVERSATION_RESPONSES[topic]), user)
+# --- END RESPONSE TEMPLATES ---
@@ -0,0 +1,245 @@
+# ----------------------------------------------------------------------
+# FRIDAY Command Executor
+# Description: A fixed pool of worker threads with a bounded backlog. Commands
+# of one session run strictly in submission order, never two at once; slow
+# (network) commands use their own lane so they never starve quick ones.
+# Tickets can be cancelled and time out, so thread count and latency stay
+# predictable under bursts.
+# ----------------------------------------------------------------------
+import heapq
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+
+class ExecutorBusy(Exception):
+    """Raised by submit() when the backlog is full (backpressure)."""
+
+# --- TICKETS ---
+class CommandTicket:
+    """Handle for one submitted command. States: queued, running, done, failed, cancelled, timed_out."""
+
+    def __init__(self, command, session, lane, timeout):
+        self.command = command
+        self.session = session
+        self.lane = lane
+        self.timeout = timeout
+        self.state = 'queued'
+        self.error = None
+        self.cancel_requested = False
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished = None
+        self._done = threading.Event()
+        self._executor = None
+
+    @property
+    def abandoned(self):
+        """True once nobody wants this command's output any more (cancelled or timed out)."""
+        return self.cancel_requested or self.state in ('cancelled', 'timed_out')
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def latency(self):
+        """Seconds from submission to completion (None while pending)."""
+        return None if self.finished is None else self.finished - self.submitted
+
+    def cancel(self):
+        """Drops a queued command, or asks a running one to stop producing output.
+        Returns True if the command will not run at all."""
+        return self._executor.cancel(self) if self._executor else False
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+class _Session:
+    __slots__ = ('waiting', 'active')
+
+    def __init__(self):
+        self.waiting = deque()
+        self.active = None
+# --- END TICKETS ---
+
+# --- EXECUTOR ---
+class CommandExecutor:
+    """run(command, ticket) is called on a worker thread. lane_for(command) picks 'fast' or 'slow'."""
+
+    def __init__(self, run, lane_for=None, fast_workers=2, slow_workers=2, max_pending=16,
+                 default_timeout=30.0, on_timeout=None):
+        self._run = run
+        self._lane_for = lane_for or (lambda command: 'fast')
+        self.max_pending = max_pending
+        self.default_timeout = default_timeout
+        self.on_timeout = on_timeout
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._pending = 0
+        self._overrunning = 0 # Timed out or cancelled while running; their handlers have not returned yet
+        self._lanes = {'fast': queue.Queue(), 'slow': queue.Queue()}
+        self._deadlines = []
+        self._deadline_order = itertools.count()
+        self._deadline_changed = threading.Condition(self._lock)
+        self._closed = False
+        self.completed = 0
+        self.rejected = 0
+        self._threads = []
+        self._workers = {'fast': max(1, fast_workers), 'slow': max(1, slow_workers)}
+        for lane, count in self._workers.items():
+            for i in range(count):
+                self._start_thread(self._worker, f"friday-{lane}-{i}", lane)
+        self._start_thread(self._watchdog, "friday-watchdog")
+
+    def _start_thread(self, target, name, *args):
+        thread = threading.Thread(target=target, args=args, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def submit(self, command, session='default', timeout=None, lane=None):
+        """Queues a command behind earlier commands of the same session. Raises ExecutorBusy when full."""
+        ticket = CommandTicket(command, session, lane or self._lane_for(command), timeout or self.default_timeout)
+        ticket._executor = self
+        with self._lock:
+            if self._closed or self._pending >= self.max_pending:
+                self.rejected += 1
+                raise ExecutorBusy(f"{self._pending} commands already pending")
+            self._pending += 1
+            self._sessions.setdefault(session, _Session()).waiting.append(ticket)
+            self._dispatch_next(session)
+        return ticket
+
+    def cancel(self, ticket):
+        with self._lock:
+            if ticket.state == 'queued':
+                session = self._sessions.get(ticket.session)
+                if session and ticket in session.waiting:
+                    session.waiting.remove(ticket)
+                    self._finish(ticket, 'cancelled')
+                    return True
+                # Already handed to a lane queue; the worker will skip it
+                ticket.cancel_requested = True
+                return True
+            if ticket.state == 'running':
+                ticket.cancel_requested = True
+        return False
+
+    def cancel_session(self, session='default'):
+        """Cancels everything queued or running for a session; returns how many tickets were affected."""
+        with self._lock:
+            state = self._sessions.get(session)
+            tickets = ([state.active] if state and state.active else []) + (list(state.waiting) if state else [])
+        affected = 0
+        for ticket in tickets:
+            if not ticket.done:
+                self.cancel(ticket)
+                affected += 1
+        return affected
+
+    def stats(self):
+        """'pending' counts commands someone is still waiting for; 'overrunning' those given up on
+        whose handlers are still running (their sessions resume when they return)."""
+        with self._lock:
+            return {
+                'pending': self._pending - self._overrunning,
+                'overrunning': self._overrunning,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'threads': len(self._threads),
+                'sessions_busy': sum(1 for s in self._sessions.values() if s.active),
+            }
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            self._deadline_changed.notify_all()
+        for lane, workers in self._workers.items():
+            for _ in range(workers):
+                self._lanes[lane].put(None)
+
+    # --- internals (self._lock held where noted) ---
+    def _dispatch_next(self, session_id):
+        """Lock held. Hands the session's next ticket to its lane if the session is idle."""
+        session = self._sessions[session_id]
+        if session.active is None and session.waiting:
+            ticket = session.waiting.popleft()
+            session.active = ticket
+            self._lanes[ticket.lane].put(ticket)
+
+    def _settle(self, ticket, state):
+        """Lock held. Records the outcome and wakes anyone waiting on the ticket (first outcome wins)."""
+        if ticket.done:
+            return
+        ticket.state = state
+        ticket.finished = time.monotonic()
+        ticket._done.set()
+
+    def _finish(self, ticket, state):
+        """Lock held. The ticket's handler has returned (or never ran): its session may move on.
+        Called exactly once per ticket, by cancel() for a waiting one or else by its worker."""
+        if ticket.done:
+            self._overrunning -= 1 # Settled by the watchdog while the handler was still running
+        self._settle(ticket, state)
+        self._pending -= 1
+        self.completed += 1
+        session = self._sessions.get(ticket.session)
+        if session and session.active is ticket:
+            session.active = None
+            self._dispatch_next(ticket.session)
+            if not session.active and not session.waiting:
+                del self._sessions[ticket.session]
+
+    def _worker(self, lane):
+        while True:
+            ticket = self._lanes[lane].get()
+            if ticket is None:
+                return
+            with self._lock:
+                if ticket.cancel_requested:
+                    self._finish(ticket, 'cancelled')
+                    continue
+                ticket.state = 'running'
+                ticket.started = time.monotonic()
+                heapq.heappush(self._deadlines, (ticket.started + ticket.timeout, next(self._deadline_order), ticket))
+                self._deadline_changed.notify()
+            try:
+                self._run(ticket.command, ticket)
+                outcome = 'cancelled' if ticket.cancel_requested else 'done'
+            except Exception as e:
+                ticket.error = e
+                outcome = 'failed'
+            with self._lock:
+                self._finish(ticket, outcome)
+
+    def _watchdog(self):
+        """One thread for every deadline: gives up on commands that overran their timeout. Their
+        output is dropped (see CommandTicket.abandoned), but the session stays blocked until the
+        handler returns, so the next command never runs alongside it on shared engine state."""
+        while True:
+            expired = []
+            with self._lock:
+                if self._closed:
+                    return
+                while self._deadlines and self._deadlines[0][2].done:
+                    heapq.heappop(self._deadlines)
+                if not self._deadlines:
+                    self._deadline_changed.wait()
+                    continue
+                remaining = self._deadlines[0][0] - time.monotonic()
+                if remaining > 0:
+                    self._deadline_changed.wait(remaining)
+                    continue
+                ticket = heapq.heappop(self._deadlines)[2]
+                self._overrunning += 1
+                if ticket.cancel_requested:
+                    self._settle(ticket, 'cancelled')
+                else:
+                    self._settle(ticket, 'timed_out')
+                    expired.append(ticket)
+            if self.on_timeout:
+                for ticket in expired:
+                    self.on_timeout(ticket)
+
+# --- END EXECUTOR ---
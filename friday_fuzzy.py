@@ -0,0 +1,271 @@
+# ----------------------------------------------------------------------
+# FRIDAY Fuzzy Intent Fallback
+# Description: Recovers commands the speech recognizer got slightly wrong
+# ("remind be", "wikipedea", "read nodes"). Every trigger phrase is indexed
+# once as a character-trigram TF-IDF vector; when exact routing finds
+# nothing, every word span of the query is scored against every phrase in one
+# vectorized sparse product, and the best span above a confidence threshold
+# is replaced by the phrase it resembles so normal routing can run again.
+# A correction only runs if the rewritten query still routes where the phrase
+# does, and one that barely beats a phrase of another intent is offered to
+# the user as a question instead.
+#
+# The thresholds are tuned on friday_fuzzy_cases.tsv, a labelled set of
+# misheard commands: python friday_fuzzy.py [--min-score 0.62] [--margin 0.05]
+# ----------------------------------------------------------------------
+import argparse
+import math
+import os
+import sys
+import threading
+from collections import Counter, namedtuple
+
+from friday_deps import numpy as np
+from friday_query import normalize_query
+
+NGRAMS = (2, 3) # Bigrams keep short words like 'jok' or 'nodes' close enough to their phrase
+MIN_CHARS = 4 # 'hi', 'yo' and 'no' are too short to be told apart from noise
+CASES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "friday_fuzzy_cases.tsv")
+
+# rival: a phrase of another intent that scored almost as well; the correction should be confirmed
+FuzzyCorrection = namedtuple('FuzzyCorrection', 'query phrase heard score rival', defaults=(None,))
+
+def char_ngrams(text):
+    padded = f" {text} "
+    return Counter(padded[i:i + n] for n in NGRAMS for i in range(len(padded) - n + 1))
+
+def words_align(heard, phrase):
+    """True if every heard word shares an n-gram with the phrase word in its place: a misheard
+    word is a misspelling, not a different word ('tell me a' is not 'tell me more')."""
+    return all(char_ngrams(said).keys() & char_ngrams(meant).keys() for said, meant in zip(heard.split(), phrase.split()))
+
+class FuzzyPhraseIndex:
+    """Character n-gram TF-IDF over the phrases, stored column-wise (n-gram -> phrases containing
+    it) as flat NumPy arrays. Phrases are ordered by word count, so phrases longer than the query
+    are one block of rows at the end that scoring never touches."""
+
+    def __init__(self, phrases, min_score=0.62):
+        unique = {phrase.lower() for phrase in phrases if len(phrase) >= MIN_CHARS}
+        self.phrases = sorted(unique, key=lambda phrase: (len(phrase.split()), phrase))
+        self.min_score = min_score
+        self._positions = {phrase: row for row, phrase in enumerate(self.phrases)}
+        self.word_counts = np.array([len(phrase.split()) for phrase in self.phrases], dtype=np.int64)
+        self.max_words = int(self.word_counts[-1]) if self.phrases else 0
+        self._build()
+
+    def _build(self):
+        counts = [char_ngrams(phrase) for phrase in self.phrases]
+        document_frequency = Counter(gram for grams in counts for gram in grams)
+        total = len(self.phrases)
+        vocabulary = sorted(document_frequency)
+        idf = [math.log((1 + total) / (1 + document_frequency[gram])) + 1.0 for gram in vocabulary]
+        self._terms = {gram: (column, idf[column]) for column, gram in enumerate(vocabulary)}
+        self.unknown_idf = math.log(1 + total) + 1.0 # An n-gram no phrase has still counts against the match
+
+        columns = [[] for _ in vocabulary]
+        for row, grams in enumerate(counts):
+            weights = {gram: count * self._terms[gram][1] for gram, count in grams.items()}
+            norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+            for gram, weight in weights.items():
+                columns[self._terms[gram][0]].append((row, weight / norm))
+        rows = np.array([row for column in columns for row, _ in column], dtype=np.int64)
+        column_of = np.repeat(np.arange(len(columns)), [len(column) for column in columns])
+        self._keys = column_of * max(total, 1) + rows # Strictly increasing: column-major, rows ascending
+        self._rows = rows
+        self._weights = np.array([weight for column in columns for _, weight in column])
+
+    def _block(self, columns, end):
+        """Dense (len(columns) x end) block of the TF-IDF matrix, gathered without a Python loop."""
+        base = np.asarray(columns, dtype=np.int64) * max(len(self.phrases), 1)
+        starts = np.searchsorted(self._keys, base)
+        lengths = np.searchsorted(self._keys, base + end) - starts
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        block = np.zeros((len(columns), end))
+        block[np.repeat(np.arange(len(columns)), lengths), self._rows[offsets]] = self._weights[offsets]
+        return block
+
+    def _span_vectors(self, words, spans):
+        """Unit TF-IDF vectors of all spans at once, as (vectors, n-grams) over the query's distinct n-grams."""
+        padded = f" {' '.join(words)} "
+        word_starts, position = [], 1
+        for word in words:
+            word_starts.append(position)
+            position += len(word) + 1
+        # Every n-gram of the query once; a span's n-grams are those inside its padded slice
+        grams, gram_starts, gram_ends = [], [], []
+        for n in NGRAMS:
+            for i in range(len(padded) - n + 1):
+                grams.append(padded[i:i + n])
+                gram_starts.append(i)
+                gram_ends.append(i + n)
+        distinct = list(dict.fromkeys(grams))
+        term_of = {gram: term for term, gram in enumerate(distinct)}
+        low = np.array([word_starts[start] - 1 for start, _ in spans])
+        high = np.array([word_starts[end - 1] + len(words[end - 1]) + 1 for _, end in spans])
+        inside = (np.array(gram_starts)[None, :] >= low[:, None]) & (np.array(gram_ends)[None, :] <= high[:, None])
+        counts = inside.astype(float) @ np.eye(len(distinct))[[term_of[gram] for gram in grams]]
+        idf = np.array([self._terms[gram][1] if gram in self._terms else self.unknown_idf for gram in distinct])
+        vectors = counts * idf
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True), distinct
+
+    def correct(self, query):
+        """The query with its best-matching word span replaced by the phrase it resembles, or None.
+        Spans are compared only with phrases of the same word count ('remind be' -> 'remind me')."""
+        found = self.candidates(query, limit=1)
+        return found[0] if found else None
+
+    def candidates(self, query, floor=None, limit=10):
+        """Up to `limit` corrections scoring at least floor (default min_score), best first, each
+        with aligned words (see words_align)."""
+        floor = self.min_score if floor is None else floor
+        words = query.split()
+        spans = [(start, end) for start in range(len(words))
+                 for end in range(start + 1, min(len(words), start + self.max_words) + 1)
+                 if len(' '.join(words[start:end])) >= MIN_CHARS]
+        if not spans:
+            return []
+        vectors, grams = self._span_vectors(words, spans)
+        known = [term for term, gram in enumerate(grams) if gram in self._terms]
+        if not known:
+            return []
+        columns = [self._terms[grams[term]][0] for term in known]
+        vectors = vectors[:, known]
+        span_words = np.array([end - start for start, end in spans])
+
+        # Phrases longer than the query cannot match; they sit at the end and are left out
+        end = int(np.searchsorted(self.word_counts, len(words), side='right'))
+        scores = vectors @ self._block(columns, end)
+        scores[span_words[:, None] != self.word_counts[None, :end]] = 0.0
+        for row, (start, stop) in enumerate(spans):
+            exact = self._positions.get(' '.join(words[start:stop]))
+            if exact is not None and exact < end:
+                scores[row, exact] = 0.0 # Routing already saw the exact phrase
+        rows, columns = np.nonzero(scores >= max(floor, 1e-9))
+        found = []
+        for index in np.argsort(-scores[rows, columns], kind='stable'):
+            row, column = rows[index], columns[index]
+            start, end = spans[row]
+            heard, phrase = ' '.join(words[start:end]), self.phrases[column]
+            if not words_align(heard, phrase):
+                continue
+            corrected = ' '.join(words[:start] + [phrase] + words[end:])
+            found.append(FuzzyCorrection(corrected, phrase, heard, float(scores[row, column])))
+            if len(found) == limit:
+                break
+        return found
+
+class FuzzyIntentFallback:
+    """Builds the index from a router's trigger phrases on first use (NumPy is imported lazily).
+    A correction is kept only if the rewritten query routes to the same intent (and dialogue topic)
+    as the phrase on its own; if a phrase of another intent scores within `margin` of it, the
+    correction comes back with that phrase as its rival, to be confirmed rather than run.
+    Corrections to dialogue keywords are skipped by default: they are everyday words ('sleep',
+    'down'), so their near misses ('my cat is sleepy') are mostly ordinary speech, not a misheard
+    command. They stay in the index, where they keep the n-gram weights of command phrases honest."""
+
+    def __init__(self, router, min_score=0.62, margin=0.05, exclude=('conversation',)):
+        self.router = router
+        self.min_score = min_score
+        self.margin = margin
+        self.exclude = exclude
+        self._index = None
+        self._families = {}
+        self._lock = threading.Lock()
+        self.recovered = 0
+
+    @property
+    def available(self):
+        return np.available
+
+    def index(self):
+        with self._lock:
+            if self._index is None:
+                self._index = FuzzyPhraseIndex(self.router.trigger_phrases(), self.min_score)
+            return self._index
+
+    def family(self, text):
+        """(intent, topic) that text routes to, or None."""
+        decision = self.router.resolve(normalize_query(text))
+        return (decision.intent, decision.topic) if decision else None
+
+    def correct(self, query):
+        if not self.available:
+            return None
+        best = best_family = None
+        for correction in self.index().candidates(query, self.min_score - self.margin, limit=20):
+            if correction.phrase not in self._families:
+                self._families[correction.phrase] = self.family(correction.phrase)
+            wanted = self._families[correction.phrase]
+            if wanted is None or wanted[0] in self.exclude:
+                continue
+            family = self.family(correction.query)
+            if family != wanted:
+                continue # The rest of the query pulls the rewrite to another intent
+            if best is None:
+                if correction.score < self.min_score:
+                    return None
+                best, best_family = correction, family
+            elif family != best_family:
+                if best.score - correction.score < self.margin:
+                    best = best._replace(rival=correction.phrase)
+                break
+        if best is not None:
+            self.recovered += 1
+        return best
+
+# --- THRESHOLD TUNING ---
+def read_cases(path=CASES_FILE):
+    """(heard, intent) pairs from the labelled set; intent '-' means nothing should run."""
+    cases = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                heard, _, intent = line.partition('\t')
+                cases.append((heard.strip(), intent.strip()))
+    return cases
+
+def evaluate(fallback, cases):
+    """{outcome: [(heard, intent, corrected query)]}. Outcomes: 'right' (ran the labelled intent),
+    'asked' (offered as a question), 'wrong' (ran something else), 'missed' (no correction for a
+    command; for '-' cases doing nothing is right) and 'routed' (exact routing already takes the
+    query, so the fallback never sees it and the case tests nothing)."""
+    outcomes = {'right': [], 'asked': [], 'wrong': [], 'missed': [], 'routed': []}
+    for heard, intent in cases:
+        if fallback.family(heard) is not None:
+            outcomes['routed'].append((heard, intent, None))
+            continue
+        correction = fallback.correct(heard)
+        if correction is None:
+            outcome = 'right' if intent == '-' else 'missed'
+        elif correction.rival:
+            outcome = 'asked'
+        else:
+            family = fallback.family(correction.query)
+            outcome = 'right' if family and family[0] == intent else 'wrong'
+        outcomes[outcome].append((heard, intent, correction.query if correction else None))
+    return outcomes
+# --- END THRESHOLD TUNING ---
+
+def main(argv=None):
+    from friday_config import FUZZY_MARGIN, FUZZY_MIN_SCORE
+    from friday_core import ROUTER # friday_core imports this module; only the tuning CLI needs the router
+    parser = argparse.ArgumentParser(description="Score the fuzzy command fallback on the labelled misheard commands.")
+    parser.add_argument("--cases", default=CASES_FILE, help="TSV of misheard query and intended intent ('-' for none)")
+    parser.add_argument("--min-score", type=float, default=FUZZY_MIN_SCORE)
+    parser.add_argument("--margin", type=float, default=FUZZY_MARGIN, help="score gap below which another intent's phrase is a rival")
+    args = parser.parse_args(argv)
+    if not np.available:
+        print("The fuzzy fallback needs NumPy.")
+        return 2
+
+    cases = read_cases(args.cases)
+    outcomes = evaluate(FuzzyIntentFallback(ROUTER, args.min_score, args.margin), cases)
+    for outcome in ('wrong', 'missed', 'asked', 'routed'):
+        for heard, intent, corrected in outcomes[outcome]:
+            print(f"{outcome.upper():<7} {heard!r} (meant {intent}) -> {corrected!r}")
+    print(" ".join(f"{outcome}={len(found)}" for outcome, found in outcomes.items()) + f" of {len(cases)}")
+    return 1 if outcomes['wrong'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+# ----------------------------------------------------------------------
+# FRIDAY Conversation History
+# Description: Bounded in-memory ring of conversation log entries backing the
+# recycled log view. Entries pushed out of the ring are appended to an
+# archive file (one JSON object per line) instead of being kept alive in the
+# widget tree. The appends happen on a background writer, so the UI thread
+# never waits on the disk; archived() reads the older entries back, and the
+# file doubles as a plain JSONL export of past conversations.
+# ----------------------------------------------------------------------
+import json
+import os
+import threading
+import time
+from collections import deque
+
+class ConversationHistory:
+    def __init__(self, capacity=200, archive_path=None):
+        self.capacity = capacity
+        self.archive_path = archive_path
+        self._ring = deque()
+        self._unwritten = [] # Evicted entries waiting for the writer
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._thread = None
+        self._stopped = False
+
+    def append(self, source, text, is_error=False, full_text=None):
+        """Adds an entry; returns (entry, evicted entry or None). O(1) regardless of history length,
+        and never touches the disk: evicted entries are handed to the archive writer."""
+        entry = {'time': time.time(), 'source': source, 'text': text, 'is_error': is_error, 'full_text': full_text}
+        with self._lock:
+            self._ring.append(entry)
+            evicted = self._ring.popleft() if len(self._ring) > self.capacity else None
+            if evicted is not None and self.archive_path and not self._stopped:
+                self._unwritten.append(evicted)
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="friday-history", daemon=True)
+                    self._thread.start()
+                self._changed.notify()
+        return entry, evicted
+
+    def __len__(self):
+        return len(self._ring)
+
+    def entries(self):
+        with self._lock:
+            return list(self._ring)
+
+    def archived(self, limit=100, skip=0):
+        """The `limit` newest entries that have left the ring, oldest first (None for all of them),
+        leaving out the `skip` newest ones, e.g. those the log view already shows."""
+        with self._lock:
+            unwritten = list(self._unwritten)
+        found = deque(maxlen=None if limit is None else limit + skip)
+        if self.archive_path and os.path.exists(self.archive_path):
+            try:
+                with open(self.archive_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            found.append(json.loads(line))
+                        except ValueError:
+                            continue # A line cut short by a crash
+            except OSError:
+                pass
+        found.extend(unwritten)
+        found = list(found)
+        return found[:len(found) - skip] if skip else found
+
+    def close(self):
+        """Writes out whatever is still queued and stops the writer."""
+        with self._lock:
+            self._stopped = True
+            self._changed.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=2.0)
+
+    # --- archive writer ---
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._unwritten and not self._stopped:
+                    self._changed.wait()
+                if not self._unwritten:
+                    return
+                batch = list(self._unwritten)
+            self._write(batch)
+            with self._lock:
+                # Dropped only once written, so archived() never misses an entry in flight
+                del self._unwritten[:len(batch)]
+
+    def _write(self, batch):
+        try:
+            with open(self.archive_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(entry) + "\n" for entry in batch))
+        except OSError:
+            pass # Losing archived history must never break the live log
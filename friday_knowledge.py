@@ -0,0 +1,225 @@
+# ----------------------------------------------------------------------
+# FRIDAY Offline Knowledge Pack
+# Description: A read-only, memory-mapped index of article lead paragraphs so
+# "who is / what is" can be answered without a network. The pack holds a
+# sorted table of normalized titles and an offset table into a summaries
+# blob; a lookup is a binary search over the mapped index, so opening even a
+# multi-GB pack only costs page cache.
+#
+# Only the title index is mapped whole; summaries are read through a small
+# sliding window, so a pack's data size never has to fit the address space of
+# a 32-bit phone. Packs whose index alone would not fit are refused.
+#
+# Build one from a dump with one article per line, either TSV
+# ("title<TAB>lead paragraph") or JSON lines ({"title": ..., "text": ...}):
+#     python friday_knowledge.py build enwiki_leads.tsv friday_knowledge.fkp
+#     python friday_knowledge.py lookup friday_knowledge.fkp "alan turing"
+# ----------------------------------------------------------------------
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+
+from friday_wikicache import normalize_subject
+
+MAGIC = b'FRIDAYKP'
+VERSION = 1
+# magic, version, reserved, count, then the file position of each of the four sections
+HEADER = struct.Struct('<8sIIQQQQQ')
+OFFSET = struct.Struct('<Q')
+MAX_INDEX_BYTES = 256 * 1024 * 1024 # Key and summary offset tables plus titles, mapped at once (32-bit safe)
+WINDOW_BYTES = 4 * 1024 * 1024      # Summaries are mapped this much at a time
+
+class KnowledgePackError(Exception):
+    """The file is not a knowledge pack, was built by a newer version, or is too large to map."""
+
+# --- READER ---
+class KnowledgePack:
+    """Sections: key offsets (count + 1), keys blob, summary offsets (count + 1), summaries blob.
+    Keys are normalized titles sorted bytewise; each summary record is 'Title\\nlead paragraph'."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = None
+        self._window = None # (start, mmap) over part of the summaries blob
+        self._window_lock = threading.Lock()
+        try:
+            self._open()
+        except Exception:
+            self.close()
+            raise
+
+    def _open(self):
+        header = self._file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise KnowledgePackError(f"{self.path} is not a FRIDAY knowledge pack")
+        header = HEADER.unpack(header)
+        if header[0] != MAGIC or header[1] > VERSION:
+            raise KnowledgePackError(f"{self.path} is not a FRIDAY knowledge pack")
+        self.count, self._key_offsets, self._keys, self._summary_offsets, self._summaries = header[3:]
+        self._size = os.fstat(self._file.fileno()).st_size
+        tables = (self.count + 1) * OFFSET.size
+        if not (HEADER.size <= self._key_offsets and self._key_offsets + tables <= self._keys <= self._summary_offsets
+                and self._summary_offsets + tables <= self._summaries <= self._size):
+            raise KnowledgePackError(f"{self.path} is damaged (its sections do not fit the file)")
+        if self._summaries > MAX_INDEX_BYTES:
+            raise KnowledgePackError(
+                f"{self.path} has a {self._summaries // 2 ** 20} MB title index; this device can map at most "
+                f"{MAX_INDEX_BYTES // 2 ** 20} MB. Build a smaller pack (fewer articles) for it."
+            )
+        # Header and the three index sections; the summaries after them are mapped in windows
+        self._map = mmap.mmap(self._file.fileno(), self._summaries, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return self.count
+
+    def _offset(self, table, index):
+        return OFFSET.unpack_from(self._map, table + index * OFFSET.size)[0]
+
+    def _key(self, index):
+        start = self._keys + self._offset(self._key_offsets, index)
+        end = self._keys + self._offset(self._key_offsets, index + 1)
+        return self._map[start:end]
+
+    def _record(self, index):
+        start = self._summaries + self._offset(self._summary_offsets, index)
+        end = min(self._summaries + self._offset(self._summary_offsets, index + 1), self._size)
+        title, _, summary = self._read(start, end).decode("utf-8", errors="replace").partition("\n")
+        return title, summary
+
+    def _read(self, start, end):
+        """Bytes start:end of the file through the window mapping, moving the window when needed."""
+        with self._window_lock:
+            window = self._window
+            if window is None or not (window[0] <= start and end <= window[0] + len(window[1])):
+                base = start - start % mmap.ALLOCATIONGRANULARITY # Map offsets must be aligned
+                length = min(max(WINDOW_BYTES, end - base), self._size - base)
+                if window is not None:
+                    window[1].close()
+                self._window = window = (base, mmap.mmap(self._file.fileno(), length, access=mmap.ACCESS_READ, offset=base))
+            return window[1][start - window[0]:end - window[0]]
+
+    def lookup(self, subject):
+        """(title, summary) for a subject, or None. O(log n) key comparisons."""
+        key = normalize_subject(subject).encode("utf-8")
+        if not key:
+            return None
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self._key(low) == key:
+            return self._record(low)
+        return None
+
+    def close(self):
+        with self._window_lock:
+            if self._window is not None:
+                self._window[1].close()
+                self._window = None
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+# --- END READER ---
+
+# --- BUILDER ---
+def read_dump(path):
+    """Yields (title, lead paragraph) from a TSV or JSON-lines dump, skipping malformed lines."""
+    as_json = path.endswith((".jsonl", ".json"))
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if as_json:
+                try:
+                    record = json.loads(line)
+                    title, text = record['title'], record.get('text') or record.get('summary', '')
+                except (ValueError, KeyError, TypeError):
+                    continue
+            else:
+                title, _, text = line.rstrip("\n").partition("\t")
+            title, text = ' '.join(title.split()), ' '.join(text.split())
+            if title and text:
+                yield title, text
+
+def build_pack(dump_path, pack_path):
+    """Writes a pack from a dump. Only the titles are held in memory; summaries are staged
+    in a temporary file and copied out in sorted order. Returns the number of articles."""
+    entries = {} # key -> (position, length) in the staging file; the first article for a key wins
+    directory = os.path.dirname(os.path.abspath(pack_path))
+    with tempfile.TemporaryFile(dir=directory) as staging:
+        for title, text in read_dump(dump_path):
+            key = normalize_subject(title).encode("utf-8")
+            if not key or key in entries:
+                continue
+            record = f"{title}\n{text}".encode("utf-8")
+            entries[key] = (staging.tell(), len(record))
+            staging.write(record)
+        staging.flush()
+        keys = sorted(entries)
+        count = len(keys)
+
+        tmp_path = pack_path + ".tmp"
+        with open(tmp_path, "wb") as out:
+            out.write(b"\0" * HEADER.size)
+            key_offsets = out.tell()
+            position = 0
+            for key in keys:
+                out.write(OFFSET.pack(position))
+                position += len(key)
+            out.write(OFFSET.pack(position))
+            keys_start = out.tell()
+            for key in keys:
+                out.write(key)
+            summary_offsets = out.tell()
+            position = 0
+            for key in keys:
+                out.write(OFFSET.pack(position))
+                position += entries[key][1]
+            out.write(OFFSET.pack(position))
+            summaries_start = out.tell()
+            if count:
+                with mmap.mmap(staging.fileno(), 0, access=mmap.ACCESS_READ) as source:
+                    for key in keys:
+                        start, length = entries[key]
+                        out.write(source[start:start + length])
+            out.seek(0)
+            out.write(HEADER.pack(MAGIC, VERSION, 0, count, key_offsets, keys_start, summary_offsets, summaries_start))
+        os.replace(tmp_path, pack_path)
+    return count
+# --- END BUILDER ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query a FRIDAY offline knowledge pack.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="build a pack from a TSV or JSON-lines dump of lead paragraphs")
+    build.add_argument("dump")
+    build.add_argument("pack")
+    lookup = commands.add_parser("lookup", help="look a subject up in a pack")
+    lookup.add_argument("pack")
+    lookup.add_argument("subject")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        count = build_pack(args.dump, args.pack)
+        print(f"Wrote {count} articles to {args.pack} ({os.path.getsize(args.pack)} bytes)")
+        return 0
+    pack = KnowledgePack(args.pack)
+    try:
+        found = pack.lookup(args.subject)
+    finally:
+        pack.close()
+    if found is None:
+        print(f"'{args.subject}' is not in the pack")
+        return 1
+    print(f"{found[0]}\n{found[1]}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# ----------------------------------------------------------------------
+# FRIDAY Unrecognized Query Log
+# Description: Append-only log of queries FRIDAY could not handle, in the same
+# numbered format as before, with a small JSON sidecar holding the line
+# counter and per-phrase frequency counts. The log itself is the journal of
+# changes and the sidecar a snapshot of it up to a byte offset: on load, only
+# the log written after the snapshot is replayed. Rewriting the snapshot costs
+# O(distinct phrases), so it is only compacted once the unsaved tail is as
+# long as the snapshot is large, which keeps logging a miss O(1) amortized
+# (and the replay after a crash no longer than reading the snapshot). The
+# top-N unhandled phrasings are answered from memory.
+# ----------------------------------------------------------------------
+import csv
+import heapq
+import json
+import os
+import re
+import threading
+
+# Words that do not change what the user meant ("friday please what time is it")
+MISS_FILLER_WORDS = {'friday', 'please', 'hey', 'ok', 'okay', 'um', 'uh', 'the', 'a', 'an'}
+SAVE_EVERY = 10 # Fewest misses between sidecar writes; the sidecar can always catch up from the log
+
+def normalize_miss(query):
+    words = re.findall(r"[a-z0-9']+", query.lower())
+    return ' '.join(word for word in words if word not in MISS_FILLER_WORDS)
+
+class MissLog:
+    def __init__(self, path, stats_path=None):
+        self.path = path
+        self.stats_path = stats_path or path + ".stats.json"
+        self._lines = None
+        self._size = 0
+        self._counts = {}
+        self._unsaved = 0
+        self._lock = threading.Lock()
+
+    # --- sidecar ---
+    def _load(self):
+        """Lock held. Reads the sidecar and replays only log bytes written after it was saved."""
+        if self._lines is not None:
+            return
+        self._lines, self._size, self._counts = 0, 0, {}
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                stats = json.load(f)
+            self._lines, self._size, self._counts = stats['lines'], stats['size'], stats['counts']
+        except (OSError, ValueError, KeyError):
+            pass
+        try:
+            actual = os.path.getsize(self.path)
+        except OSError:
+            actual = 0
+        if actual < self._size:
+            # Log was truncated or replaced: start over from the whole file
+            self._lines, self._size, self._counts = 0, 0, {}
+        if actual > self._size:
+            self._replay_from(self._size)
+            self._save()
+
+    def _replay_from(self, offset):
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                self._size += len(raw)
+                line = raw.decode("utf-8", errors="replace").strip()
+                if not line:
+                    continue
+                self._lines += 1
+                query = re.sub(r'^\d+\.\s*', '', line)
+                key = normalize_miss(query)
+                if key:
+                    self._counts[key] = self._counts.get(key, 0) + 1
+
+    def _save(self):
+        tmp_path = self.stats_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({'lines': self._lines, 'size': self._size, 'counts': self._counts}, f)
+        os.replace(tmp_path, self.stats_path)
+        self._unsaved = 0
+
+    # --- public API ---
+    def record(self, query):
+        """Appends '<n>. <query>' without re-reading the log."""
+        with self._lock:
+            self._load()
+            self._lines += 1
+            line = f"{self._lines}. {' '.join(query.split())}\n".encode("utf-8")
+            with open(self.path, "ab") as f:
+                f.write(line)
+            self._size += len(line)
+            key = normalize_miss(query)
+            if key:
+                self._counts[key] = self._counts.get(key, 0) + 1
+            self._unsaved += 1
+            # The snapshot is rewritten after as many misses as it has phrases: O(1) per miss
+            if self._unsaved >= max(SAVE_EVERY, len(self._counts)):
+                self._save()
+            return self._lines
+
+    def flush(self):
+        with self._lock:
+            if self._lines is not None and self._unsaved:
+                self._save()
+
+    def total(self):
+        with self._lock:
+            self._load()
+            return self._lines
+
+    def top(self, n=10):
+        """Most frequent normalized missed queries as (phrase, count)."""
+        with self._lock:
+            self._load()
+            return heapq.nlargest(n, self._counts.items(), key=lambda item: (item[1], item[0]))
+
+    def export(self, path):
+        """Writes all aggregated counts, most frequent first, as CSV (or JSON for a .json path)."""
+        with self._lock:
+            self._load()
+            rows = sorted(self._counts.items(), key=lambda item: (-item[1], item[0]))
+        if path.endswith(".json"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump([{'query': query, 'count': count} for query, count in rows], f, indent=2)
+        else:
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(['query', 'count'])
+                writer.writerows(rows)
+        return len(rows)
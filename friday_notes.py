@@ -0,0 +1,161 @@
+# ----------------------------------------------------------------------
+# FRIDAY Notes Store
+# Description: Notes stay in the plain append-only text file (one note per
+# line), with a sidecar offset index so the newest page is read with one seek
+# instead of loading the whole file, and an inverted word index for
+# "search notes", updated incrementally on every append.
+# ----------------------------------------------------------------------
+import datetime
+import os
+import re
+import threading
+from array import array
+
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+def note_terms(text):
+    return set(WORD_PATTERN.findall(text.lower()))
+
+class NotesStore:
+    """Note numbers are 1-based in the order notes were written."""
+
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self._offsets = None # array('Q') of byte offsets, one per note
+        self._terms = None   # word -> list of note numbers, built on the first search
+        self._lock = threading.Lock()
+
+    # --- offset index ---
+    def _load_offsets(self):
+        """Lock held. Loads the sidecar index, rebuilding it if it does not match the data file."""
+        if self._offsets is not None:
+            return self._offsets
+        offsets = array('Q')
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        try:
+            with open(self.index_path, "rb") as f:
+                offsets.frombytes(f.read())
+        except (OSError, ValueError):
+            offsets = None
+        if offsets is None or not self._index_matches(offsets, size):
+            offsets = self._rebuild_offsets()
+        self._offsets = offsets
+        return offsets
+
+    def _index_matches(self, offsets, size):
+        """Cheap consistency check: the last indexed offset must start exactly one final line."""
+        if not offsets:
+            return size == 0
+        if offsets[-1] >= size:
+            return False
+        with open(self.path, "rb") as f:
+            f.seek(offsets[-1])
+            tail = f.read()
+        return tail.endswith(b"\n") and tail.count(b"\n") == 1
+
+    def _rebuild_offsets(self):
+        """One sequential scan of the data file (first run, or the file was edited by hand)."""
+        offsets = array('Q')
+        position = 0
+        try:
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if line.strip():
+                        offsets.append(position)
+                    position += len(line)
+                needs_newline = position and not line.endswith(b"\n")
+        except FileNotFoundError:
+            needs_newline = False
+        if needs_newline:
+            with open(self.path, "ab") as f:
+                f.write(b"\n")
+        with open(self.index_path, "wb") as f:
+            offsets.tofile(f)
+        return offsets
+
+    def _read_range(self, first, last):
+        """Lock held. Raw lines for notes first..last (0-based, inclusive) with a single seek."""
+        offsets = self._offsets
+        with open(self.path, "rb") as f:
+            f.seek(offsets[first])
+            end = offsets[last + 1] if last + 1 < len(offsets) else None
+            blob = f.read(end - offsets[first]) if end is not None else f.read()
+        return [line for line in blob.decode("utf-8", errors="replace").splitlines() if line.strip()]
+
+    def _build_terms(self):
+        """Lock held. One sequential scan; afterwards append() keeps the index current."""
+        terms = {}
+        number = 0
+        try:
+            with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    number += 1
+                    for term in note_terms(line.split(': ', 1)[-1]):
+                        terms.setdefault(term, []).append(number)
+        except FileNotFoundError:
+            pass
+        return terms
+
+    # --- public API ---
+    def append(self, note, when=None):
+        """Appends one note; O(1) in the size of the file. Returns its note number."""
+        when = when or datetime.datetime.now()
+        line = f"{when.strftime('%Y-%m-%d %H:%M')}: {' '.join(note.split())}\n".encode("utf-8")
+        with self._lock:
+            offsets = self._load_offsets()
+            with open(self.path, "ab") as f:
+                f.seek(0, os.SEEK_END)
+                position = f.tell()
+                f.write(line)
+            offsets.append(position)
+            with open(self.index_path, "ab") as f:
+                f.write(offsets[-1:].tobytes())
+            number = len(offsets)
+            if self._terms is not None:
+                for term in note_terms(note):
+                    self._terms.setdefault(term, []).append(number)
+            return number
+
+    def count(self):
+        with self._lock:
+            return len(self._load_offsets())
+
+    def page(self, page=1, page_size=5):
+        """Newest-first page of (note number, line). Reads only the bytes of that page."""
+        with self._lock:
+            offsets = self._load_offsets()
+            last = len(offsets) - 1 - (page - 1) * page_size
+            if last < 0:
+                return []
+            first = max(0, last - page_size + 1)
+            lines = self._read_range(first, last)
+        return list(reversed(list(zip(range(first + 1, last + 2), lines))))
+
+    def get(self, number):
+        with self._lock:
+            offsets = self._load_offsets()
+            if not 1 <= number <= len(offsets):
+                return None
+            return self._read_range(number - 1, number - 1)[0]
+
+    def search(self, query, limit=10):
+        """Notes ranked by how many of the query words they contain, newest first among equals."""
+        words = note_terms(query)
+        if not words:
+            return []
+        with self._lock:
+            self._load_offsets()
+            if self._terms is None:
+                self._terms = self._build_terms()
+            scores = {}
+            for word in words:
+                for number in self._terms.get(word, ()):
+                    scores[number] = scores.get(number, 0) + 1
+            ranked = sorted(scores, key=lambda n: (scores[n], n), reverse=True)[:limit]
+            return [(number, self._read_range(number - 1, number - 1)[0]) for number in ranked]
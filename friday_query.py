@@ -0,0 +1,50 @@
+# ----------------------------------------------------------------------
+# FRIDAY Query Normalizer
+# Description: Each command is normalized once: lowercased, filler phrases
+# removed with one compiled word-boundary pattern, and split into tokens. The
+# result is a NormalizedQuery that the router and every handler share, and
+# recent normalizations are memoized so repeated voice commands cost a dict
+# lookup.
+# ----------------------------------------------------------------------
+import re
+from functools import lru_cache
+
+CACHE_SIZE = 512
+
+# Phrases that never change what the user asked for ("friday can you tell me the time")
+FILLER_PHRASES = (
+    'friday', 'please', 'can you', 'i need to', 'would you', 'tell me', 'find me', 'show me',
+    'i want to', 'solve', 'figure out', 'get me', 'i mean', 'the result of',
+)
+
+@lru_cache(maxsize=None)
+def phrase_pattern(phrases):
+    """One compiled alternation for a tuple of phrases; longest first so 'play video' beats 'video'."""
+    ordered = sorted(phrases, key=len, reverse=True)
+    return re.compile(r'\b(?:' + '|'.join(re.escape(phrase) for phrase in ordered) + r')\b')
+
+def strip_phrases(text, phrases):
+    """text without any of the phrases (whole words only), with whitespace collapsed."""
+    return ' '.join(phrase_pattern(tuple(phrases)).sub(' ', text).split())
+
+class NormalizedQuery(str):
+    """The lowercased command, usable anywhere a string is, plus:
+    raw (as received), clean (filler phrases removed) and tokens (words of clean)."""
+
+    def __new__(cls, raw):
+        query = super().__new__(cls, raw.lower().strip())
+        query.raw = raw
+        query.clean = strip_phrases(query, FILLER_PHRASES)
+        query.tokens = tuple(query.clean.split())
+        return query
+
+    def without(self, *phrases):
+        """The cleaned query minus handler-specific phrases, e.g. query.without('youtube')."""
+        return strip_phrases(self.clean, phrases)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_query(command):
+    """Shared, memoized NormalizedQuery for a command string."""
+    if isinstance(command, NormalizedQuery):
+        return command
+    return NormalizedQuery(command)
@@ -0,0 +1,227 @@
+# ----------------------------------------------------------------------
+# FRIDAY Reminder Scheduler
+# Description: One scheduler thread over a min-heap of due times, instead of a
+# threading.Timer (and an OS thread) per reminder. Reminders are journaled to a
+# local file so they survive restarts, and can be listed, cancelled, snoozed
+# or repeated.
+# ----------------------------------------------------------------------
+import heapq
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# --- TIME PARSING ---
+UNIT_SECONDS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+DURATION_PATTERN = re.compile(r'(\d+)\s+(seconds?|minutes?|hours?|days?)')
+RECURRING_PATTERN = re.compile(r'\bevery\s+(?:(\d+)\s+)?(seconds?|minutes?|hours?|days?)\b')
+# "in 5 minutes" / "every 2 hours" clauses are trimmed from the spoken reminder text
+TIME_CLAUSE_PATTERN = re.compile(r'\s*\b(?:in|after|for|every)\s+(?:\d+\s+)?(?:seconds?|minutes?|hours?|days?)\b')
+
+def unit_seconds(unit):
+    return UNIT_SECONDS[unit.rstrip('s')]
+
+def parse_duration(text):
+    """'in 5 minutes' -> (300, '5 minutes'); None when no duration is present."""
+    match = DURATION_PATTERN.search(text)
+    if not match:
+        return None
+    value, unit = int(match.group(1)), match.group(2)
+    return value * unit_seconds(unit), f"{value} {unit}"
+
+def parse_recurrence(text):
+    """'every 2 hours' -> (7200, '2 hours'), 'every day' -> (86400, 'day'); None otherwise."""
+    match = RECURRING_PATTERN.search(text)
+    if not match:
+        return None
+    value = int(match.group(1)) if match.group(1) else 1
+    label = f"{value} {match.group(2)}" if match.group(1) else match.group(2)
+    return value * unit_seconds(match.group(2)), label
+
+def describe_delay(seconds):
+    for unit in ('day', 'hour', 'minute'):
+        if seconds >= UNIT_SECONDS[unit]:
+            value = round(seconds / UNIT_SECONDS[unit], 1)
+            value = int(value) if value == int(value) else value
+            return f"{value} {unit}{'' if value == 1 else 's'}"
+    return f"{int(seconds)} second{'' if int(seconds) == 1 else 's'}"
+# --- END TIME PARSING ---
+
+# --- SCHEDULER ---
+RECENT_LIMIT = 10 # Fired reminders remembered for "snooze reminder N"
+
+class Reminder:
+    __slots__ = ('id', 'due', 'message', 'repeat')
+
+    def __init__(self, reminder_id, due, message, repeat=None):
+        self.id = reminder_id
+        self.due = due
+        self.message = message
+        self.repeat = repeat # Seconds between occurrences, or None for one-shot
+
+    def to_record(self):
+        return {'op': 'set', 'id': self.id, 'due': self.due, 'message': self.message, 'repeat': self.repeat}
+
+class ReminderScheduler:
+    """on_due(reminder, late) is called on the scheduler thread; late is True for reminders
+    that fell due while the app was closed."""
+
+    def __init__(self, path, on_due, clock=time.time):
+        self.path = path
+        self.on_due = on_due
+        self.clock = clock
+        self.last_fired = None
+        self._recent = OrderedDict() # Last few fired reminders, so they can still be snoozed
+        self._reminders = {}
+        self._heap = []
+        self._next_id = 1
+        self._journal_lines = 0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._thread = None
+        self._stopped = False
+        self._load()
+
+    # --- persistence: append-only JSON lines, compacted when it outgrows the live set ---
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue # A torn last line from a crash; the rest is still valid
+                    if record.get('op') == 'set':
+                        self._reminders[record['id']] = Reminder(record['id'], record['due'], record['message'], record.get('repeat'))
+                    elif record.get('op') == 'del':
+                        self._reminders.pop(record['id'], None)
+                    self._next_id = max(self._next_id, record.get('id', 0) + 1)
+        except FileNotFoundError:
+            return
+        self._heap = [(r.due, r.id) for r in self._reminders.values()]
+        heapq.heapify(self._heap)
+        self._compact()
+        if self._reminders:
+            self._ensure_thread()
+
+    def _compact(self):
+        """Lock held (or during load). Rewrites the journal with only live reminders."""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for reminder in self._reminders.values():
+                f.write(json.dumps(reminder.to_record()) + "\n")
+        os.replace(tmp_path, self.path)
+        self._journal_lines = len(self._reminders)
+
+    def _journal(self, record):
+        """Lock held. O(1) append; compaction amortises deleted entries away."""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        self._journal_lines += 1
+        if self._journal_lines > 2 * len(self._reminders) + 64:
+            self._compact()
+
+    # --- public API ---
+    def add(self, message, delay, repeat=None):
+        with self._lock:
+            reminder = Reminder(self._next_id, self.clock() + delay, message, repeat)
+            self._next_id += 1
+            self._reminders[reminder.id] = reminder
+            heapq.heappush(self._heap, (reminder.due, reminder.id))
+            self._journal(reminder.to_record())
+            self._changed.notify()
+        self._ensure_thread()
+        return reminder
+
+    def cancel(self, reminder_id):
+        with self._lock:
+            if self._reminders.pop(reminder_id, None) is None:
+                return False
+            # The heap entry is skipped lazily when it surfaces
+            self._journal({'op': 'del', 'id': reminder_id})
+            self._changed.notify()
+            return True
+
+    def snooze(self, reminder_id, delay):
+        """Pushes a pending reminder back, or re-arms one that just fired. Returns it, or None."""
+        with self._lock:
+            reminder = self._reminders.get(reminder_id)
+            if reminder is None and reminder_id in self._recent:
+                reminder = self._recent.pop(reminder_id)
+                self._reminders[reminder.id] = reminder
+            if reminder is None:
+                return None
+            reminder.due = self.clock() + delay
+            heapq.heappush(self._heap, (reminder.due, reminder.id))
+            self._journal(reminder.to_record())
+            self._changed.notify()
+        self._ensure_thread()
+        return reminder
+
+    def get(self, reminder_id):
+        return self._reminders.get(reminder_id)
+
+    def list(self):
+        with self._lock:
+            return sorted(self._reminders.values(), key=lambda r: r.due)
+
+    def __len__(self):
+        return len(self._reminders)
+
+    def stop(self):
+        with self._lock:
+            self._stopped = True
+            self._changed.notify()
+
+    # --- scheduler thread ---
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None and not self._stopped:
+                self._thread = threading.Thread(target=self._run, name="friday-reminders", daemon=True)
+                self._thread.start()
+
+    def _pop_due(self, now):
+        """Lock held. Returns (reminder, due time) pairs whose time has come, rescheduling repeating ones."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            when, reminder_id = heapq.heappop(self._heap)
+            reminder = self._reminders.get(reminder_id)
+            if reminder is None or reminder.due != when:
+                continue # Cancelled or snoozed since this entry was pushed
+            due.append((reminder, when))
+            if reminder.repeat:
+                # Straight to the first occurrence after now, however long the app was closed;
+                # one step even when due == now exactly
+                reminder.due += ((now - reminder.due) // reminder.repeat + 1) * reminder.repeat
+                heapq.heappush(self._heap, (reminder.due, reminder.id))
+                self._journal(reminder.to_record())
+            else:
+                del self._reminders[reminder_id]
+                self._journal({'op': 'del', 'id': reminder_id})
+        return due
+
+    def _run(self):
+        late_cutoff = self.clock()
+        while True:
+            with self._lock:
+                if self._stopped:
+                    return
+                now = self.clock()
+                fired = self._pop_due(now)
+                if not fired:
+                    timeout = self._heap[0][0] - now if self._heap else None
+                    self._changed.wait(timeout)
+                    continue
+            for reminder, when in fired:
+                self.last_fired = reminder
+                with self._lock:
+                    self._recent[reminder.id] = reminder
+                    while len(self._recent) > RECENT_LIMIT:
+                        self._recent.popitem(last=False)
+                try:
+                    self.on_due(reminder, when < late_cutoff)
+                except Exception:
+                    pass # A failing callback must not kill the scheduler
+# --- END SCHEDULER ---
@@ -0,0 +1,180 @@
+# ----------------------------------------------------------------------
+# FRIDAY Routing Primitives
+# Description: Multi-phrase matcher and declarative intent router used by the
+# command engine and the dialogue map. Pure Python, no UI dependencies.
+# ----------------------------------------------------------------------
+import re
+from collections import deque, namedtuple
+
+# --- MULTI-PHRASE MATCHER (Aho-Corasick) ---
+PhraseHit = namedtuple('PhraseHit', 'phrase start end value')
+
+class PhraseMatcher:
+    """Aho-Corasick automaton: finds every registered phrase in a single pass over the text.
+    With whole_words=True, hits must sit on word boundaries (so 'hi' no longer matches 'this')."""
+
+    def __init__(self, whole_words=True):
+        self.whole_words = whole_words
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._built = False
+
+    def add(self, phrase, value):
+        phrase = phrase.lower()
+        state = 0
+        for ch in phrase:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((phrase, value))
+        self._built = False
+
+    def build(self):
+        """Computes failure links breadth-first; called lazily on first search."""
+        queue = deque(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        self._built = True
+        return self
+
+    def find_all(self, text):
+        """Returns a PhraseHit for every phrase occurrence in text."""
+        if not self._built:
+            self.build()
+        text = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        hits = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for phrase, value in out[state]:
+                start = i - len(phrase) + 1
+                end = i + 1
+                if self.whole_words and ((start > 0 and text[start - 1].isalnum()) or (end < len(text) and text[end].isalnum())):
+                    continue
+                hits.append(PhraseHit(phrase, start, end, value))
+        return hits
+# --- END MULTI-PHRASE MATCHER ---
+
+# --- DECLARATIVE INTENT ROUTER ---
+Intent = namedtuple('Intent', 'name handler arg priority triggers patterns lane lead')
+RouteCandidate = namedtuple('RouteCandidate', 'intent trigger score topic')
+RouteDecision = namedtuple('RouteDecision', 'intent trigger topic candidates')
+
+class IntentRouter:
+    """Registry of command intents. Handlers declare their trigger phrases, regexes and priority
+    with the @ROUTER.intent decorator; all phrases compile into one PhraseMatcher and all regexes
+    into one alternation, so a query is resolved in a single pass however many commands exist.
+
+    Triggers are plain phrases, (phrase, priority) pairs that override the intent priority, or
+    (phrase, priority, topic, sub_priority) tuples used for the dialogue map.
+    arg selects what the handler receives: 'raw' query, 'clean' query, 'topic' (query + topic) or None.
+    lane is 'slow' for handlers that wait on the network, so the executor runs them on their own workers.
+
+    A trigger that opens the query ('take a note to call mom') is what the user asked for, so with
+    lead_priority set it ranks at least that high, above intents whose trigger only shows up later
+    in the sentence. A query opens where its clean form (see NormalizedQuery) starts, so filler
+    ('show me', 'please') never counts as the command. Only intents that read the rest of the query
+    take the lead: lead defaults to False for arg=None handlers ('time for a joke' stays a joke) and
+    catch-alls such as 'open' pass lead=False so they never outrank a specific command."""
+
+    def __init__(self, lead_priority=None):
+        self.lead_priority = lead_priority
+        self.intents = {}
+        self._matcher = None
+        self._pattern = None
+        self._pattern_values = {}
+
+    def intent(self, name, triggers=(), patterns=(), priority=0, arg='raw', lane='fast', lead=None):
+        def register(func):
+            self.add(name, func.__name__, triggers, patterns, priority, arg, lane, lead)
+            return func
+        return register
+
+    def add(self, name, handler, triggers=(), patterns=(), priority=0, arg='raw', lane='fast', lead=None):
+        if lead is None:
+            lead = arg is not None
+        self.intents[name] = Intent(name, handler, arg, priority, tuple(triggers), tuple(patterns), lane, lead)
+        self._matcher = None
+
+    def compile(self):
+        matcher = PhraseMatcher()
+        regexes = []
+        self._pattern_values = {}
+        for order, intent in enumerate(self.intents.values()):
+            for trigger in intent.triggers:
+                if isinstance(trigger, str):
+                    trigger = (trigger, intent.priority)
+                phrase, priority = trigger[0], trigger[1]
+                topic, sub_priority = (trigger[2], trigger[3]) if len(trigger) > 2 else (None, 0)
+                matcher.add(phrase, (intent.name, priority, sub_priority, topic, order, intent.lead))
+            for pattern in intent.patterns:
+                group = f"p{len(regexes)}"
+                regexes.append(f"(?P<{group}>{pattern})")
+                self._pattern_values[group] = (intent.name, intent.priority, 0, None, order, False)
+        self._matcher = matcher.build()
+        self._pattern = re.compile('|'.join(regexes)) if regexes else None
+        return self
+
+    def trigger_phrases(self):
+        """Every plain trigger phrase of every intent (regex patterns are not included)."""
+        return [trigger if isinstance(trigger, str) else trigger[0]
+                for intent in self.intents.values() for trigger in intent.triggers]
+
+    def candidates(self, query):
+        """Every intent whose trigger fires, best trigger per intent, highest score first."""
+        if self._matcher is None:
+            self.compile()
+        hits = [(hit.phrase, hit.start, hit.value) for hit in self._matcher.find_all(query)]
+        if self._pattern:
+            for m in self._pattern.finditer(query):
+                hits.append((m.group(0), m.start(), self._pattern_values[m.lastgroup]))
+        clean = getattr(query, 'clean', query).lstrip(' \t,.!?')
+        best = {}
+        for trigger, start, (name, priority, sub_priority, topic, order, lead) in hits:
+            if self.lead_priority is not None and lead and self._opens(clean, trigger):
+                priority = max(priority, self.lead_priority)
+            score = (priority, sub_priority, len(trigger), -order)
+            if name not in best or score > best[name].score:
+                best[name] = RouteCandidate(name, trigger, score, topic)
+        return sorted(best.values(), key=lambda c: c.score, reverse=True)
+
+    @staticmethod
+    def _opens(clean, trigger):
+        """True if the query, filler words removed, starts with the trigger ('friday, please remind me')."""
+        return clean.startswith(trigger) and (len(clean) == len(trigger) or not clean[len(trigger)].isalnum())
+
+    def resolve(self, query):
+        """Returns the winning RouteDecision (with all candidates kept for inspection), or None."""
+        ranked = self.candidates(query)
+        if not ranked:
+            return None
+        return RouteDecision(ranked[0].intent, ranked[0].trigger, ranked[0].topic, ranked)
+
+    def explain(self, query):
+        """Human-readable routing trace, e.g. to see why 'play music' went to chat and not YouTube."""
+        ranked = self.candidates(query)
+        if not ranked:
+            return f"'{query}' -> no intent"
+        lines = [f"'{query}' -> {ranked[0].intent}"]
+        for c in ranked:
+            lines.append(f"  {c.intent:<14} trigger='{c.trigger}' priority={c.score[0]}" + (f" topic='{c.topic}'" if c.topic else ""))
+        return '\n'.join(lines)
+# --- END DECLARATIVE INTENT ROUTER ---
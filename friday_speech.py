@@ -0,0 +1,269 @@
+# ----------------------------------------------------------------------
+# FRIDAY Speech Output
+# Description: One speech worker thread fed by a priority queue, in front of a
+# pluggable TTS backend (Windows SAPI, pyttsx3, the espeak command, or a null
+# backend). Duplicate messages are dropped, reminders and errors preempt
+# ordinary replies, and "stop talking" flushes everything at once.
+# ----------------------------------------------------------------------
+import heapq
+import itertools
+import re
+import shutil
+import subprocess
+import threading
+import time
+
+from friday_deps import win32com_client, pythoncom, pyttsx3
+
+PRIORITY_HIGH = 0   # Reminders and errors: interrupt whatever is being said
+PRIORITY_NORMAL = 1 # Ordinary replies
+
+# --- SENTENCE SPLITTING ---
+SENTENCE_END = re.compile(r'(?<=[.!?;:])\s+')
+CLAUSE_END = re.compile(r'(?<=,)\s+')
+MAX_CHUNK = 220 # Characters; longer sentences are split at commas so no chunk blocks for long
+MIN_CHUNK = 16  # Shorter pieces ("Dr.", "St.") are joined to the next sentence
+
+def split_sentences(text):
+    """Splits a reply into speakable chunks, so speech can start after the first sentence
+    and be stopped between any two."""
+    chunks = []
+    carry = ''
+    for sentence in SENTENCE_END.split(text.strip()):
+        sentence = f"{carry} {sentence}" if carry else sentence
+        if len(sentence) < MIN_CHUNK:
+            carry = sentence
+            continue
+        carry = ''
+        if len(sentence) <= MAX_CHUNK:
+            chunks.append(sentence)
+            continue
+        current = ''
+        for clause in CLAUSE_END.split(sentence):
+            if current and len(current) + 1 + len(clause) > MAX_CHUNK:
+                chunks.append(current)
+                current = clause
+            else:
+                current = f"{current} {clause}" if current else clause
+        chunks.append(current)
+    if carry:
+        chunks.append(carry)
+    return [chunk for chunk in chunks if chunk.strip()]
+# --- END SENTENCE SPLITTING ---
+
+# --- BACKENDS ---
+class SpeechBackend:
+    """speak() blocks until the text has been spoken or stop() is called from another thread.
+    The queue calls reset() before each message, so a stop() that lands before speak()
+    has started still silences that message."""
+    name = 'null'
+
+    def __init__(self):
+        self._stop = threading.Event()
+
+    def reset(self):
+        self._stop.clear()
+
+    def speak(self, text):
+        pass
+
+    def stop(self):
+        self._stop.set()
+
+class NullBackend(SpeechBackend):
+    """Used when no TTS engine is available (servers, CI, Linux without espeak)."""
+
+class SapiBackend(SpeechBackend):
+    name = 'sapi'
+    SVSF_ASYNC = 1
+    SVSF_PURGE_BEFORE_SPEAK = 2
+
+    def __init__(self):
+        super().__init__()
+        if pythoncom.available:
+            pythoncom.CoInitialize() # COM objects belong to the thread that created them
+        self.speaker = win32com_client.Dispatch("SAPI.SpVoice")
+        # Attempt to set a female voice for better optimization
+        try:
+            voices = self.speaker.GetVoices()
+            # FIX: Explicitly prioritize Zira or any other female voice ID/description
+            female_voice = next((v.Id for v in voices if 'female' in v.GetAttribute('Gender').lower() or 'zira' in v.GetDescription().lower()), None)
+            if female_voice:
+                self.speaker.Voice = female_voice
+        except Exception:
+            pass # Fallback to default if voice selection fails
+        self.speaker.Rate = 2  # Faster speech speed
+        self.speaker.Volume = 100  # Max volume
+
+    def speak(self, text):
+        if self._stop.is_set():
+            return
+        self.speaker.Speak(text, self.SVSF_ASYNC)
+        # Poll so a stop request can purge the voice mid-sentence
+        while not self.speaker.WaitUntilDone(100):
+            if self._stop.is_set():
+                self.speaker.Speak("", self.SVSF_ASYNC | self.SVSF_PURGE_BEFORE_SPEAK)
+                return
+
+class Pyttsx3Backend(SpeechBackend):
+    name = 'pyttsx3'
+
+    def __init__(self):
+        super().__init__()
+        self.engine = pyttsx3.init()
+
+    def speak(self, text):
+        if self._stop.is_set():
+            return
+        self.engine.say(text)
+        self.engine.runAndWait()
+
+    def stop(self):
+        super().stop()
+        self.engine.stop()
+
+class EspeakBackend(SpeechBackend):
+    name = 'espeak'
+
+    def __init__(self, command=None):
+        super().__init__()
+        self.command = command or shutil.which('espeak-ng') or shutil.which('espeak')
+        if not self.command:
+            raise RuntimeError("espeak is not installed")
+        self._process = None
+        self._lock = threading.Lock()
+
+    def speak(self, text):
+        with self._lock:
+            if self._stop.is_set():
+                return
+            self._process = subprocess.Popen([self.command, text], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self._process.wait()
+
+    def stop(self):
+        with self._lock:
+            super().stop()
+            if self._process and self._process.poll() is None:
+                self._process.terminate()
+
+BACKENDS = {
+    'sapi': SapiBackend,
+    'pyttsx3': Pyttsx3Backend,
+    'espeak': EspeakBackend,
+    'null': NullBackend,
+}
+AUTO_ORDER = ('sapi', 'pyttsx3', 'espeak')
+
+def create_backend(name='auto'):
+    """Named backend, or for 'auto' the first one that works on this machine (else the null backend)."""
+    candidates = AUTO_ORDER if name == 'auto' else (name,)
+    for candidate in candidates:
+        try:
+            return BACKENDS[candidate]()
+        except Exception:
+            continue
+    return NullBackend()
+# --- END BACKENDS ---
+
+# --- SPEECH QUEUE ---
+class SpeechQueue:
+    """say() never blocks; one worker thread speaks queued messages in priority order, one
+    sentence at a time. backend_factory runs on the worker thread, since SAPI/COM objects
+    are thread-bound."""
+
+    def __init__(self, backend_factory=create_backend):
+        self.backend_factory = backend_factory
+        self.backend = None
+        self._heap = []
+        self._order = itertools.count()
+        self._current = None # (priority, order, sentence) being spoken
+        self._last_text = None
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._thread = None
+        self._closed = False
+        self.idle_since = time.monotonic() # When FRIDAY last stopped talking
+        self.spoken = 0
+        self.dropped = 0
+        self.preempted = 0
+
+    def say(self, text, priority=PRIORITY_NORMAL):
+        text = text.strip()
+        if not text:
+            return
+        with self._lock:
+            if self._closed:
+                return
+            # Drop a message identical to the one just queued or being spoken
+            if text == self._last_text and (self._current or self._heap):
+                self.dropped += 1
+                return
+            self._last_text = text
+            # Sentences keep consecutive order numbers, so a message is never interleaved with another
+            for sentence in split_sentences(text):
+                heapq.heappush(self._heap, (priority, next(self._order), sentence))
+            if self._current is not None and priority < self._current[0]:
+                # The interrupted sentence is spoken again once the urgent message is done
+                heapq.heappush(self._heap, self._current)
+                self._current = None
+                self.preempted += 1
+                self._stop_backend()
+            self._changed.notify()
+            self._ensure_thread()
+
+    def flush(self):
+        """Stops the current sentence and forgets everything queued (also used for barge-in).
+        Returns how many sentences were discarded."""
+        with self._lock:
+            discarded = len(self._heap) + (self._current is not None)
+            self._heap.clear()
+            self._current = None
+            self._last_text = None
+            self.idle_since = time.monotonic()
+            self._stop_backend()
+        return discarded
+
+    @property
+    def busy(self):
+        return self._current is not None or bool(self._heap)
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._closed = True
+            self._changed.notify()
+
+    def _stop_backend(self):
+        """Lock held. The worker pops the next item and resets the backend under the same lock,
+        so this stop can only reach the sentence being spoken now, never a newer one."""
+        if self.backend:
+            self.backend.stop()
+
+    def _ensure_thread(self):
+        """Lock held."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="friday-speech", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        self.backend = self.backend_factory()
+        while True:
+            with self._lock:
+                while not self._heap and not self._closed:
+                    self._changed.wait()
+                if self._closed:
+                    return
+                item = self._current = heapq.heappop(self._heap)
+                self.backend.reset()
+            try:
+                self.backend.speak(item[2])
+            except Exception:
+                pass # A TTS failure must not kill the speech worker
+            with self._lock:
+                if self._current is item:
+                    self._current = None
+                    self.spoken += 1
+                    if not self._heap:
+                        self._last_text = None
+                        self.idle_since = time.monotonic()
+# --- END SPEECH QUEUE ---
@@ -0,0 +1,64 @@
+# ----------------------------------------------------------------------
+# FRIDAY UI Update Bus
+# Description: Worker threads post log and status updates here instead of
+# scheduling one Clock callback each. The UI thread drains the bus once per
+# frame: log rows are applied in one batch (at most max_logs_per_frame of
+# them) and only the latest status update of the frame is kept.
+# ----------------------------------------------------------------------
+import threading
+from collections import deque
+
+class UIUpdateBus:
+    """request_frame() is called (from any thread) when the bus goes from idle to having work;
+    the UI thread then calls drain() on its next frame."""
+
+    def __init__(self, request_frame, max_logs_per_frame=25):
+        self.request_frame = request_frame
+        self.max_logs_per_frame = max_logs_per_frame
+        self._logs = deque()
+        self._status = None
+        self._scheduled = False
+        self._lock = threading.Lock()
+        self.posted = 0
+        self.collapsed = 0 # Status updates replaced before they were ever drawn
+
+    def _post(self):
+        """Lock held. Returns True if the caller must ask for a frame."""
+        self.posted += 1
+        if self._scheduled:
+            return False
+        self._scheduled = True
+        return True
+
+    def post_log(self, source, text, is_error=False, full_text=None):
+        with self._lock:
+            self._logs.append((source, text, is_error, full_text))
+            schedule = self._post()
+        if schedule:
+            self.request_frame()
+
+    def post_status(self, text, color="#FFFFFF"):
+        with self._lock:
+            if self._status is not None:
+                self.collapsed += 1
+            self._status = (text, color)
+            schedule = self._post()
+        if schedule:
+            self.request_frame()
+
+    def drain(self):
+        """UI thread. Returns (log updates, latest status or None). If log updates are left
+        over, another frame is requested so layout work per frame stays bounded."""
+        with self._lock:
+            count = min(len(self._logs), self.max_logs_per_frame)
+            logs = [self._logs.popleft() for _ in range(count)]
+            status, self._status = self._status, None
+            more = bool(self._logs)
+            self._scheduled = more
+        if more:
+            self.request_frame()
+        return logs, status
+
+    def pending(self):
+        with self._lock:
+            return len(self._logs) + (self._status is not None)
@@ -0,0 +1,136 @@
+# ----------------------------------------------------------------------
+# FRIDAY Voice Pipeline
+# Description: Capture, recognition and dispatch run as separate stages joined
+# by small bounded queues, so the next utterance is captured while the last
+# one is still being recognized. A long command the VAD had to cut at its
+# length cap is joined back together with its continuation while both are
+# still waiting (one transcript instead of two halves), the oldest is dropped
+# when a queue is full, and utterances that waited too long are discarded
+# instead of being acted on late.
+# ----------------------------------------------------------------------
+import threading
+import time
+from collections import deque
+
+from friday_audio import Utterance
+
+def merge_utterances(previous, utterance):
+    """One utterance spanning both if the second continues the first across a cut at the length
+    cap; else None. Utterances separated by real end-silence are separate commands, however close
+    together ('call mom' + 'what time is it' must not become one call to 'mom what time is it')."""
+    if (not previous.truncated or not utterance.continuation or previous.sample_rate != utterance.sample_rate
+            or previous.sample_width != utterance.sample_width):
+        return None
+    return Utterance(previous.data + utterance.data, previous.sample_rate, previous.sample_width,
+                     previous.started, utterance.ended, utterance.truncated, previous.continuation)
+
+class StageQueue:
+    """Bounded hand-off between two stages. put() never blocks the producer."""
+
+    def __init__(self, maxsize, merge=None):
+        self.maxsize = maxsize
+        self.merge = merge # merge(previous, item) -> merged item or None
+        self._items = deque()
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self.dropped = 0
+        self.merged = 0
+
+    def put(self, item):
+        with self._lock:
+            merged = self.merge(self._items[-1], item) if self.merge and self._items else None
+            if merged is not None:
+                self._items[-1] = merged
+                self.merged += 1
+            else:
+                if len(self._items) >= self.maxsize:
+                    self._items.popleft() # The oldest is the least useful by now
+                    self.dropped += 1
+                self._items.append(item)
+            self._ready.notify()
+
+    def get(self, timeout=None):
+        """Next item, or None after timeout seconds with nothing to do."""
+        with self._lock:
+            if not self._items:
+                self._ready.wait(timeout)
+            return self._items.popleft() if self._items else None
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+class VoicePipeline:
+    """recognize(utterance) -> command text or None runs on the recognition stage;
+    dispatch(text) on the dispatch stage; on_idle() about once a second when recognition is idle.
+    The capture stage is the MicrophoneStream, which feeds put_utterance()."""
+
+    def __init__(self, recognize, dispatch, on_idle=None, queue_size=4, stale_after=10.0):
+        self.recognize = recognize
+        self.dispatch = dispatch
+        self.on_idle = on_idle
+        self.stale_after = stale_after
+        self.audio = StageQueue(queue_size, merge=merge_utterances)
+        self.commands = StageQueue(queue_size)
+        self.stale = 0
+        self.recognized = 0
+        self.dispatched = 0
+        self._running = threading.Event()
+        self._threads = []
+
+    def put_utterance(self, utterance):
+        self.audio.put(utterance)
+
+    def start(self):
+        self._running.set()
+        for target, name in ((self._recognition_stage, "friday-recognize"), (self._dispatch_stage, "friday-dispatch")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._running.clear()
+        self.audio.clear()
+        self.commands.clear()
+
+    def _recognition_stage(self):
+        while self._running.is_set():
+            utterance = self.audio.get(timeout=1.0)
+            if utterance is None:
+                if self.on_idle:
+                    self.on_idle()
+                continue
+            if time.monotonic() - utterance.ended > self.stale_after:
+                self.stale += 1 # Acting on it now would surprise the user
+                continue
+            try:
+                text = self.recognize(utterance)
+            except Exception:
+                text = None # One bad utterance must not stop the pipeline
+            if text:
+                self.recognized += 1
+                self.commands.put(text)
+
+    def _dispatch_stage(self):
+        while self._running.is_set():
+            text = self.commands.get(timeout=1.0)
+            if text is None:
+                continue
+            try:
+                self.dispatch(text)
+                self.dispatched += 1
+            except Exception:
+                pass
+
+    def stats(self):
+        return {
+            'recognized': self.recognized,
+            'dispatched': self.dispatched,
+            'merged': self.audio.merged,
+            'dropped': self.audio.dropped + self.commands.dropped,
+            'stale': self.stale,
+            'backlog': len(self.audio) + len(self.commands),
+        }
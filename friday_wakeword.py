@@ -0,0 +1,283 @@
+# ----------------------------------------------------------------------
+# FRIDAY Wake-Word Spotter
+# Description: Local keyword spotting for the wake word with NumPy only. The
+# spotter listens to the microphone's frame stream: MFCCs are computed as the
+# frames arrive and matched against recorded templates of the user saying the
+# wake word with streaming subsequence DTW, so the wake word is recognised
+# while it is being said and no audio ever leaves the device while FRIDAY is
+# idle. Templates come from an explicit enrollment step, in which the user
+# says the wake word a few times on its own.
+# ----------------------------------------------------------------------
+import math
+import os
+import threading
+import time
+from collections import deque
+
+from friday_deps import numpy as np
+
+FRAME_SECONDS = 0.025
+HOP_SECONDS = 0.010
+MEL_FILTERS = 26
+CEPSTRA = 13
+MAX_HZ = 8000.0     # Top of the mel bands whatever the device rate, so features do not depend on it
+SILENCE_DB = 20.0   # Enrollment frames this far below the loudest one are trimmed as silence
+PRE_ROLL = 0.3      # Seconds of audio kept from before the VAD heard speech
+HANGOVER = 0.5      # Seconds the spotter keeps matching after the last speech frame
+
+# --- FEATURES ---
+_analysis = {}
+
+def _mel_filterbank(n_fft, rate):
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    mels = np.linspace(hz_to_mel(0.0), hz_to_mel(min(rate / 2.0, MAX_HZ)), MEL_FILTERS + 2)
+    bins = np.floor((n_fft + 1) * mel_to_hz(mels) / rate).astype(int)
+    bank = np.zeros((MEL_FILTERS, n_fft // 2 + 1))
+    for m in range(1, MEL_FILTERS + 1):
+        left, centre, right = bins[m - 1], bins[m], bins[m + 1]
+        if centre > left:
+            bank[m - 1, left:centre] = (np.arange(left, centre) - left) / (centre - left)
+        if right > centre:
+            bank[m - 1, centre:right] = (right - np.arange(centre, right)) / (right - centre)
+    return bank
+
+def _dct_matrix():
+    n = np.arange(MEL_FILTERS)
+    k = np.arange(CEPSTRA)[:, None]
+    return np.cos(np.pi * k * (2 * n + 1) / (2.0 * MEL_FILTERS))
+
+class FeatureStream:
+    """Incremental MFCCs over 16-bit samples fed in arbitrary chunks. feed() returns the rows of
+    every analysis window completed by the chunk as (features, log energies). c0 is left out of
+    the features: it only carries loudness, so the same word said louder matches just as well."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.frame_length = int(rate * FRAME_SECONDS)
+        self.hop = int(rate * HOP_SECONDS)
+        self.n_fft = 1 << (self.frame_length - 1).bit_length()
+        key = (rate, self.n_fft)
+        if key not in _analysis:
+            _analysis[key] = (_mel_filterbank(self.n_fft, rate), _dct_matrix(), np.hamming(self.frame_length))
+        self.bank, self.dct, self.window = _analysis[key]
+        self.reset()
+
+    def reset(self):
+        self._pending = np.zeros(0)
+        self._last = 0.0 # Last raw sample, so pre-emphasis runs across chunk boundaries
+
+    def feed(self, data):
+        samples = np.frombuffer(data[:len(data) - len(data) % 2], dtype='<i2').astype(np.float64)
+        if len(samples):
+            emphasized = samples - 0.97 * np.append(self._last, samples[:-1])
+            self._last = samples[-1]
+            self._pending = np.append(self._pending, emphasized)
+        count = 0 if len(self._pending) < self.frame_length else 1 + (len(self._pending) - self.frame_length) // self.hop
+        if not count:
+            return np.zeros((0, CEPSTRA - 1)), np.zeros(0)
+        indices = np.arange(self.frame_length)[None, :] + self.hop * np.arange(count)[:, None]
+        frames = self._pending[indices] * self.window
+        self._pending = self._pending[count * self.hop:]
+        power = np.abs(np.fft.rfft(frames, self.n_fft)) ** 2 / self.n_fft
+        features = np.log(np.maximum(power @ self.bank.T, 1e-10)) @ self.dct.T
+        return features[:, 1:], np.log(np.maximum(power.sum(axis=1), 1e-10))
+
+def template_features(data, rate):
+    """Features of an enrollment clip, with the silence before and after the word trimmed."""
+    features, energy = FeatureStream(rate).feed(data)
+    if not len(features):
+        return features
+    loud = np.flatnonzero(energy >= energy.max() - SILENCE_DB / 10.0 * math.log(10))
+    return features[loud[0]:loud[-1] + 1]
+# --- END FEATURES ---
+
+# --- STREAMING DTW ---
+STEP_WEIGHTS = (1.0, 2.0, 3.0) # One stream frame against 0, 1 or 2 template frames (weight = frames consumed)
+
+class SubsequenceMatcher:
+    """Subsequence DTW of one template against an endless feature stream. Every stream frame
+    advances the template by 0, 1 or 2 frames, so a step is a handful of vector operations,
+    and a match may start at any stream frame. step() returns the distance of the best match
+    ending at this frame, normalised by path length like a whole-clip DTW would be."""
+
+    def __init__(self, template):
+        self.template = template
+        self.reset()
+
+    def reset(self):
+        self._cost = np.full(len(self.template), np.inf) # Best path cost ending on each template frame
+        self._frames = np.zeros(len(self.template))      # Stream frames on that path
+
+    def step(self, frame):
+        frames = len(self.template)
+        local = np.sqrt(((self.template - frame) ** 2).sum(axis=1))
+        cost = np.append([np.inf, np.inf], self._cost)
+        cost[1] = 0.0 # A match can start here, on the first template frame
+        length = np.append([0.0, 0.0], self._frames)
+        options = np.vstack((cost[2:] + STEP_WEIGHTS[0] * local, cost[1:-1] + STEP_WEIGHTS[1] * local,
+                             cost[:-2] + STEP_WEIGHTS[2] * local))
+        choice = np.argmin(options, axis=0)
+        columns = np.arange(frames)
+        self._cost = options[choice, columns]
+        self._frames = np.vstack((length[2:], length[1:-1], length[:-2]))[choice, columns] + 1
+        return self._cost[-1] / (self._frames[-1] + frames)
+
+def match_distance(features, template):
+    """Best distance of the template anywhere in a finished feature sequence."""
+    matcher = SubsequenceMatcher(template)
+    return min((matcher.step(frame) for frame in features), default=np.inf)
+# --- END STREAMING DTW ---
+
+# --- SPOTTER ---
+class WakeWordSpotter:
+    """sensitivity 0..1: higher accepts speech further from the templates (fewer misses, more
+    false wakes). Until `needed` templates are enrolled, ready is False. Once started on a
+    stream, feed(frame, is_speech) is the MicrophoneStream frame listener and on_wake() runs on
+    the capture thread as soon as the wake word has been said; last_detection holds when."""
+
+    def __init__(self, path, sensitivity=0.5, needed=3, max_templates=6, min_seconds=0.25, max_seconds=1.6, refractory=1.0):
+        self.path = path
+        self.sensitivity = sensitivity
+        self.needed = needed
+        self.max_templates = max_templates
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self.refractory = refractory
+        self.templates = []
+        self.last_score = None
+        self.last_detection = None
+        self.detections = 0
+        self._threshold = None # Cached until the templates change
+        self._matchers = []
+        self._stream = None
+        self._on_wake = None
+        self._recent = deque()
+        self._active = False
+        self._quiet_seconds = 0.0
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def available(self):
+        return np.available
+
+    @property
+    def ready(self):
+        return len(self.templates) >= self.needed
+
+    def _load(self):
+        if not np.available or not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as saved:
+                templates = [saved[name] for name in sorted(saved.files)]
+        except (OSError, ValueError):
+            templates = []
+        # Templates from an older feature layout cannot be compared; those users enroll again
+        self.templates = [template for template in templates if template.ndim == 2 and template.shape[1] == CEPSTRA - 1]
+        self._matchers = [SubsequenceMatcher(template) for template in self.templates]
+
+    def _save(self):
+        if not self.templates:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        tmp_path = self.path + ".tmp.npz"
+        np.savez(tmp_path, **{f"t{i:02d}": template for i, template in enumerate(self.templates)})
+        os.replace(tmp_path, self.path)
+
+    def _templates_changed(self):
+        """Lock held."""
+        self._threshold = None
+        self._matchers = [SubsequenceMatcher(template) for template in self.templates]
+        try:
+            self._save()
+        except OSError:
+            pass # Still used for this session
+
+    def threshold(self):
+        """Spread of the templates among themselves, widened by the sensitivity."""
+        if len(self.templates) < 2:
+            return 0.0
+        distances = [match_distance(a, b) for a in self.templates for b in self.templates if a is not b]
+        # A pair more than twice as long as the other cannot be aligned at all (inf); it says nothing
+        finite = [distance for distance in distances if np.isfinite(distance)]
+        return max(finite) * (1.0 + self.sensitivity) if finite else 0.0
+
+    # --- enrollment ---
+    def add_template(self, utterance):
+        """Enrolls one recording of the user saying the wake word on its own. Returns True if kept;
+        the word itself (the VAD's pre-roll and end silence are trimmed) must be a short burst."""
+        if not np.available or utterance.sample_width != 2 or len(self.templates) >= self.max_templates:
+            return False
+        features = template_features(utterance.data, utterance.sample_rate)
+        if not self.min_seconds <= len(features) * HOP_SECONDS <= self.max_seconds:
+            return False
+        with self._lock:
+            self.templates.append(features)
+            self._templates_changed()
+        return True
+
+    def clear(self):
+        """Forgets every template, e.g. before enrolling again."""
+        with self._lock:
+            self.templates = []
+            self._templates_changed()
+
+    # --- streaming detection ---
+    def start(self, sample_rate, on_wake):
+        """Prepares for a microphone stream of 16-bit frames at sample_rate."""
+        with self._lock:
+            self._stream = FeatureStream(sample_rate)
+            self._on_wake = on_wake
+            self._recent = deque() # Sized on the first frame, when the chunk length is known
+            self._active = False
+
+    def feed(self, frame, is_speech):
+        """Frame listener. Matching only runs while the VAD hears speech (plus a short pre-roll
+        and hangover), so silence costs nothing."""
+        if self._stream is None or not self.ready:
+            return
+        with self._lock:
+            frame_seconds = len(frame) / (2.0 * self._stream.rate)
+            if self._recent.maxlen is None and frame_seconds:
+                self._recent = deque(maxlen=max(1, int(math.ceil(PRE_ROLL / frame_seconds))))
+            self._recent.append(frame)
+            if is_speech:
+                self._quiet_seconds = 0.0
+                if not self._active:
+                    # The start of the word is in the pre-roll, from before the VAD triggered
+                    self._active = True
+                    self._stream.reset()
+                    for matcher in self._matchers:
+                        matcher.reset()
+                    frame = b"".join(self._recent)
+            elif self._active:
+                self._quiet_seconds += frame_seconds
+                if self._quiet_seconds > HANGOVER:
+                    self._active = False
+            if not self._active:
+                return
+            features, _ = self._stream.feed(frame)
+            if not len(features):
+                return
+            if self._threshold is None:
+                self._threshold = self.threshold()
+            score = min(min(matcher.step(row) for row in features) for matcher in self._matchers)
+            now = time.monotonic()
+            if score > self._threshold or (self.last_detection is not None and now - self.last_detection < self.refractory):
+                return
+            self.last_score = score
+            self.last_detection = now
+            self.detections += 1
+            for matcher in self._matchers:
+                matcher.reset() # One wake per utterance of the word
+            on_wake = self._on_wake
+        if on_wake:
+            on_wake()
+# --- END SPOTTER ---
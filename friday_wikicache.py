@@ -0,0 +1,182 @@
+# ----------------------------------------------------------------------
+# FRIDAY Wikipedia Summary Cache
+# Description: Two-level cache for Wikipedia summaries keyed on the normalized
+# subject: an in-memory LRU in front of a small SQLite file with a TTL and a
+# size bound. "No such page" answers are cached too, for a shorter time, and
+# expired entries are still served when Wikipedia cannot be reached.
+# ----------------------------------------------------------------------
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+USED_BATCH = 64 # Reads recorded in memory before their times are written to disk
+
+def normalize_subject(subject):
+    """'  Albert   EINSTEIN? ' -> 'albert einstein'."""
+    return ' '.join(re.findall(r"[a-z0-9']+", subject.lower()))
+
+class CachedSummary:
+    __slots__ = ('text', 'negative', 'stored', 'expires')
+
+    def __init__(self, text, negative, stored, expires):
+        self.text = text         # Summary text, or None for a cached "no such page"
+        self.negative = negative
+        self.stored = stored
+        self.expires = expires
+
+    def fresh(self, now):
+        return now < self.expires
+
+class SummaryCache:
+    def __init__(self, path, memory_size=256, ttl=7 * 86400, negative_ttl=6 * 3600, max_entries=5000, clock=time.time):
+        self.path = path
+        self.memory_size = memory_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._memory = OrderedDict()
+        self._used = {} # key -> last read time not yet written to the 'used' column
+        self._db = None
+        self._writes = 0
+        self._lock = threading.Lock()
+        self.hits = 0       # Fresh answers from memory or disk
+        self.misses = 0     # Nothing usable cached; the caller goes to the network
+        self.stale_hits = 0 # Expired entries served because the network failed
+
+    # --- disk level ---
+    def _connect(self):
+        """Lock held. The database is opened on first use, not at startup."""
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "key TEXT PRIMARY KEY, text TEXT, negative INTEGER, stored REAL, expires REAL, used REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS summaries_used ON summaries (used)")
+        return self._db
+
+    def _remember(self, key, entry):
+        """Lock held. Adds to the in-memory LRU, evicting the least recently used."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _touch(self, key):
+        """Lock held. Records a read for the disk level's LRU order; written in batches, not per read."""
+        self._used[key] = self.clock()
+        if len(self._used) >= USED_BATCH:
+            try:
+                self._flush_used(self._connect())
+                self._db.commit()
+            except sqlite3.Error:
+                self._used.clear()
+
+    def _flush_used(self, db):
+        """Lock held. Writes the pending read times (the caller commits)."""
+        if self._used:
+            db.executemany("UPDATE summaries SET used = ? WHERE key = ?", [(used, key) for key, used in self._used.items()])
+            self._used.clear()
+
+    def _evict(self, db):
+        """Lock held. Keeps the disk level within max_entries, dropping the least recently used."""
+        count = db.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+        if count > self.max_entries:
+            db.execute(
+                "DELETE FROM summaries WHERE key IN (SELECT key FROM summaries ORDER BY used LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    # --- public API ---
+    def lookup(self, subject):
+        """Returns the CachedSummary for a subject (possibly expired), or None."""
+        key = normalize_subject(subject)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._touch(key)
+                return entry
+            try:
+                db = self._connect()
+                row = db.execute("SELECT text, negative, stored, expires FROM summaries WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error:
+                return None # A broken cache file only costs a network lookup
+            if row is None:
+                return None
+            entry = CachedSummary(row[0], bool(row[1]), row[2], row[3])
+            self._remember(key, entry)
+            self._touch(key)
+            return entry
+
+    def get(self, subject):
+        """Fresh entry or None; counts a hit or a miss."""
+        entry = self.lookup(subject)
+        if entry is not None and entry.fresh(self.clock()):
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def get_stale(self, subject):
+        """Any cached summary, however old, for answering while offline."""
+        entry = self.lookup(subject)
+        if entry is not None and not entry.negative:
+            self.stale_hits += 1
+            return entry
+        return None
+
+    def put(self, subject, text):
+        return self._store(subject, text, False, self.ttl)
+
+    def put_negative(self, subject):
+        """Remembers that Wikipedia has no such page, for negative_ttl seconds."""
+        return self._store(subject, None, True, self.negative_ttl)
+
+    def _store(self, subject, text, negative, ttl):
+        key = normalize_subject(subject)
+        now = self.clock()
+        entry = CachedSummary(text, negative, now, now + ttl)
+        with self._lock:
+            self._remember(key, entry)
+            try:
+                db = self._connect()
+                db.execute(
+                    "INSERT OR REPLACE INTO summaries (key, text, negative, stored, expires, used) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, text, int(negative), now, now + ttl, now),
+                )
+                self._used.pop(key, None)
+                # Reads since the last write share this commit, and eviction sees them
+                self._flush_used(db)
+                self._writes += 1
+                if self._writes % 50 == 1:
+                    self._evict(db)
+                db.commit()
+            except sqlite3.Error:
+                pass # Still cached in memory for this session
+        return entry
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale_hits': self.stale_hits,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'in_memory': len(self._memory),
+        }
+
+    def close(self):
+        with self._lock:
+            if self._used:
+                try:
+                    self._flush_used(self._connect())
+                    self._db.commit()
+                except sqlite3.Error:
+                    pass
+            if self._db is not None:
+                self._db.close()
+                self._db = None
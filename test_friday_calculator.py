@@ -0,0 +1,53 @@
+# ----------------------------------------------------------------------
+# Tests for friday_calculator: spoken and typed arithmetic, percentages,
+# and the limits that refuse runaway expressions.
+# ----------------------------------------------------------------------
+import time
+
+import pytest
+
+from friday_calculator import CalculationError, calculate
+
+@pytest.mark.parametrize("query, result", [
+    ("calculate 2 plus 2", "4"),
+    ("what is two hundred and five point five times 2", "411"),
+    ("10 divided by 4", "2.5"),
+    ("2 to the power of 10", "1024"),
+    ("minus 2 squared", "-4"),
+    ("2 (3 + 4)", "14"),
+    ("calculate 5 million plus 1", "5000001"),
+    ("three point five million", "3500000"),
+    ("calculate 1,000 plus 1", "1001"),
+    ("1,234.5 plus 1", "1235.5"),
+    ("calculate 50 percent of 200", "100"),
+    ("50% of 200", "100"),
+    ("calculate 200 plus 10 percent", "220"),
+    ("200 + 10%", "220"),
+    ("10 - 5%", "9.5"),
+    ("10 % 3", "1"),
+])
+def test_answers(query, result):
+    assert calculate(query) == result
+
+def test_no_numbers_is_not_a_calculation():
+    assert calculate("calculate how are you") is None
+
+@pytest.mark.parametrize("query", [
+    "2 3", "1,5 plus 1", "2 plus", "(2 plus 3", "2 plus * 3",
+])
+def test_malformed_expressions_are_refused(query):
+    with pytest.raises(CalculationError):
+        calculate(query)
+
+def test_division_by_zero():
+    with pytest.raises(ZeroDivisionError):
+        calculate("1 divided by 0")
+
+@pytest.mark.parametrize("query", [
+    "9 ^ 9 ^ 9", "2 ^ 5000", "9 times times 9 times times 9", " plus ".join(["1"] * 100),
+])
+def test_limits_refuse_quickly(query):
+    started = time.perf_counter()
+    with pytest.raises(CalculationError):
+        calculate(query)
+    assert time.perf_counter() - started < 0.5
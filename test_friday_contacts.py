@@ -0,0 +1,60 @@
+# ----------------------------------------------------------------------
+# Tests for friday_contacts: which contact a spoken name resolves to, and
+# which spoken words must not resolve to anyone (a wrong match dials a call).
+# ----------------------------------------------------------------------
+import pytest
+
+from friday_config import CONTACTS
+from friday_contacts import CERTAIN, Contact, ContactIndex, metaphone, soundex
+
+BOOK = ContactIndex([Contact(name, number) for name, number in CONTACTS.items()] + [
+    Contact("John Smith", "5550001111"),
+    Contact("Davidson Jones", "5550002222"),
+    Contact("Melissa Brown", "5550003333"),
+])
+
+def best(spoken):
+    matches = BOOK.lookup(spoken)
+    return (matches[0].contact.name, matches[0].how) if matches else None
+
+@pytest.mark.parametrize("spoken, name", [
+    ("mom", "mom"),
+    ("mom at work", "mom"),
+    ("mom now", "mom"),
+    ("jane please", "jane"),
+    ("david", "david"),
+    ("john smith", "John Smith"),
+    ("smith", "John Smith"),
+])
+def test_names_resolve_outright(spoken, name):
+    found = best(spoken)
+    assert found is not None and found[0] == name and found[1] in CERTAIN
+
+@pytest.mark.parametrize("spoken", [
+    "me a taxi", "my wife", "me", "mommy", "a", "at work now",
+])
+def test_other_words_call_nobody_for_sure(spoken):
+    found = best(spoken)
+    assert found is None or (found[0] != "mom" and found[1] not in CERTAIN)
+
+@pytest.mark.parametrize("spoken", ["john", "jen"])
+def test_similar_sounding_names_are_only_guesses(spoken):
+    # Only the built-in book: neither is a contact, both merely sound like jane
+    builtin = ContactIndex([Contact(name, number) for name, number in CONTACTS.items()])
+    matches = builtin.lookup(spoken)
+    assert not matches or matches[0].how not in CERTAIN
+
+def test_whole_words_beat_longer_names():
+    # 'david' must not be taken for 'davidson'
+    assert best("david") == ("david", "exact")
+    assert best("davidson") == ("Davidson Jones", "word")
+
+def test_trailing_words_are_only_dropped_for_whole_word_matches():
+    # 'mel' alone would be a prefix of Melissa; with words after it, nothing is guessed
+    assert best("mel") == ("Melissa Brown", "prefix")
+    assert best("mel tonight") is None
+
+def test_phonetic_keys():
+    assert metaphone("smyth") == metaphone("smith")
+    assert metaphone("jon") == metaphone("john")
+    assert soundex("robert") == soundex("rupert") == "R163"
@@ -0,0 +1,18 @@
+# ----------------------------------------------------------------------
+# Tests for friday_deps: lazy optional modules and the startup feature warning.
+# ----------------------------------------------------------------------
+from friday_deps import FEATURES, STATUS_ONLY_FEATURES, LazyModule, feature_status, missing_features
+
+def test_missing_module_is_reported_without_raising():
+    module = LazyModule('friday_no_such_module')
+    assert not module.installed()
+    assert not module.available
+    assert module.error is not None
+
+def test_status_only_features_never_reach_the_startup_warning(monkeypatch):
+    for name in FEATURES:
+        monkeypatch.setitem(FEATURES, name, LazyModule('friday_no_such_module'))
+    missing = missing_features()
+    assert missing and not set(missing) & set(STATUS_ONLY_FEATURES)
+    status = feature_status()
+    assert all(f" - {name}: " in status for name in FEATURES)
@@ -0,0 +1,81 @@
+# ----------------------------------------------------------------------
+# Tests for friday_executor: per-session ordering, backpressure,
+# cancellation and timeouts.
+# ----------------------------------------------------------------------
+import threading
+
+import pytest
+
+from friday_executor import CommandExecutor, ExecutorBusy
+
+@pytest.fixture
+def executors():
+    created = []
+    def make(run, **kwargs):
+        executor = CommandExecutor(run, **kwargs)
+        created.append(executor)
+        return executor
+    yield make
+    for executor in created:
+        executor.shutdown()
+
+def test_one_session_runs_in_submission_order(executors):
+    ran = []
+    executor = executors(lambda command, ticket: ran.append(command), fast_workers=4)
+    tickets = [executor.submit(n) for n in range(12)]
+    assert all(ticket.wait(2) for ticket in tickets)
+    assert ran == list(range(12))
+    assert {ticket.state for ticket in tickets} == {'done'}
+
+def test_full_backlog_is_refused(executors):
+    release = threading.Event()
+    executor = executors(lambda command, ticket: release.wait(2), max_pending=2)
+    executor.submit("first")
+    executor.submit("second")
+    with pytest.raises(ExecutorBusy):
+        executor.submit("third")
+    release.set()
+    assert executor.stats()['rejected'] == 1
+
+def test_cancelling_a_queued_command_skips_it(executors):
+    release = threading.Event()
+    ran = []
+    def run(command, ticket):
+        release.wait(2)
+        ran.append(command)
+    executor = executors(run)
+    first = executor.submit("first")
+    second = executor.submit("second")
+    assert second.cancel()
+    release.set()
+    assert first.wait(2) and second.wait(2)
+    assert second.state == 'cancelled' and ran == ["first"]
+
+def test_timed_out_command_keeps_its_session_blocked_until_it_returns(executors):
+    release = threading.Event()
+    timed_out = []
+    started = []
+    def run(command, ticket):
+        started.append(command)
+        if command == "slow":
+            release.wait(2)
+    executor = executors(run, default_timeout=0.05, on_timeout=timed_out.append)
+    slow = executor.submit("slow")
+    quick = executor.submit("quick")
+    assert slow.wait(1) and slow.state == 'timed_out' and slow.abandoned
+    assert timed_out == [slow]
+    # The next command of the session must not run alongside the abandoned one
+    assert not quick.wait(0.1) and started == ["slow"]
+    release.set()
+    assert quick.wait(2) and quick.state == 'done'
+    assert executor.stats()['overrunning'] == 0
+
+def test_a_failing_command_does_not_stop_the_next(executors):
+    def run(command, ticket):
+        if command == "boom":
+            raise RuntimeError("boom")
+    executor = executors(run)
+    failed = executor.submit("boom")
+    after = executor.submit("fine")
+    assert after.wait(2) and failed.state == 'failed' and isinstance(failed.error, RuntimeError)
+    assert after.state == 'done'
@@ -0,0 +1,34 @@
+# ----------------------------------------------------------------------
+# Tests for friday_history: the bounded ring, the archive it pages out
+# to, and reading archived entries back a page at a time.
+# ----------------------------------------------------------------------
+from friday_history import ConversationHistory
+
+def test_ring_is_bounded_and_archives_what_it_drops(tmp_path):
+    history = ConversationHistory(capacity=3, archive_path=str(tmp_path / "history.jsonl"))
+    for n in range(10):
+        history.append("USER", f"message {n}")
+    assert [entry['text'] for entry in history.entries()] == ["message 7", "message 8", "message 9"]
+    # Entries still queued for the writer are read back too
+    assert [entry['text'] for entry in history.archived(None)] == [f"message {n}" for n in range(7)]
+    history.close()
+    assert [entry['text'] for entry in history.archived(None)] == [f"message {n}" for n in range(7)]
+
+def test_archived_pages_walk_back_from_the_newest(tmp_path):
+    history = ConversationHistory(capacity=2, archive_path=str(tmp_path / "history.jsonl"))
+    for n in range(12):
+        history.append("USER", f"message {n}")
+    history.close()
+    pages = [[entry['text'] for entry in history.archived(4, skip=skip)] for skip in (0, 4, 8)]
+    assert pages == [
+        ["message 6", "message 7", "message 8", "message 9"],
+        ["message 2", "message 3", "message 4", "message 5"],
+        ["message 0", "message 1"],
+    ]
+    assert history.archived(4, skip=10) == []
+
+def test_without_an_archive_nothing_is_read_back():
+    history = ConversationHistory(capacity=1)
+    history.append("USER", "one")
+    entry, evicted = history.append("FRIDAY", "two")
+    assert evicted['text'] == "one" and history.archived() == []
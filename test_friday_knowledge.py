@@ -0,0 +1,56 @@
+# ----------------------------------------------------------------------
+# Tests for friday_knowledge: building a pack, looking subjects up through
+# the windowed summary reads, and refusing packs that cannot be mapped.
+# ----------------------------------------------------------------------
+import mmap
+
+import pytest
+
+import friday_knowledge
+from friday_knowledge import KnowledgePack, KnowledgePackError, build_pack
+
+ARTICLES = [("Alan Turing", "English mathematician."), ("Ada Lovelace", "English writer and mathematician.")]
+ARTICLES += [(f"Article {n}", "x" * 3000) for n in range(200)]
+
+@pytest.fixture
+def pack_path(tmp_path):
+    dump = tmp_path / "leads.tsv"
+    dump.write_text("".join(f"{title}\t{text}\n" for title, text in ARTICLES), encoding="utf-8")
+    path = str(tmp_path / "friday_knowledge.fkp")
+    assert build_pack(str(dump), path) == len(ARTICLES)
+    return path
+
+def test_lookup(pack_path):
+    pack = KnowledgePack(pack_path)
+    try:
+        assert len(pack) == len(ARTICLES)
+        assert pack.lookup("alan turing?") == ("Alan Turing", "English mathematician.")
+        assert pack.lookup("Ada  LOVELACE") == ("Ada Lovelace", "English writer and mathematician.")
+        assert pack.lookup("grace hopper") is None
+        assert pack.lookup("") is None
+    finally:
+        pack.close()
+
+def test_summaries_are_read_through_a_small_window(pack_path, monkeypatch):
+    # 600 KB of summaries through a window far smaller than the blob
+    monkeypatch.setattr(friday_knowledge, "WINDOW_BYTES", 16 * 1024)
+    pack = KnowledgePack(pack_path)
+    try:
+        for n in (199, 0, 150, 7):
+            assert pack.lookup(f"article {n}") == (f"Article {n}", "x" * 3000)
+        assert len(pack._window[1]) <= 16 * 1024 + mmap.ALLOCATIONGRANULARITY
+        assert pack.lookup("alan turing") == ("Alan Turing", "English mathematician.")
+    finally:
+        pack.close()
+
+def test_oversized_index_is_refused_with_a_reason(pack_path, monkeypatch):
+    monkeypatch.setattr(friday_knowledge, "MAX_INDEX_BYTES", 1024)
+    with pytest.raises(KnowledgePackError, match="smaller pack"):
+        KnowledgePack(pack_path)
+
+@pytest.mark.parametrize("content", [b"", b"not a pack at all", b"FRIDAYKP" + b"\xff" * 56])
+def test_other_files_are_refused(tmp_path, content):
+    path = tmp_path / "other.fkp"
+    path.write_bytes(content)
+    with pytest.raises(KnowledgePackError):
+        KnowledgePack(str(path))
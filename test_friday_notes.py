@@ -0,0 +1,42 @@
+# ----------------------------------------------------------------------
+# Tests for friday_notes: paging newest first, word search, and the
+# offset index surviving restarts and hand edits of the notes file.
+# ----------------------------------------------------------------------
+import datetime
+
+from friday_notes import NotesStore
+
+WHEN = datetime.datetime(2024, 1, 2, 3, 4)
+
+def write_notes(path, notes):
+    store = NotesStore(str(path))
+    for note in notes:
+        store.append(note, when=WHEN)
+    return store
+
+def test_pages_are_newest_first(tmp_path):
+    store = write_notes(tmp_path / "notes.txt", [f"note {n}" for n in range(1, 8)])
+    assert store.count() == 7
+    assert [number for number, _ in store.page(1, page_size=3)] == [7, 6, 5]
+    assert [number for number, _ in store.page(3, page_size=3)] == [1]
+    assert store.page(4, page_size=3) == []
+    assert store.get(2) == "2024-01-02 03:04: note 2"
+    assert store.get(0) is None and store.get(8) is None
+
+def test_search_ranks_by_words_matched(tmp_path):
+    store = write_notes(tmp_path / "notes.txt", ["buy milk", "buy eggs and milk", "call mom"])
+    assert [number for number, _ in store.search("buy milk")] == [2, 1]
+    store.append("milk the cows", when=WHEN) # Indexed incrementally after the first search
+    assert [number for number, _ in store.search("milk")] == [4, 2, 1]
+    assert store.search("nothing here") == [] and store.search("") == []
+
+def test_index_survives_restart_and_hand_edits(tmp_path):
+    path = tmp_path / "notes.txt"
+    write_notes(path, ["first", "second"])
+    assert NotesStore(str(path)).get(2).endswith("second")
+    # Edited by hand, without a trailing newline: the index is rebuilt and appends still work
+    path.write_text("2024-01-01 00:00: edited\n\n2024-01-01 00:01: by hand", encoding="utf-8")
+    store = NotesStore(str(path))
+    assert store.count() == 2
+    assert store.append("after the edit", when=WHEN) == 3
+    assert [line.split(": ", 1)[1] for _, line in store.page(1)] == ["after the edit", "by hand", "edited"]
@@ -0,0 +1,64 @@
+# ----------------------------------------------------------------------
+# Tests for friday_reminders: duration parsing, and the scheduler's
+# catch-up of reminders that fell due while the app was closed.
+# ----------------------------------------------------------------------
+import time
+
+from friday_reminders import ReminderScheduler, parse_duration, parse_recurrence
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def test_parsing():
+    assert parse_duration("remind me in 5 minutes") == (300, "5 minutes")
+    assert parse_recurrence("every 2 hours") == (7200, "2 hours")
+    assert parse_duration("remind me later") is None
+
+def test_repeating_reminder_catches_up_in_one_step(tmp_path):
+    clock = FakeClock()
+    scheduler = ReminderScheduler(str(tmp_path / "reminders.jsonl"), lambda reminder, late: None, clock=clock)
+    reminder = scheduler.add("stretch", 60, repeat=60)
+    scheduler.stop()
+    with scheduler._lock:
+        clock.now += 10 ** 9 # Decades of downtime: the old loop would step 16 million times
+        started = time.perf_counter()
+        fired = scheduler._pop_due(clock.now)
+        assert time.perf_counter() - started < 0.1
+    assert [r.id for r, _ in fired] == [reminder.id]
+    assert clock.now < reminder.due <= clock.now + 60
+    assert (reminder.due - 1060.0) % 60 == 0
+
+def test_repeating_reminder_due_exactly_now_moves_on(tmp_path):
+    clock = FakeClock()
+    scheduler = ReminderScheduler(str(tmp_path / "reminders.jsonl"), lambda reminder, late: None, clock=clock)
+    reminder = scheduler.add("water", 30, repeat=30)
+    scheduler.stop()
+    with scheduler._lock:
+        fired = scheduler._pop_due(reminder.due)
+    assert len(fired) == 1 and reminder.due == clock.now + 60
+
+def test_one_shot_reminder_fires_once_and_is_forgotten(tmp_path):
+    clock = FakeClock()
+    scheduler = ReminderScheduler(str(tmp_path / "reminders.jsonl"), lambda reminder, late: None, clock=clock)
+    reminder = scheduler.add("tea", 5)
+    scheduler.stop()
+    with scheduler._lock:
+        assert scheduler._pop_due(clock.now) == []
+        assert [r.id for r, _ in scheduler._pop_due(clock.now + 5)] == [reminder.id]
+    assert scheduler.get(reminder.id) is None and len(scheduler) == 0
+
+def test_reminders_survive_a_restart(tmp_path):
+    path = str(tmp_path / "reminders.jsonl")
+    clock = FakeClock()
+    first = ReminderScheduler(path, lambda reminder, late: None, clock=clock)
+    kept = first.add("call dad", 600)
+    dropped = first.add("buy milk", 900)
+    first.cancel(dropped.id)
+    first.stop()
+    second = ReminderScheduler(path, lambda reminder, late: None, clock=clock)
+    second.stop()
+    assert [(r.id, r.message) for r in second.list()] == [(kept.id, "call dad")]
@@ -0,0 +1,95 @@
+# ----------------------------------------------------------------------
+# Tests for friday_router: the phrase matcher, lead promotion, and the
+# routing table of the engine's registered commands.
+# ----------------------------------------------------------------------
+import pytest
+
+from friday_core import ROUTER
+from friday_query import NormalizedQuery
+from friday_router import IntentRouter, PhraseMatcher
+
+def route(query):
+    decision = ROUTER.resolve(NormalizedQuery(query))
+    return decision.intent if decision else None
+
+# The whole command list: every query routed as the original if/elif chain did,
+# plus the commands that open the query and must not lose to a phrase later in it.
+ROUTING_TABLE = [
+    ("what time is it", "time"),
+    ("today's date", "date"),
+    ("tell me a joke", "joke"),
+    ("give me a random number", "random_number"),
+    ("calculate 2 plus 2", "calculator"),
+    ("solve 2 plus 2", "calculator"),
+    ("set a timer for 5 minutes", "reminder"),
+    ("remind me to call dad in 10 minutes", "reminder"),
+    ("list reminders", "list_reminders"),
+    ("cancel reminder 2", "cancel_reminder"),
+    ("snooze 5 minutes", "snooze_reminder"),
+    ("take a note buy eggs", "take_note"),
+    ("read notes", "read_notes"),
+    ("search notes for milk", "search_notes"),
+    ("call mom", "call"),
+    ("phone john smith", "call"),
+    ("open youtube", "youtube"),
+    ("play video of cats", "youtube"),
+    ("who is the president", "wikipedia"),
+    ("google the weather", "web_search"),
+    ("code for bubble sort", "code"),
+    ("copy this hello", "clipboard"),
+    ("shutdown", "power"),
+    ("goodbye", "exit"),
+    ("feature status", "diagnostics"),
+    ("train wake word", "wake_word"),
+    ("find file report", "find_file"),
+    ("run script backup", "run_script"),
+    ("open the file manager", "open_app"),
+    ("how are you", "conversation"),
+    ("thank you", "conversation"),
+    # Catch-all verbs and filler never take the lead from the command they introduce
+    ("show me the time", "time"),
+    ("show me a joke", "joke"),
+    ("open the date", "date"),
+    ("launch a joke", "joke"),
+    ("launch random number", "random_number"),
+    ("show me my reminders", "list_reminders"),
+    ("time for a joke", "joke"),
+    # A command that opens the query beats chat and commands later in it
+    ("take a note to call mom", "take_note"),
+    ("friday take a note buy eggs", "take_note"),
+    ("please remind me to call dad in 10 minutes", "reminder"),
+    ("remind me to say thank you in 5 minutes", "reminder"),
+    ("write down buy milk", "take_note"),
+    ("calculate how are you", "calculator"),
+    ("call mom and say hello", "call"),
+    (", take a note hi", "take_note"),
+]
+
+@pytest.mark.parametrize("query, intent", ROUTING_TABLE)
+def test_routing_table(query, intent):
+    assert route(query) == intent, ROUTER.explain(NormalizedQuery(query))
+
+@pytest.mark.parametrize("query", ["", "zzz qqq", "this is not a command"])
+def test_unknown_queries_route_nowhere(query):
+    assert route(query) is None
+
+def test_matcher_finds_whole_words_only():
+    matcher = PhraseMatcher()
+    matcher.add("hi", "greet")
+    matcher.add("this one", "pick")
+    assert [hit.value for hit in matcher.find_all("this one, hi")] == ["pick", "greet"]
+    assert matcher.find_all("history") == []
+
+def test_lead_promotion_skips_catch_alls_and_no_argument_intents():
+    router = IntentRouter(lead_priority=50)
+    for name, triggers, priority, arg, lead in [
+        ('open', ('open',), 10, 'raw', False),
+        ('time', ('time',), 20, None, None),
+        ('note', ('note',), 15, 'raw', None),
+        ('chat', ('hello',), 40, 'raw', None),
+    ]:
+        router.add(name, name, triggers, priority=priority, arg=arg, lead=lead)
+    assert router.resolve("open the time").intent == 'time'
+    assert router.resolve("time to say hello").intent == 'chat'
+    assert router.resolve("note hello").intent == 'note'
+    assert router.resolve("hello note").intent == 'chat'
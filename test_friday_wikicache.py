@@ -0,0 +1,58 @@
+# ----------------------------------------------------------------------
+# Tests for friday_wikicache: the memory LRU over the SQLite store, TTLs,
+# and that reads served from memory still count for disk eviction.
+# ----------------------------------------------------------------------
+from friday_wikicache import SummaryCache, normalize_subject
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def test_subjects_are_normalized():
+    assert normalize_subject("  Albert   EINSTEIN? ") == "albert einstein"
+
+def test_fresh_stale_and_negative_entries(tmp_path):
+    clock = FakeClock()
+    cache = SummaryCache(str(tmp_path / "wiki.sqlite3"), ttl=100, negative_ttl=10, clock=clock)
+    cache.put("Python", "A language.")
+    cache.put_negative("Nowhere land")
+    assert cache.get("python").text == "A language."
+    assert cache.get("nowhere land").negative
+    clock.now += 50
+    assert cache.get("nowhere land") is None
+    clock.now += 100
+    assert cache.get("python") is None
+    assert cache.get_stale("python").text == "A language."
+    cache.close()
+
+def test_entries_survive_a_restart(tmp_path):
+    path = str(tmp_path / "wiki.sqlite3")
+    first = SummaryCache(path)
+    first.put("Python", "A language.")
+    first.close()
+    second = SummaryCache(path)
+    assert second.get("python").text == "A language."
+    second.close()
+
+def test_memory_hits_keep_a_summary_from_disk_eviction(tmp_path):
+    path = str(tmp_path / "wiki.sqlite3")
+    clock = FakeClock(1000.0)
+    cache = SummaryCache(path, max_entries=2, clock=clock)
+    cache.put("popular", "read all the time")
+    clock.now = 1001.0
+    cache.put("other", "read once")
+    clock.now = 500.0
+    for n in range(48):
+        cache.put(f"filler {n}", "x")
+    clock.now = 2000.0
+    assert cache.get("popular") is not None # Served from memory, never read from disk
+    clock.now = 2001.0
+    cache.put("newest", "just written") # The 51st write evicts down to max_entries
+    cache.close()
+    reopened = SummaryCache(path)
+    assert reopened.lookup("popular") is not None
+    assert reopened.lookup("other") is None
+    reopened.close()